@@ -0,0 +1,98 @@
+#
+# Copyright (c) 2021, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Query latency of the exact top-k indices over random candidates.
+
+Compares `TopKIndexBlock` with `ShardedTopKIndexBlock` for several numbers of
+shards, called eagerly and in a `tf.function`.
+
+    python bench/index_latency.py --candidates 1000000 --shards 1 4 16 > index_latency.json
+"""
+
+import argparse
+import json
+import platform
+import time
+
+import numpy as np
+
+
+def measure(call, queries, repeats):
+    call(queries)  # warm-up, and tracing
+    latencies = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        call(queries)[1].numpy()
+        latencies.append(time.perf_counter() - start)
+    return {
+        "mean_ms": 1000 * float(np.mean(latencies)),
+        "p50_ms": 1000 * float(np.percentile(latencies, 50)),
+        "p99_ms": 1000 * float(np.percentile(latencies, 99)),
+    }
+
+
+def run(candidates=1_000_000, dim=64, batch_size=32, k=100, shards=(1, 4, 16), repeats=20):
+    import tensorflow as tf
+
+    from merlin.models.tf.core.index import ShardedTopKIndexBlock, TopKIndexBlock
+
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(candidates, dim)).astype(np.float32)
+    queries = tf.constant(rng.normal(size=(batch_size, dim)).astype(np.float32))
+
+    indices = {"TopKIndexBlock": TopKIndexBlock(k=k, values=values)}
+    for num_shards in shards:
+        indices[f"ShardedTopKIndexBlock[{num_shards}]"] = ShardedTopKIndexBlock(
+            k=k, values=values, num_shards=num_shards
+        )
+
+    results = []
+    for name, index in indices.items():
+        for mode, call in [("eager", index), ("graph", tf.function(index))]:
+            result = {"index": name, "mode": mode}
+            result.update(measure(call, queries, repeats))
+            results.append(result)
+
+    return {
+        "tensorflow": tf.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "candidates": candidates,
+        "dim": dim,
+        "batch_size": batch_size,
+        "k": k,
+        "results": results,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--candidates", type=int, default=1_000_000)
+    parser.add_argument("--dim", type=int, default=64)
+    parser.add_argument("--batch-size", type=int, default=32)
+    parser.add_argument("--k", type=int, default=100)
+    parser.add_argument("--shards", nargs="+", type=int, default=[1, 4, 16])
+    parser.add_argument("--repeats", type=int, default=20)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(
+        json.dumps(
+            run(args.candidates, args.dim, args.batch_size, args.k, args.shards, args.repeats),
+            indent=2,
+        )
+    )
@@ -0,0 +1,128 @@
+#
+# Copyright (c) 2021, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Bytes copied per batch when the loader turns the scalar columns of a CPU chunk into tensors.
+
+Compares the frame path (`_to_tensor` on the selected columns, the only path before
+`_to_column_tensors` existed and still the fallback) with the per-column zero-copy path.
+Copies made with NumPy/pandas are measured with `tracemalloc`, copies made by the
+framework are the bytes of output tensors that don't share memory with the chunk.
+
+    python bench/loader_copies.py --framework tf --rows 1000000 --columns 16
+"""
+
+import argparse
+import json
+import math
+import time
+import tracemalloc
+
+import numpy as np
+import pandas as pd
+
+from merlin.io import Dataset
+
+
+def make_loader(framework, df, batch_size):
+    columns = list(df.columns)
+    if framework == "tf":
+        from merlin.models.tf.dataset import BatchedDataset
+
+        return BatchedDataset(
+            Dataset(df), batch_size, cont_names=columns, label_names=[], shuffle=False
+        )
+
+    from merlin.models.torch.dataset import Dataset as TorchDataset
+
+    return TorchDataset(Dataset(df), conts=columns, labels=[], batch_size=batch_size)
+
+
+def to_numpy(tensor):
+    return tensor.numpy() if hasattr(tensor, "numpy") else np.asarray(tensor)
+
+
+def framework_copied_bytes(tensors, sources):
+    copied = 0
+    for tensor in tensors:
+        array = to_numpy(tensor)
+        if not any(np.may_share_memory(array, source) for source in sources):
+            copied += array.nbytes
+    return copied
+
+
+def measure(fn, sources, repeats):
+    tracemalloc.start()
+    tracemalloc.reset_peak()
+    start = time.perf_counter()
+    for _ in range(repeats):
+        tensors = fn()
+    elapsed = (time.perf_counter() - start) / repeats
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if not isinstance(tensors, list):
+        tensors = [tensors]
+    return {
+        "numpy_copied_bytes": peak,
+        "framework_copied_bytes": framework_copied_bytes(tensors, sources),
+        "seconds": elapsed,
+    }
+
+
+def run(framework="tf", rows=1_000_000, columns=16, batch_size=4096, repeats=5, seed=0):
+    rng = np.random.default_rng(seed)
+    df = pd.DataFrame({f"cont_{i}": rng.random(rows, dtype=np.float32) for i in range(columns)})
+    loader = make_loader(framework, df, batch_size)
+    names = list(df.columns)
+    sources = [df[name].to_numpy() for name in names]
+    dtype = loader._FLOAT32_DTYPE
+
+    results = {
+        "frame": measure(lambda: loader._to_tensor(df[names], dtype), sources, repeats),
+        "columns": measure(lambda: loader._to_column_tensors(df, names, dtype), sources, repeats),
+    }
+    num_batches = math.ceil(rows / batch_size)
+    for result in results.values():
+        total = result["numpy_copied_bytes"] + result["framework_copied_bytes"]
+        result["copied_bytes_per_batch"] = total / num_batches
+
+    return {
+        "framework": framework,
+        "rows": rows,
+        "columns": columns,
+        "batch_size": batch_size,
+        "batch_bytes": batch_size * columns * np.dtype(np.float32).itemsize,
+        "results": results,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--framework", choices=["tf", "torch"], default="tf")
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--columns", type=int, default=16)
+    parser.add_argument("--batch-size", type=int, default=4096)
+    parser.add_argument("--repeats", type=int, default=5)
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(
+        json.dumps(
+            run(args.framework, args.rows, args.columns, args.batch_size, args.repeats),
+            indent=2,
+        )
+    )
@@ -0,0 +1,162 @@
+#
+# Copyright (c) 2021, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Throughput of the TF and torch data loaders over synthetic data.
+
+Runs one epoch per combination of framework, batch size, number of list columns
+and parts per chunk, and reports the end-to-end rates along with the per-stage
+timings of the loader (`DataLoader.stage_metrics`). The data is generated from
+the schema of the `testing` dataset, with copies of its `categories` list column.
+
+    python bench/loader_throughput.py --frameworks tf torch --batch-sizes 1024 16384 \\
+        --list-columns 0 4 --parts-per-chunk 1 4 > loader_throughput.json
+"""
+
+import argparse
+import itertools
+import json
+import platform
+import time
+
+import numpy as np
+
+from merlin.datasets.synthetic import generate_data
+from merlin.io import Dataset
+from merlin.schema import Tags
+
+
+def make_data(rows, list_columns, partitions, seed=0):
+    np.random.seed(seed)
+    dataset = generate_data("testing", rows)
+    schema = dataset.schema
+    df = dataset.to_ddf().compute()
+
+    lists = [f"categories_{i}" for i in range(list_columns)]
+    for name in lists:
+        df[name] = df["categories"]
+    scalars = [
+        name for name in schema.select_by_tag(Tags.CATEGORICAL).column_names if name != "categories"
+    ]
+    conts = schema.select_by_tag(Tags.CONTINUOUS).column_names
+    df = df[scalars + lists + conts]
+
+    return Dataset(df, npartitions=partitions), scalars + lists, conts
+
+
+def make_loader(framework, dataset, cats, conts, batch_size, parts_per_chunk):
+    if framework == "tf":
+        from merlin.models.tf.dataset import BatchedDataset
+
+        return BatchedDataset(
+            dataset,
+            batch_size,
+            cat_names=cats,
+            cont_names=conts,
+            label_names=[],
+            shuffle=False,
+            parts_per_chunk=parts_per_chunk,
+        )
+
+    from merlin.models.torch.dataset import Dataset as TorchDataset
+
+    return TorchDataset(
+        dataset,
+        cats=cats,
+        conts=conts,
+        labels=[],
+        batch_size=batch_size,
+        parts_per_chunk=parts_per_chunk,
+    )
+
+
+def measure(loader):
+    start = time.perf_counter()
+    num_batches = 0
+    for _ in loader:
+        num_batches += 1
+    seconds = time.perf_counter() - start
+    rows = loader.num_rows_processed
+    return {
+        "seconds": seconds,
+        "batches": num_batches,
+        "rows": rows,
+        "rows_per_sec": rows / seconds if seconds > 0 else None,
+        "batches_per_sec": num_batches / seconds if seconds > 0 else None,
+        "stages": loader.stage_metrics,
+    }
+
+
+def run(
+    frameworks=("tf", "torch"),
+    rows=1_000_000,
+    partitions=16,
+    batch_sizes=(1024, 16384),
+    list_columns=(0, 4),
+    parts_per_chunk=(1, 4),
+):
+    import merlin.models
+
+    results = []
+    for num_lists in list_columns:
+        dataset, cats, conts = make_data(rows, num_lists, partitions)
+        for framework, batch_size, num_parts in itertools.product(
+            frameworks, batch_sizes, parts_per_chunk
+        ):
+            loader = make_loader(framework, dataset, cats, conts, batch_size, num_parts)
+            result = {
+                "framework": framework,
+                "batch_size": batch_size,
+                "list_columns": num_lists,
+                "parts_per_chunk": num_parts,
+            }
+            result.update(measure(loader))
+            results.append(result)
+
+    return {
+        "version": merlin.models.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "rows": rows,
+        "partitions": partitions,
+        "results": results,
+    }
+
+
+def parse_args():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--frameworks", nargs="+", choices=["tf", "torch"], default=["tf", "torch"])
+    parser.add_argument("--rows", type=int, default=1_000_000)
+    parser.add_argument("--partitions", type=int, default=16)
+    parser.add_argument("--batch-sizes", nargs="+", type=int, default=[1024, 16384])
+    parser.add_argument("--list-columns", nargs="+", type=int, default=[0, 4])
+    parser.add_argument("--parts-per-chunk", nargs="+", type=int, default=[1, 4])
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    args = parse_args()
+    print(
+        json.dumps(
+            run(
+                args.frameworks,
+                args.rows,
+                args.partitions,
+                args.batch_sizes,
+                args.list_columns,
+                args.parts_per_chunk,
+            ),
+            indent=2,
+        )
+    )
@@ -14,11 +14,14 @@
 # limitations under the License.
 #
 import copy
+import itertools
 import math
+import multiprocessing
 import queue
 import threading
+import time
 import warnings
-from collections import OrderedDict
+from collections import OrderedDict, deque
 
 import numpy as np
 
@@ -37,7 +40,16 @@ from merlin.core.dispatch import (
     pull_apart_list,
 )
 from merlin.io.shuffle import shuffle_df
-from merlin.models.loader.dataframe_iter import DataFrameIter
+from merlin.models.loader import workers
+from merlin.models.loader.cache import BatchCache
+from merlin.models.loader.dataframe_iter import (
+    DataFrameIter,
+    RowGroupIter,
+    index_row_groups,
+    parquet_column_sizes,
+    parquet_files,
+)
+from merlin.models.loader.timing import StageTimer
 from merlin.schema import Tags
 
 
@@ -45,6 +57,176 @@ def _num_steps(num_samples, step_size):
     return math.ceil(num_samples / step_size)
 
 
+def _num_rows(value):
+    """Number of rows of a batch's features or labels."""
+    if isinstance(value, dict):
+        value = next(iter(value.values()), None)
+    if isinstance(value, (tuple, list)):
+        # a list column (values, offsets) or one tensor per label
+        value = value[-1] if value else None
+    return int(value.shape[0]) if value is not None else 0
+
+
+def _frame_nbytes(df):
+    # shallow: the values of object columns aren't counted
+    return int(df.memory_usage(index=False).sum())
+
+
+class AdaptiveChunkController:
+    """Adapts the number of partitions per chunk and the depth of the queue
+    of a `ChunkQueue` to the rates at which chunks are produced and consumed.
+
+    When the consumer waits for chunks, the producer is the bottleneck: chunks
+    grow (amortizing the cost of each chunk) and then the queue deepens (absorbing
+    slow partitions). When the producer waits for room in the queue instead, the queue
+    gets shallower and then chunks shrink, to free memory. The estimated memory
+    of the buffered chunks, `part_bytes * num_parts * (qsize + 1)`, is kept under
+    `memory_cap`. Every change is recorded in `metrics["decisions"]`.
+
+    Parameters
+    -----------
+    num_parts: int
+        Initial number of partitions per chunk
+    qsize: int
+        Initial depth of the queue
+    max_parts: int, optional
+        Max number of partitions per chunk, defaults to `4 * num_parts`
+    max_qsize: int
+        Max depth of the queue
+    memory_cap: int, optional
+        Max estimated bytes of the chunks buffered and being built
+    wait_threshold: float
+        Fraction of time spent waiting above which a side is considered starved/blocked
+    smoothing: float
+        Weight of the latest measurement in the moving averages of the rates
+    """
+
+    def __init__(
+        self,
+        num_parts=1,
+        qsize=1,
+        max_parts=None,
+        max_qsize=4,
+        memory_cap=None,
+        wait_threshold=0.1,
+        smoothing=0.3,
+    ):
+        self.num_parts = num_parts
+        self.qsize = qsize
+        self.min_parts = num_parts
+        self.min_qsize = 1
+        self.max_parts = max(max_parts or 4 * num_parts, num_parts)
+        self.max_qsize = max(max_qsize, qsize)
+        self.memory_cap = memory_cap
+        self.wait_threshold = wait_threshold
+        self.smoothing = smoothing
+
+        self._lock = threading.Lock()
+        self._pending_rows = deque()
+        self._consumed_rows = None
+        self._last_get = None
+        self.producer_rows_per_sec = None
+        self.consumer_rows_per_sec = None
+        self.producer_wait_fraction = 0.0
+        self.consumer_wait_fraction = 0.0
+        self.part_bytes = None
+        self.decisions = deque(maxlen=100)
+
+    @property
+    def metrics(self):
+        """Current settings, measured rates and the latest decisions."""
+        with self._lock:
+            return {
+                "num_parts": self.num_parts,
+                "qsize": self.qsize,
+                "producer_rows_per_sec": self.producer_rows_per_sec,
+                "consumer_rows_per_sec": self.consumer_rows_per_sec,
+                "producer_wait_fraction": self.producer_wait_fraction,
+                "consumer_wait_fraction": self.consumer_wait_fraction,
+                "part_bytes": self.part_bytes,
+                "estimated_bytes": self._estimated_bytes(self.num_parts, self.qsize),
+                "decisions": list(self.decisions),
+            }
+
+    def record_chunk(self, num_rows, nbytes, num_parts, seconds, wait_seconds):
+        """Called by the producer once a chunk of `num_parts` partitions was queued,
+        after `seconds` producing it and `wait_seconds` waiting for room in the queue."""
+        with self._lock:
+            self._pending_rows.append(num_rows)
+            if seconds > 0:
+                self.producer_rows_per_sec = self._average(
+                    self.producer_rows_per_sec, num_rows / seconds
+                )
+            total = seconds + wait_seconds
+            if total > 0:
+                self.producer_wait_fraction = self._average(
+                    self.producer_wait_fraction, wait_seconds / total
+                )
+            if num_parts > 0 and nbytes > 0:
+                self.part_bytes = self._average(self.part_bytes, nbytes / num_parts)
+            self._decide()
+
+    def record_get(self, wait_seconds):
+        """Called by the consumer after waiting `wait_seconds` for a chunk."""
+        now = time.perf_counter()
+        with self._lock:
+            if self._last_get is not None and self._consumed_rows is not None:
+                # time spent consuming the previous chunk, then waiting for this one
+                busy = max(now - self._last_get - wait_seconds, 0.0)
+                if busy > 0:
+                    self.consumer_rows_per_sec = self._average(
+                        self.consumer_rows_per_sec, self._consumed_rows / busy
+                    )
+                self.consumer_wait_fraction = self._average(
+                    self.consumer_wait_fraction, wait_seconds / (busy + wait_seconds or 1.0)
+                )
+            self._consumed_rows = self._pending_rows.popleft() if self._pending_rows else None
+            self._last_get = now
+
+    def _average(self, current, value):
+        if current is None:
+            return value
+        return (1 - self.smoothing) * current + self.smoothing * value
+
+    def _estimated_bytes(self, num_parts, qsize):
+        if self.part_bytes is None:
+            return None
+        return int(self.part_bytes * num_parts * (qsize + 1))
+
+    def _fits(self, num_parts, qsize):
+        if self.memory_cap is None or self.part_bytes is None:
+            return True
+        return self._estimated_bytes(num_parts, qsize) <= self.memory_cap
+
+    def _decide(self):
+        num_parts, qsize, reason = self.num_parts, self.qsize, None
+        if self.consumer_wait_fraction > self.wait_threshold:
+            reason = "consumer waiting"
+            if num_parts < self.max_parts and self._fits(num_parts + 1, qsize):
+                num_parts += 1
+            elif qsize < self.max_qsize and self._fits(num_parts, qsize + 1):
+                qsize += 1
+        elif self.producer_wait_fraction > self.wait_threshold:
+            reason = "producer waiting"
+            if qsize > self.min_qsize:
+                qsize -= 1
+            elif num_parts > self.min_parts:
+                num_parts -= 1
+
+        while not self._fits(num_parts, qsize):
+            reason = "memory cap"
+            if qsize > self.min_qsize:
+                qsize -= 1
+            elif num_parts > self.min_parts:
+                num_parts -= 1
+            else:
+                break
+
+        if (num_parts, qsize) != (self.num_parts, self.qsize):
+            self.num_parts, self.qsize = num_parts, qsize
+            self.decisions.append({"num_parts": num_parts, "qsize": qsize, "reason": reason})
+
+
 class ChunkQueue:
     """This class takes partitions (parts) from an NVTabular dataset
      and concatenates them into a cudf dataframe "chunk". This chunk
@@ -61,10 +243,22 @@ class ChunkQueue:
         enable/disable chunk-level shuffling
     put_wait: float
         amount of timeout to wait for a full queue to open up
-        before checking for errors and trying again
+        before checking for errors and trying again.
+        `stop` wakes up a waiting producer right away
+    controller: AdaptiveChunkController, optional
+        Adapts `num_parts` and `qsize` to the producer and consumer rates
     """
 
-    def __init__(self, dataloader, qsize, num_parts=1, shuffle=False, put_wait=1e-6, epochs=1):
+    def __init__(
+        self,
+        dataloader,
+        qsize,
+        num_parts=1,
+        shuffle=False,
+        put_wait=0.1,
+        epochs=1,
+        controller=None,
+    ):
         self.num_parts = num_parts
         self.shuffle = shuffle
         self.put_wait = put_wait
@@ -72,6 +266,9 @@ class ChunkQueue:
         self._stop_event = threading.Event()
         self.itr = dataloader._data_iter(epochs)
         self.dataloader = dataloader
+        self.controller = controller
+        if controller is not None:
+            self._apply_controller()
 
     def __len__(self):
         return len(self.itr)
@@ -85,7 +282,12 @@ class ChunkQueue:
         return self.q_out.empty()
 
     def get(self):
-        return self.q_out.get()
+        if self.controller is None:
+            return self.q_out.get()
+        start = time.perf_counter()
+        packet = self.q_out.get()
+        self.controller.record_get(time.perf_counter() - start)
+        return packet
 
     def put(self, packet):
         while True:
@@ -93,25 +295,47 @@ class ChunkQueue:
                 return True
 
             try:
+                # blocks until there is room, or `stop` is called
                 self.q_out.put(packet, timeout=self.put_wait)
                 return False
             except queue.Full:
                 continue
 
+    def _apply_controller(self):
+        self.num_parts = self.controller.num_parts
+        with self.q_out.mutex:
+            self.q_out.maxsize = self.controller.qsize
+            self.q_out.not_full.notify_all()
+
+    def _put_chunk(self, chunks, num_rows, nbytes, num_parts, start):
+        """`put` that reports the time spent producing and waiting to the controller."""
+        if self.controller is None:
+            return self.put(chunks)
+        produced = time.perf_counter()
+        stopped = self.put(chunks)
+        self.controller.record_chunk(
+            num_rows, nbytes, num_parts, produced - start, time.perf_counter() - produced
+        )
+        self._apply_controller()
+        return stopped
+
     @annotate("batch", color="darkgreen", domain="nvt_python")
     def batch(self, itr):
         """
         iterates through gpu_mem_frac size chunks of dataset
         and concatenates every `num_parts` of them.
         """
+        timer = self.dataloader._stage_timer
         current = []
         while True:
+            start = time.perf_counter()
             try:
                 value = next(itr)
             except StopIteration:
                 if len(current) > 0:
                     yield current
                 break
+            timer.record("batch", time.perf_counter() - start, len(value), _frame_nbytes(value))
 
             current.append(value)
             if len(current) == self.num_parts:
@@ -121,10 +345,13 @@ class ChunkQueue:
     @annotate("chunk_logic", color="darkgreen", domain="nvt_python")
     def chunk_logic(self, itr):
         spill = None
+        start = time.perf_counter()
         for chunks in self.batch(itr):
             if self.stopped:
                 return
 
+            num_parts = len(chunks)
+            concat_start = time.perf_counter()
             if spill is not None and not spill.empty:
                 chunks.insert(0, spill)
 
@@ -133,19 +360,25 @@ class ChunkQueue:
             chunks, spill = self.get_batch_div_chunk(chunks, self.dataloader.batch_size)
             if self.shuffle:
                 chunks = shuffle_df(chunks)
+            num_rows, nbytes = len(chunks), _frame_nbytes(chunks)
+            self.dataloader._stage_timer.record(
+                "chunk_logic", time.perf_counter() - concat_start, num_rows, nbytes
+            )
 
             if len(chunks) > 0:
                 chunks = self.dataloader.make_tensors(chunks, self.dataloader._use_nnz)
                 # put returns True if buffer is stopped before
                 # packet can be put in queue. Keeps us from
                 # freezing on a put on a full queue
-                if self.put(chunks):
+                if self._put_chunk(chunks, num_rows, nbytes, num_parts, start):
                     return
+                start = time.perf_counter()
             chunks = None
         # takes care final batch, which is less than batch size
         if not self.dataloader.drop_last and spill is not None and not spill.empty:
+            num_rows, nbytes = len(spill), _frame_nbytes(spill)
             spill = self.dataloader.make_tensors(spill, self.dataloader._use_nnz)
-            self.put(spill)
+            self._put_chunk(spill, num_rows, nbytes, 0, start)
 
     @annotate("load_chunks", color="darkgreen", domain="nvt_python")
     def load_chunks(self, dev):
@@ -165,7 +398,10 @@ class ChunkQueue:
         # TODO: should we be clearing? I can imagine a world where
         # you want the thread to stop but still want to grab
         # data out of the buffer
-        self.q_out.queue.clear()
+        with self.q_out.mutex:
+            self.q_out.queue.clear()
+            # wake up a producer waiting for room in `put`
+            self.q_out.not_full.notify_all()
 
     def start(self):
         self._stop_event.clear()
@@ -182,6 +418,496 @@ class ChunkQueue:
         return chunks, spill
 
 
+_END = object()
+
+
+class _ReorderBuffer:
+    """Bounded buffer between two pipeline stages.
+
+    Producers tag every item with a sequence number. When `ordered` is set,
+    items are handed out strictly in sequence order and `put` blocks while an
+    item is `capacity` or more steps ahead of the next one to be consumed,
+    so a slow worker can't make the buffer grow without bound. Otherwise items
+    are handed out in arrival order and at most `capacity` are held at once.
+    """
+
+    def __init__(self, capacity, ordered=True, wait=0.1):
+        self.capacity = max(capacity, 1)
+        self.ordered = ordered
+        self.wait = wait
+        self._items = {}
+        self._arrivals = deque()
+        self._num_put = 0
+        self._num_got = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    def _is_full(self, seq):
+        if self.ordered:
+            return seq - self._num_got >= self.capacity
+        return len(self._arrivals) >= self.capacity
+
+    def put(self, seq, item, stopped):
+        """Returns True if `stopped` fired before the item could be stored."""
+        with self._cond:
+            while self._is_full(seq):
+                if stopped():
+                    return True
+                self._cond.wait(self.wait)
+            if self.ordered:
+                self._items[seq] = item
+            else:
+                self._arrivals.append(item)
+            self._num_put += 1
+            self._cond.notify_all()
+        return False
+
+    def get(self, stopped):
+        """Returns the next item, or `_END` once closed and drained (or stopped)."""
+        with self._cond:
+            while True:
+                if self.ordered and self._num_got in self._items:
+                    item = self._items.pop(self._num_got)
+                    break
+                if not self.ordered and self._arrivals:
+                    item = self._arrivals.popleft()
+                    break
+                if (self._closed and self._num_got >= self._num_put) or stopped():
+                    return _END
+                self._cond.wait(self.wait)
+            self._num_got += 1
+            self._cond.notify_all()
+        return item
+
+    def close(self):
+        """Signals that every producer is done."""
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+
+def _partition_readers(itr):
+    """Yields zero-argument callables that each materialize one partition of `itr`.
+
+    `DataFrameIter`-like iterators keep a reference to their dask collection, which
+    lets every partition be computed independently (and so concurrently). Any other
+    iterable is consumed as it is, so only the work after the read is parallelized.
+    """
+    if hasattr(itr, "readers"):
+        # e.g. `RowGroupIter`
+        yield from itr.readers()
+        return
+
+    ddf = getattr(itr, "_ddf", None)
+    if ddf is None or not hasattr(itr, "indices"):
+        for part in itr:
+            yield lambda part=part: part
+        return
+
+    columns = getattr(itr, "columns", None)
+    for _ in range(getattr(itr, "epochs", 1)):
+        for i in itr.indices:
+            yield lambda i=i: _compute_partition(ddf, i, columns)
+
+
+def _compute_partition(ddf, index, columns=None):
+    part = ddf.get_partition(index)
+    if columns:
+        part = part[columns]
+    return part.compute(scheduler="synchronous")
+
+
+class _ChunkTasks:
+    """Thread-safe source of `(sequence number, partition readers)` tasks."""
+
+    def __init__(self, readers, num_parts):
+        self._readers = readers
+        self.num_parts = num_parts
+        self._lock = threading.Lock()
+        self._seq = 0
+
+    def next(self):
+        with self._lock:
+            parts = list(itertools.islice(self._readers, self.num_parts))
+            if not parts:
+                return None
+            seq = self._seq
+            self._seq += 1
+        return seq, parts
+
+
+class ParallelChunkQueue(ChunkQueue):
+    """`ChunkQueue` that spreads the work of building chunks over a pool of threads.
+
+    The pipeline has three stages:
+
+    1. `num_workers` reader threads read and concatenate the partitions of a chunk.
+    2. A single assembler thread carries the rows that don't fill a whole batch
+       over to the next chunk, exactly like `ChunkQueue.chunk_logic`, and shuffles
+       the chunks, so the shuffles are reproducible.
+    3. `num_conversion_workers` threads convert the chunks to framework tensors
+       with `make_tensors`.
+
+    Stages are connected by bounded reorder buffers holding up to `prefetch` chunks.
+    With `deterministic=True` chunks leave every stage in the order they were read,
+    so batches come out in the same order as with a single worker.
+
+    Parameters
+    -----------
+    num_workers: int
+        Number of reader threads
+    num_conversion_workers: int, optional
+        Number of conversion threads, defaults to `num_workers`
+    deterministic: bool
+        Whether batches keep the order of the underlying partitions
+    prefetch: int, optional
+        Max number of chunks buffered between two stages,
+        defaults to twice the size of the largest thread pool
+    """
+
+    def __init__(
+        self,
+        dataloader,
+        qsize,
+        num_parts=1,
+        shuffle=False,
+        put_wait=0.1,
+        epochs=1,
+        num_workers=2,
+        num_conversion_workers=None,
+        deterministic=True,
+        prefetch=None,
+    ):
+        super().__init__(
+            dataloader,
+            qsize,
+            num_parts=num_parts,
+            shuffle=shuffle,
+            put_wait=put_wait,
+            epochs=epochs,
+        )
+        self.num_workers = num_workers
+        self.num_conversion_workers = num_conversion_workers or num_workers
+        self.deterministic = deterministic
+        self.prefetch = prefetch or 2 * max(self.num_workers, self.num_conversion_workers)
+        self._abort_event = threading.Event()
+        self._error = None
+
+    def _halted(self):
+        return self.stopped or self._abort_event.is_set()
+
+    def _fail(self, error):
+        if self._error is None:
+            self._error = error
+        self._abort_event.set()
+
+    def _spawn(self, target, num_threads, dev, on_done):
+        remaining = [num_threads]
+        lock = threading.Lock()
+
+        def run():
+            try:
+                if self.dataloader.device != "cpu":
+                    with self.dataloader._get_device_ctx(dev):
+                        target()
+                else:
+                    target()
+            except Exception as e:  # pylint: disable=broad-except
+                self._fail(e)
+            finally:
+                with lock:
+                    remaining[0] -= 1
+                    is_last = remaining[0] == 0
+                if is_last:
+                    on_done()
+
+        threads = [threading.Thread(target=run, daemon=True) for _ in range(num_threads)]
+        for t in threads:
+            t.start()
+        return threads
+
+    @annotate("read_chunks", color="darkgreen", domain="nvt_python")
+    def _read_chunks(self, tasks, read_buffer):
+        while not self._halted():
+            task = tasks.next()
+            if task is None:
+                return
+            seq, parts = task
+            start = time.perf_counter()
+            chunks = concat([read() for read in parts])
+            chunks.reset_index(drop=True, inplace=True)
+            self.dataloader._stage_timer.record(
+                "batch", time.perf_counter() - start, len(chunks), _frame_nbytes(chunks)
+            )
+            if read_buffer.put(seq, chunks, self._halted):
+                return
+
+    @annotate("assemble_chunks", color="darkgreen", domain="nvt_python")
+    def _assemble_chunks(self, read_buffer, convert_buffer):
+        batch_size = self.dataloader.batch_size
+        spill, seq = None, 0
+        while True:
+            chunks = read_buffer.get(self._halted)
+            if chunks is _END:
+                break
+            start = time.perf_counter()
+            if spill is not None and not spill.empty:
+                chunks = concat([spill, chunks])
+                chunks.reset_index(drop=True, inplace=True)
+            chunks, spill = self.get_batch_div_chunk(chunks, batch_size)
+            if self.shuffle and len(chunks) > 0:
+                # shuffled in this single thread, in the order of `seq`, so that the
+                # draws from the global RNG (and the batches) are reproducible
+                chunks = shuffle_df(chunks)
+            self.dataloader._stage_timer.record(
+                "chunk_logic", time.perf_counter() - start, len(chunks), _frame_nbytes(chunks)
+            )
+            if len(chunks) > 0:
+                if convert_buffer.put(seq, (seq, chunks), self._halted):
+                    return
+                seq += 1
+        # takes care final batch, which is less than batch size
+        if not self._halted() and not self.dataloader.drop_last:
+            if spill is not None and not spill.empty:
+                convert_buffer.put(seq, (seq, spill), self._halted)
+
+    @annotate("convert_chunks", color="darkgreen", domain="nvt_python")
+    def _convert_chunks(self, convert_buffer, out_buffer):
+        while True:
+            item = convert_buffer.get(self._halted)
+            if item is _END:
+                return
+            seq, chunks = item
+            batches = list(self.dataloader.make_tensors(chunks, self.dataloader._use_nnz))
+            if out_buffer.put(seq, batches, self._halted):
+                return
+
+    @annotate("load_chunks", color="darkgreen", domain="nvt_python")
+    def load_chunks(self, dev):
+        self._error = None
+        self._abort_event.clear()
+
+        # The assembler consumes chunks in a single thread, so the conversion
+        # stage is fed through an (unordered) work queue and re-ordered on output.
+        read_buffer = _ReorderBuffer(self.prefetch, ordered=self.deterministic)
+        convert_buffer = _ReorderBuffer(self.prefetch, ordered=False)
+        out_buffer = _ReorderBuffer(self.prefetch, ordered=self.deterministic)
+
+        tasks = _ChunkTasks(_partition_readers(self.itr), self.num_parts)
+        threads = self._spawn(
+            lambda: self._read_chunks(tasks, read_buffer), self.num_workers, dev, read_buffer.close
+        )
+        threads += self._spawn(
+            lambda: self._assemble_chunks(read_buffer, convert_buffer),
+            1,
+            dev,
+            convert_buffer.close,
+        )
+        threads += self._spawn(
+            lambda: self._convert_chunks(convert_buffer, out_buffer),
+            self.num_conversion_workers,
+            dev,
+            out_buffer.close,
+        )
+
+        while True:
+            batches = out_buffer.get(self._halted)
+            if batches is _END or self.put(batches):
+                break
+
+        if self._error is not None:
+            self._abort_event.set()
+        for t in threads:
+            t.join()
+        if self._error is not None:
+            self.put(self._error)
+
+
+class ProcessChunkQueue(ChunkQueue):
+    """`ChunkQueue` that builds chunks in a pool of worker processes.
+
+    Every worker reads its share of the chunks, pulls them apart into flat NumPy
+    arrays (see `workers.flatten_chunk`) and hands them back through shared memory,
+    so none of the pandas work holds the GIL of the training process, and the
+    dataframes are never pickled. The training process only wraps the arrays
+    into tensors. Rows that don't fill a whole batch are carried over within
+    each worker; the leftovers of all workers are batched together at the end,
+    so the number of batches is the same as with a single thread.
+
+    Batches come out in the order the workers finish their chunks.
+    Only supported on CPU.
+
+    Parameters
+    -----------
+    num_workers: int
+        Number of worker processes
+    prefetch: int, optional
+        Max number of chunks buffered ahead of the consumer,
+        defaults to twice the number of workers
+    start_method: str
+        The `multiprocessing` start method used for the workers. The default, "spawn",
+        is safe to use once TensorFlow or PyTorch have been initialized.
+    """
+
+    def __init__(
+        self,
+        dataloader,
+        qsize,
+        num_parts=1,
+        shuffle=False,
+        put_wait=0.1,
+        epochs=1,
+        num_workers=1,
+        prefetch=None,
+        start_method="spawn",
+    ):
+        if workers.shared_memory is None:
+            raise ImportError("Process-based loading requires `multiprocessing.shared_memory`")
+        super().__init__(
+            dataloader,
+            qsize,
+            num_parts=num_parts,
+            shuffle=shuffle,
+            put_wait=put_wait,
+            epochs=epochs,
+        )
+        self.num_workers = num_workers
+        self.prefetch = prefetch or 2 * num_workers
+        self.start_method = start_method
+        self._blocks = []
+        self._blocks_lock = threading.Lock()
+
+    def _release_blocks(self, new_block=None):
+        # A block can only be closed once no tensor is using its memory anymore
+        with self._blocks_lock:
+            in_use = []
+            for block in self._blocks:
+                try:
+                    block.close()
+                except BufferError:
+                    in_use.append(block)
+            if new_block is not None:
+                in_use.append(new_block)
+            self._blocks = in_use
+
+    def _chunk_indices(self):
+        ddf = getattr(self.itr, "_ddf", None)
+        if ddf is None or not hasattr(self.itr, "indices"):
+            raise ValueError(
+                "Process-based loading requires a dataset backed by a dask DataFrame, "
+                f"got an iterator of type {type(self.itr)}"
+            )
+        indices = list(self.itr.indices) * getattr(self.itr, "epochs", 1)
+        chunks = [indices[i : i + self.num_parts] for i in range(0, len(indices), self.num_parts)]
+        return ddf, chunks
+
+    def _spill_tensors(self, spills):
+        if not spills:
+            return None
+        spill = workers.concat_flat_chunks(spills)
+        if self.dataloader.drop_last:
+            batch_size = self.dataloader.batch_size
+            spill = workers.slice_flat_chunk(spill, spill["num_rows"] // batch_size * batch_size)
+        if spill["num_rows"] == 0:
+            return None
+        return list(self.dataloader.make_tensors_from_arrays(spill, self.dataloader._use_nnz))
+
+    @annotate("load_chunks", color="darkgreen", domain="nvt_python")
+    def load_chunks(self, dev):
+        try:
+            self._load_chunks()
+        except Exception as e:  # pylint: disable=broad-except
+            self.put(e)
+
+    def _load_chunks(self):
+        dataloader = self.dataloader
+        ddf, chunks = self._chunk_indices()
+        groups = [
+            list(getattr(names, "column_names", names))
+            for names in (dataloader.cat_names, dataloader.cont_names, dataloader.label_names)
+        ]
+
+        ctx = multiprocessing.get_context(self.start_method)
+        results = ctx.Queue(self.prefetch)
+        stop_event = ctx.Event()
+        processes = [
+            ctx.Process(
+                target=workers.load_chunks_worker,
+                args=(
+                    ddf,
+                    chunks[i :: self.num_workers],
+                    groups,
+                    dataloader.batch_size,
+                    self.shuffle,
+                    results,
+                    stop_event,
+                ),
+                daemon=True,
+            )
+            for i in range(min(self.num_workers, len(chunks)))
+        ]
+        for process in processes:
+            process.start()
+
+        spills, num_done = [], 0
+        try:
+            while num_done < len(processes):
+                if self.stopped:
+                    return
+                try:
+                    message = results.get(timeout=0.1)
+                except queue.Empty:
+                    if any(process.is_alive() for process in processes):
+                        continue
+                    try:
+                        # the workers may have put their last messages and exited
+                        # after the timeout, which is a clean shutdown
+                        message = results.get_nowait()
+                    except queue.Empty:
+                        raise RuntimeError("Data loader worker processes exited unexpectedly")
+
+                kind = message[0]
+                if kind == "done":
+                    num_done += 1
+                elif kind == "error":
+                    raise RuntimeError(f"Error in data loader worker process:\n{message[1]}")
+                elif kind == "spill":
+                    if message[1] is not None:
+                        spills.append(message[1])
+                else:
+                    flat, block = workers.attach_shared_chunk(message[1], message[2])
+                    self._release_blocks(block)
+                    batches = list(dataloader.make_tensors_from_arrays(flat, dataloader._use_nnz))
+                    del flat
+                    if self.put(batches):
+                        return
+
+            # takes care final batch(es), built from the rows left over by every worker
+            spill_batches = self._spill_tensors(spills)
+            if spill_batches:
+                self.put(spill_batches)
+        finally:
+            stop_event.set()
+            for process in processes:
+                process.join(timeout=1)
+                if process.is_alive():
+                    process.terminate()
+            self._discard_pending(results)
+
+    def _discard_pending(self, results):
+        while True:
+            try:
+                message = results.get_nowait()
+            except (queue.Empty, OSError, ValueError):
+                return
+            if message[0] == "chunk":
+                workers.discard_shared_chunk(message[1])
+
+    def stop(self):
+        super().stop()
+        self._release_blocks()
+
+
 def _get_dataset_schema(dataset):
     return dataset.schema if hasattr(dataset, "schema") else None
 
@@ -208,6 +934,17 @@ class DataLoader:
         sparse_names=None,
         sparse_max=None,
         sparse_as_dense=False,
+        num_workers=1,
+        num_conversion_workers=None,
+        deterministic=True,
+        worker_type="thread",
+        row_groups_per_part=None,
+        cache_batches=False,
+        cache_max_bytes=None,
+        cache_spill_dir=None,
+        adaptive_chunking=False,
+        max_parts_per_chunk=None,
+        chunk_memory_cap=None,
     ):
         self.data = dataset
         self.schema = _get_dataset_schema(dataset)
@@ -248,9 +985,50 @@ class DataLoader:
         self.seed_fn = seed_fn
 
         self.num_rows_processed = 0
+        self._skipped_bytes_per_row = None
+        self._stage_timer = StageTimer()
 
         self.parts_per_chunk = parts_per_chunk
         self.shuffle = shuffle
+        self.num_workers = num_workers
+        self.num_conversion_workers = num_conversion_workers
+        self.deterministic = deterministic
+        if worker_type not in ("thread", "process"):
+            raise ValueError(f"`worker_type` must be 'thread' or 'process', got {worker_type}")
+        if worker_type == "process" and self.device != "cpu":
+            raise ValueError("`worker_type='process'` is only supported with `device='cpu'`")
+        self.worker_type = worker_type
+
+        # read Parquet row groups instead of Dask partitions,
+        # `self.indices` then refers to the row groups
+        self.row_groups_per_part = row_groups_per_part
+        self._row_groups = None
+        if row_groups_per_part:
+            if worker_type == "process":
+                raise ValueError(
+                    "`row_groups_per_part` isn't supported with `worker_type='process'`"
+                )
+            paths, self._fs = parquet_files(dataset)
+            self._row_groups, self._row_group_metadata = index_row_groups(paths, self._fs)
+            self.indices = cp.arange(len(self._row_groups))
+
+        # batches of the first pass, replayed by the next ones
+        if cache_batches and shuffle:
+            raise ValueError("`cache_batches` requires `shuffle=False`")
+        self.cache_batches = cache_batches
+        self.cache_max_bytes = cache_max_bytes
+        self.cache_spill_dir = cache_spill_dir
+        self._cache = self._new_cache() if cache_batches else None
+        self._cache_index = 0
+
+        self._chunk_controller = None
+        if adaptive_chunking:
+            if worker_type == "process" or num_workers > 1:
+                raise ValueError("`adaptive_chunking` requires a single thread worker")
+            self._chunk_controller = AdaptiveChunkController(
+                parts_per_chunk, max_parts=max_parts_per_chunk, memory_cap=chunk_memory_cap
+            )
+
         self.__buff = None
         self.__buff_len = None
         self._batch_itr = None
@@ -260,11 +1038,61 @@ class DataLoader:
     def _buff(self):
         if self.__buff is None:
             # we set size of chunk queue to 1 we only want one chunk in queue at a time.
-            self.__buff = ChunkQueue(
-                self, 1, num_parts=self.parts_per_chunk, shuffle=self.shuffle, epochs=self._epochs
-            )
+            if self.worker_type == "process":
+                self.__buff = ProcessChunkQueue(
+                    self,
+                    1,
+                    num_parts=self.parts_per_chunk,
+                    shuffle=self.shuffle,
+                    epochs=self._epochs,
+                    num_workers=self.num_workers,
+                )
+            elif self.num_workers > 1:
+                self.__buff = ParallelChunkQueue(
+                    self,
+                    1,
+                    num_parts=self.parts_per_chunk,
+                    shuffle=self.shuffle,
+                    epochs=self._epochs,
+                    num_workers=self.num_workers,
+                    num_conversion_workers=self.num_conversion_workers,
+                    deterministic=self.deterministic,
+                )
+            else:
+                self.__buff = ChunkQueue(
+                    self,
+                    1,
+                    num_parts=self.parts_per_chunk,
+                    shuffle=self.shuffle,
+                    epochs=self._epochs,
+                    controller=self._chunk_controller,
+                )
         return self.__buff
 
+    @property
+    def chunk_metrics(self):
+        """Decisions and measurements of the adaptive chunking, None when it's disabled."""
+        if self._chunk_controller is None:
+            return None
+        return self._chunk_controller.metrics
+
+    @property
+    def stage_metrics(self):
+        """
+        Cumulative time, rows and bytes (with the resulting rates) of each
+        stage of the loader since it was created or `reset_stage_metrics`:
+        `batch` (reading partitions), `chunk_logic` (concatenating and
+        shuffling them into chunks), `make_tensors` (converting chunks to tensors,
+        including `_create_tensors`) and `_handle_tensors` (building the output
+        of each batch). Bytes are the in-memory size of the dataframes, and
+        of the output tensors for `_handle_tensors`. Reading and chunking in
+        loader processes (`worker_type="process"`) isn't timed.
+        """
+        return self._stage_timer.metrics
+
+    def reset_stage_metrics(self):
+        self._stage_timer.reset()
+
     @property
     def _buff_len(self):
         if self.__buff_len is None:
@@ -284,6 +1112,20 @@ class DataLoader:
         self.__buff = None
         self.__buff_len = None
         self._epochs = epochs
+        if self._cache is not None:
+            self._cache = self._new_cache()
+
+    def _new_cache(self):
+        return BatchCache(
+            self.cache_max_bytes,
+            self.cache_spill_dir,
+            to_arrays=self._batch_to_arrays,
+            from_arrays=self._batch_from_arrays,
+        )
+
+    @property
+    def _replaying(self):
+        return self._cache is not None and self._cache.complete
 
     def __len__(self):
         batches = _num_steps(self._buff_len, self.batch_size)
@@ -335,6 +1177,22 @@ class DataLoader:
     def __iter__(self):
         self.stop()
         self.num_rows_processed = 0
+        if self._cache is not None:
+            self._cache_index = 0
+            if self._replaying:
+                # no need for workers, every batch comes from the cache
+                self._workers = []
+                return self
+            if self._cache.dropped:
+                warnings.warn(
+                    "Batches don't fit in `cache_max_bytes`, disabling the batch cache. "
+                    "Set `cache_spill_dir` to spill them to disk instead."
+                )
+                self._cache.clear()
+                self._cache = None
+            else:
+                # restarting an incomplete pass
+                self._cache.clear()
         if self._buff.stopped:
             self._buff.start()
 
@@ -342,6 +1200,8 @@ class DataLoader:
         # parts of the dataset "close" to one another
         if self.shuffle:
             self._shuffle_indices()
+            # the data iterator holds a copy of the indices taken when it was built
+            self._buff.itr = self._data_iter(self._epochs)
 
         # build and start new threads for loading and
         # concatenating data
@@ -357,9 +1217,63 @@ class DataLoader:
 
     def _data_iter(self, epochs):
         indices = self._gather_indices_for_dev(0)
+        if self._row_groups is not None:
+            return RowGroupIter(
+                self._row_groups,
+                self._row_group_metadata,
+                columns=self._column_names(),
+                indices=indices,
+                row_groups_per_part=self.row_groups_per_part,
+                epochs=epochs,
+                fs=self._fs,
+                cpu=self.device == "cpu",
+            )
+        # only read (and decode) the columns used by the loader
+        columns = self._column_names()
         if hasattr(self.data, "to_iter"):
-            return self.data.to_iter(indices=indices, epochs=epochs)
-        return DataFrameIter(self.data, epochs=epochs)
+            return self.data.to_iter(columns=columns, indices=indices, epochs=epochs)
+        return DataFrameIter(self.data, columns=columns, epochs=epochs)
+
+    @property
+    def bytes_skipped(self):
+        """
+        Estimated number of bytes of the columns that were not read,
+        because the loader doesn't use them, for the rows processed
+        since the start of the current iteration
+        """
+        if self._skipped_bytes_per_row is None:
+            self._skipped_bytes_per_row = self._get_skipped_bytes_per_row()
+        return int(self.num_rows_processed * self._skipped_bytes_per_row)
+
+    def _get_skipped_bytes_per_row(self):
+        used = set(self._column_names())
+        metadata = self._row_group_metadata if self._row_groups is not None else None
+        if metadata is None:
+            try:
+                _, metadata = index_row_groups(*parquet_files(self.data))
+            except (ImportError, ValueError):
+                metadata = None
+        if metadata:
+            # uncompressed sizes from the footers of the Parquet files
+            sizes, num_rows = parquet_column_sizes(metadata)
+            skipped = sum(size for name, size in sizes.items() if name not in used)
+            return skipped / num_rows if num_rows else 0
+
+        # otherwise only fixed-width columns can be accounted for
+        ddf = self.data.to_ddf() if hasattr(self.data, "to_ddf") else self.data
+        return sum(
+            dtype.itemsize
+            for name, dtype in ddf.dtypes.items()
+            if name not in used and isinstance(dtype, np.dtype) and not dtype.hasobject
+        )
+
+    def _column_names(self):
+        """Names of the columns used by the loader, in the order of `_create_tensors`."""
+        return [
+            name
+            for names in (self.cat_names, self.cont_names, self.label_names)
+            for name in getattr(names, "column_names", names)
+        ]
 
     def _fetch_chunk(self):
         chunks = self._buff.get()
@@ -384,6 +1298,9 @@ class DataLoader:
         if self._workers is None:
             DataLoader.__iter__(self)
 
+        if self._replaying:
+            return self._get_cached_batch()
+
         # get the first chunks
         if self._batch_itr is None:
             self._fetch_chunk()
@@ -397,26 +1314,88 @@ class DataLoader:
             if not self._working and self._buff.empty:
                 self._workers = None
                 self._batch_itr = None
+                if self._cache is not None:
+                    self._cache.finish()
                 raise
 
             # otherwise get the next chunks and return
             # the first batch
             self._fetch_chunk()
             batch = next(self._batch_itr)
+        if self._cache is not None and not self._cache.dropped:
+            self._cache.put(self._cache_index, batch, self._batch_nbytes(batch))
+            self._cache_index += 1
+            if self._cache_index == DataLoader.__len__(self):
+                # Keras reads exactly `len()` batches through `__getitem__`,
+                # without ever reaching the StopIteration above
+                self._cache.finish()
+        self._count_rows(batch)
+        return batch
+
+    def _get_cached_batch(self):
+        if self._cache_index >= len(self._cache):
+            # also stops the workers of a pass that filled the cache
+            self.stop()
+            raise StopIteration
+        batch = self._cache.get(self._cache_index)
+        self._cache_index += 1
+        self._count_rows(batch)
+        return batch
+
+    def _count_rows(self, batch):
         # if batch[0] is empty but other exist
         for sub in batch:
-            if sub is not None and len(sub) > 0:
-                self.num_rows_processed += len(sub)
+            num_rows = _num_rows(sub)
+            if num_rows > 0:
+                self.num_rows_processed += num_rows
                 break
-        return batch
 
     @annotate("make_tensors", color="darkgreen", domain="nvt_python")
     def make_tensors(self, gdf, use_nnz=False):
-        split_idx = self._get_segment_lengths(len(gdf))
+        with self._stage_timer.time("make_tensors", len(gdf), _frame_nbytes(gdf)):
+            split_idx = self._get_segment_lengths(len(gdf))
+
+            # map from big chunk to framework-specific tensors
+            chunks = self._create_tensors(gdf)
 
-        # map from big chunk to framework-specific tensors
-        chunks = self._create_tensors(gdf)
+            return self._split_tensors(chunks, split_idx, use_nnz)
+
+    @annotate("make_tensors_from_arrays", color="darkgreen", domain="nvt_python")
+    def make_tensors_from_arrays(self, flat, use_nnz=False):
+        """Same as `make_tensors`, for a chunk that was already pulled apart into
+        flat NumPy arrays (see `merlin.models.loader.workers.flatten_chunk`).
+        Every array is wrapped as-is with `_from_array`.
+        """
+        start = time.perf_counter()
+        split_idx = self._get_segment_lengths(flat["num_rows"])
+        dtypes = (self._LONG_DTYPE, self._FLOAT32_DTYPE, self._FLOAT32_DTYPE)
+        chunks = []
+        for group, dtype in zip(flat["groups"], dtypes):
+            if group is None:
+                chunks.append(None)
+                continue
+            x = None
+            if group["scalars"] is not None:
+                x = self._from_array(group["scalars"], dtype)
+            if group["lists"]:
+                list_tensors = OrderedDict()
+                for column_name, values in group["lists"].items():
+                    list_tensors[column_name] = self._from_array(values, dtype)
+                x = x, list_tensors
+            chunks.append(x)
+        if flat["offsets"] is not None:
+            chunks.append(self._from_array(flat["offsets"], self._LONG_DTYPE))
+
+        batches = self._split_tensors(chunks, split_idx, use_nnz)
+        self._stage_timer.record(
+            "make_tensors",
+            time.perf_counter() - start,
+            flat["num_rows"],
+            workers.flat_chunk_nbytes(flat),
+        )
+        return batches
 
+    def _split_tensors(self, chunks, split_idx, use_nnz=False):
         # if we have any offsets, calculate nnzs up front
         if len(chunks) == 4:
             offsets = chunks[-1]
@@ -432,7 +1411,14 @@ class DataLoader:
             if isinstance(chunk, tuple):
                 chunk, lists = chunk
 
-            if len(split_idx) > 1 and chunk is not None:
+            if isinstance(chunk, list):
+                # one tensor per scalar column, see `_to_column_tensors`
+                if len(split_idx) > 1:
+                    splits = [self._split_fn(column, split_idx) for column in chunk]
+                    chunk = [list(columns) for columns in zip(*splits)]
+                else:
+                    chunk = [chunk]
+            elif len(split_idx) > 1 and chunk is not None:
                 chunk = self._split_fn(chunk, split_idx)
             else:
                 chunk = [chunk for _ in split_idx]
@@ -447,6 +1433,15 @@ class DataLoader:
                     chunk_nnzs = nnzs[:, offset_idx : offset_idx + num_list_columns]
                 offset_idx += num_list_columns
 
+                batch_lists = self._split_list_columns(
+                    lists, chunk_offsets, chunk_nnzs if use_nnz else None, split_idx
+                )
+                if batch_lists is not None:
+                    for n, (c, c_lists) in enumerate(zip(chunk, batch_lists)):
+                        batches[n].append((c, c_lists))
+                    continue
+
+                # fall back to slicing every list column batch by batch,
                 # split them into batches, including an extra 1 on the offsets
                 # so we know how long the very last element is
                 batch_offsets = self._split_fn(chunk_offsets, split_idx + [1])
@@ -492,7 +1487,52 @@ class DataLoader:
                     c = (c, batch_lists)
 
                 batches[n].append(c)
-        return (self._handle_tensors(*batch) for batch in batches)
+        return (
+            self._timed_handle_tensors(batch, num_rows)
+            for batch, num_rows in zip(batches, split_idx)
+        )
+
+    def _timed_handle_tensors(self, batch, num_rows):
+        # runs lazily, when the batch is taken from the chunk
+        start = time.perf_counter()
+        batch = self._handle_tensors(*batch)
+        self._stage_timer.record(
+            "_handle_tensors", time.perf_counter() - start, num_rows, self._batch_nbytes(batch)
+        )
+        return batch
+
+    def _split_list_columns(self, lists, offsets, nnzs, split_idx):
+        """
+        Vectorized batching of the list columns of a chunk. The value
+        ranges of every batch and column are gathered from the offsets
+        at once, then each column is split in a single call. Returns
+        one dict of column_name: (values, offsets or nnzs) per batch, or
+        None to fall back to the batch-by-batch loop in `_split_tensors`
+        """
+        bounds = [0] + list(itertools.accumulate(split_idx))
+        try:
+            # starts[i][k] is the first value of batch i in list column k
+            starts = self._rows_to_list(offsets, bounds)
+        except NotImplementedError:
+            return None
+        for k, values in enumerate(lists.values()):
+            if starts[0][k] != 0 or starts[-1][k] != len(values):
+                return None
+
+        batch_lists = [{} for _ in split_idx]
+        for k, (column_name, values) in enumerate(lists.items()):
+            column_starts = [row[k] for row in starts]
+            lengths = [stop - start for start, stop in zip(column_starts, column_starts[1:])]
+            index = nnzs[:, k : k + 1] if nnzs is not None else offsets[:-1, k : k + 1]
+            if len(split_idx) > 1:
+                values = self._split_fn(values, lengths)
+                index = self._split_fn(index, split_idx)
+            else:
+                values, index = [values], [index]
+            for n, batch in enumerate(batch_lists):
+                batch_index = index[n] if nnzs is not None else index[n] - column_starts[n]
+                batch[column_name] = (values[n], batch_index)
+        return batch_lists
 
     def _get_segment_lengths(self, num_samples):
         """
@@ -530,6 +1570,51 @@ class DataLoader:
         """
         raise NotImplementedError
 
+    def _to_column_tensors(self, gdf, columns, dtype=None):
+        """
+        Optional zero-copy alternative to `_to_tensor` for
+        the scalar columns of a chunk. Returns one tensor per
+        column, built straight from the column's buffer, or
+        None to fall back to `_to_tensor`
+        """
+        return None
+
+    def _from_array(self, array, dtype=None):
+        """
+        Wraps a contiguous NumPy array into a tensor of
+        the appropriate library. Only required when loading
+        with `worker_type="process"`
+        """
+        raise NotImplementedError
+
+    def _rows_to_list(self, tensor, rows):
+        """
+        Gathers `rows` of a 2D tensor into a nested Python list.
+        Used for the vectorized batching of list columns, which
+        falls back to a batch-by-batch loop when not implemented
+        """
+        raise NotImplementedError
+
+    def _batch_nbytes(self, batch):
+        """
+        Number of bytes held by the tensors of a batch,
+        required by `cache_batches`
+        """
+        raise NotImplementedError
+
+    def _batch_to_arrays(self, batch):
+        """
+        Maps a batch to a (structure, list of NumPy arrays) pair
+        so that it can be spilled to disk by the batch cache
+        """
+        raise NotImplementedError
+
+    def _batch_from_arrays(self, structure, arrays):
+        """
+        Inverse of `_batch_to_arrays`
+        """
+        raise NotImplementedError
+
     def _get_device_ctx(self, dev):
         """
         One of the mandatory functions a child class needs
@@ -549,9 +1634,9 @@ class DataLoader:
     def _FLOAT32_DTYPE(self):
         raise NotImplementedError
 
-    def _separate_list_columns(self, gdf):
+    def _separate_list_columns(self, gdf, columns=None):
         lists, scalars = [], []
-        for col in gdf.columns:
+        for col in columns if columns is not None else gdf.columns:
             if is_list_dtype(gdf[col]):
                 lists.append(col)
             else:
@@ -565,6 +1650,7 @@ class DataLoader:
         categorical, continuous, and label tensors.
         Can be overrideen
         """
+        start, num_rows, nbytes = time.perf_counter(), len(gdf), _frame_nbytes(gdf)
         workflow_nodes = (self.cat_names, self.cont_names, self.label_names)
         dtypes = (self._LONG_DTYPE, self._FLOAT32_DTYPE, self._FLOAT32_DTYPE)
         tensors = []
@@ -576,19 +1662,18 @@ class DataLoader:
             if hasattr(column_names, "column_names"):
                 column_names = column_names.column_names
 
-            gdf_i = gdf[column_names]
-            gdf.drop(columns=column_names, inplace=True)
-
-            scalars, lists = self._separate_list_columns(gdf_i)
+            scalars, lists = self._separate_list_columns(gdf, column_names)
 
             x = None
             if scalars:
                 # should always return dict column_name: values, offsets (optional)
-                x = self._to_tensor(gdf_i[scalars], dtype)
+                x = self._to_column_tensors(gdf, scalars, dtype)
+                if x is None:
+                    x = self._to_tensor(gdf[scalars], dtype)
             if lists:
                 list_tensors = OrderedDict()
                 for column_name in lists:
-                    column = gdf_i.pop(column_name)
+                    column = gdf[column_name]
                     leaves, col_offsets = pull_apart_list(column)
                     if isinstance(leaves[0], list):
 
@@ -598,6 +1683,7 @@ class DataLoader:
                     list_tensors[column_name] = self._to_tensor(leaves, dtype)
                 x = x, list_tensors
             tensors.append(x)
+            gdf.drop(columns=column_names, inplace=True)
 
         if not offsets.empty:
             offsets_tensor = self._to_tensor(offsets, self._LONG_DTYPE)
@@ -606,6 +1692,7 @@ class DataLoader:
             tensors.append(offsets_tensor)
         del gdf, offsets
 
+        self._stage_timer.record("_create_tensors", time.perf_counter() - start, num_rows, nbytes)
         return tensors
 
     @annotate("_handle_tensors", color="darkgreen", domain="nvt_python")
@@ -618,7 +1705,9 @@ class DataLoader:
             names = [i for i in names if i not in lists]
 
             # now add in any scalar tensors
-            if len(names) > 1:
+            if isinstance(tensor, list):
+                lists.update(zip(names, tensor))
+            elif len(names) > 1:
                 tensors = self._tensor_split(tensor, len(names), axis=1)
                 lists.update(zip(names, tensors))
             elif len(names) == 1:
@@ -635,6 +1724,9 @@ class DataLoader:
 
         # TODO: use dict for labels as well?
         # would require output layers to match naming
-        if len(self.label_names) > 1:
+        if isinstance(labels, list):
+            if len(labels) == 1:
+                labels = labels[0]
+        elif len(self.label_names) > 1:
             labels = self._tensor_split(labels, len(self.label_names), axis=1)
         return X, labels
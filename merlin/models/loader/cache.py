@@ -0,0 +1,139 @@
+#
+# Copyright (c) 2021, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import os
+import tempfile
+import weakref
+from collections import OrderedDict
+
+import numpy as np
+
+
+class BatchCache:
+    """LRU cache of the batches produced by one pass of a data loader.
+
+    Batches are kept in memory up to `max_bytes`. Beyond that, the least recently
+    used batches are evicted from memory: they are appended to a memory-mapped
+    spill file in `spill_dir` when one is given, and dropped otherwise. Once a
+    batch has been dropped, the pass can't be replayed from the cache anymore.
+
+    Parameters
+    -----------
+    max_bytes: int, optional
+        Memory budget of the cache, unlimited by default
+    spill_dir: str, optional
+        Directory of the spill file. Batches evicted from memory are dropped if None
+    to_arrays: callable, optional
+        Maps a batch to a `(structure, arrays)` pair, where `arrays` holds NumPy arrays
+        (or None), required to spill
+    from_arrays: callable, optional
+        Maps a `(structure, arrays)` pair back to a batch, required to spill
+    """
+
+    def __init__(self, max_bytes=None, spill_dir=None, to_arrays=None, from_arrays=None):
+        self.max_bytes = max_bytes
+        self.spill_dir = spill_dir
+        self._to_arrays = to_arrays
+        self._from_arrays = from_arrays
+        self._memory = OrderedDict()
+        self._spilled = {}
+        self._spill_path = None
+        self._finalizer = None
+        self.clear()
+
+    def __len__(self):
+        return self.num_batches
+
+    def clear(self):
+        """Drops every batch and removes the spill file."""
+        self._memory.clear()
+        self._spilled.clear()
+        if self._finalizer is not None:
+            self._finalizer()
+        self._spill_path = self._finalizer = None
+        self.memory_bytes = 0
+        self.spilled_bytes = 0
+        self.num_batches = 0
+        self.dropped = False
+        self.complete = False
+
+    def put(self, index, batch, nbytes):
+        """Caches the `index`-th batch of the pass, which holds `nbytes` bytes."""
+        self._memory[index] = (batch, nbytes)
+        self.memory_bytes += nbytes
+        self.num_batches = max(self.num_batches, index + 1)
+        while self.max_bytes is not None and self.memory_bytes > self.max_bytes and self._memory:
+            self._evict()
+
+    def get(self, index):
+        """Returns the `index`-th batch, or None if it isn't cached."""
+        if index in self._memory:
+            self._memory.move_to_end(index)
+            return self._memory[index][0]
+        if index in self._spilled:
+            structure, specs = self._spilled[index]
+            return self._from_arrays(structure, [self._read(spec) for spec in specs])
+        return None
+
+    def finish(self):
+        """Marks the end of a full pass, after which it can be replayed if nothing was dropped."""
+        self.complete = not self.dropped
+
+    def _evict(self):
+        index, (batch, nbytes) = self._memory.popitem(last=False)
+        self.memory_bytes -= nbytes
+        if self.spill_dir is None or self._to_arrays is None:
+            self._drop()
+            return
+        try:
+            structure, arrays = self._to_arrays(batch)
+        except NotImplementedError:
+            self._drop()
+            return
+        self._spilled[index] = (structure, [self._write(array) for array in arrays])
+
+    def _drop(self):
+        # the pass can't be replayed anymore, so free what's cached
+        self.dropped = True
+        self._memory.clear()
+        self._spilled.clear()
+        self.memory_bytes = 0
+
+    def _write(self, array):
+        if array is None or array.size == 0:
+            return array
+        if self._spill_path is None:
+            fd, self._spill_path = tempfile.mkstemp(suffix=".batches", dir=self.spill_dir)
+            os.close(fd)
+            self._finalizer = weakref.finalize(self, _remove, self._spill_path)
+        array = np.ascontiguousarray(array)
+        with open(self._spill_path, "ab") as f:
+            offset = f.tell()
+            array.tofile(f)
+        self.spilled_bytes += array.nbytes
+        return offset, array.shape, array.dtype.str
+
+    def _read(self, spec):
+        if spec is None or isinstance(spec, np.ndarray):
+            return spec
+        offset, shape, dtype = spec
+        size = int(np.prod(shape))
+        values = np.memmap(self._spill_path, dtype=dtype, mode="r", offset=offset, shape=(size,))
+        return values.reshape(shape)
+
+
+def _remove(path):
+    if os.path.exists(path):
+        os.remove(path)
@@ -13,6 +13,13 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+from collections import OrderedDict, namedtuple
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:
+    pa = pq = None
 
 
 class DataFrameIter:
@@ -43,3 +50,154 @@ class DataFrameIter:
                 else:
                     yield part.compute(scheduler="synchronous")
         part = None
+
+
+RowGroup = namedtuple("RowGroup", ["path", "index", "num_rows"])
+
+
+def index_row_groups(paths, fs=None):
+    """Lists the row groups of Parquet files from their footers.
+
+    Parameters
+    -----------
+    paths: list(str)
+        Paths of the Parquet files
+    fs: fsspec.AbstractFileSystem, optional
+        Filesystem to open the files with
+
+    Returns
+    -------
+    Tuple of the list of `RowGroup` and a dict with the footer of each file
+    """
+    if pq is None:
+        raise ImportError("Reading Parquet row groups requires pyarrow")
+    row_groups, metadata = [], {}
+    for path in paths:
+        with _open(path, fs) as f:
+            metadata[path] = pq.ParquetFile(f).metadata
+        for i in range(metadata[path].num_row_groups):
+            row_groups.append(RowGroup(path, i, metadata[path].row_group(i).num_rows))
+    return row_groups, metadata
+
+
+def parquet_column_sizes(metadata):
+    """Sums the uncompressed size of every column over the footers in `metadata`.
+
+    Returns
+    -------
+    Tuple of a dict of column name: bytes and the total number of rows
+    """
+    sizes, num_rows = {}, 0
+    for file_metadata in metadata.values():
+        num_rows += file_metadata.num_rows
+        for i in range(file_metadata.num_row_groups):
+            row_group = file_metadata.row_group(i)
+            for j in range(row_group.num_columns):
+                column = row_group.column(j)
+                # nested (list) columns have paths like `name.list.element`
+                name = column.path_in_schema.split(".")[0]
+                sizes[name] = sizes.get(name, 0) + column.total_uncompressed_size
+    return sizes, num_rows
+
+
+def parquet_files(dataset):
+    """Returns the paths & filesystem of a Parquet-backed `merlin.io.Dataset`."""
+    from merlin.io.parquet import ParquetDatasetEngine
+
+    engine = getattr(dataset, "engine", None)
+    if not isinstance(engine, ParquetDatasetEngine):
+        raise ValueError(
+            "Reading row groups requires a Dataset backed by Parquet files, "
+            f"got an engine of type {type(engine)}"
+        )
+    return engine.paths, engine.fs
+
+
+class RowGroupIter:
+    """Iterates over the row groups of Parquet files instead of Dask partitions.
+
+    Row groups are indexed up front (see `index_row_groups`), so any subset of them can
+    be read in any order, without computing whole partitions. Each part yielded holds
+    `row_groups_per_part` row groups, with only `columns` decoded. Shuffling `indices`
+    before iterating gives near-global shuffling with chunks of only a few row groups.
+
+    Parameters
+    -----------
+    row_groups: list(RowGroup)
+        Every row group of the dataset
+    metadata: dict
+        Footer of each file, to avoid reading them again
+    columns: list(str), optional
+        Columns to read, defaults to all of them
+    indices: list(int), optional
+        Positions in `row_groups` to read, in order
+    row_groups_per_part: int
+        Number of row groups read for each part
+    epochs: int
+        Number of times to go over `indices`
+    fs: fsspec.AbstractFileSystem, optional
+        Filesystem to open the files with
+    cpu: bool
+        Whether to yield pandas or cudf DataFrames
+    """
+
+    def __init__(
+        self,
+        row_groups,
+        metadata=None,
+        columns=None,
+        indices=None,
+        row_groups_per_part=1,
+        epochs=1,
+        fs=None,
+        cpu=True,
+    ):
+        self.row_groups = row_groups
+        self.metadata = metadata or {}
+        self.columns = columns
+        self.indices = indices if indices is not None else range(len(row_groups))
+        self.row_groups_per_part = row_groups_per_part
+        self.epochs = epochs
+        self.fs = fs
+        self.cpu = cpu
+
+    def __len__(self):
+        return sum(self.row_groups[i].num_rows for i in self.indices) * self.epochs
+
+    def __iter__(self):
+        for read in self.readers():
+            yield read()
+
+    def readers(self):
+        """Yields zero-argument callables that each read one part, which can be run
+        concurrently (see `ParallelChunkQueue`)."""
+        indices = list(self.indices)
+        for _ in range(self.epochs):
+            for start in range(0, len(indices), self.row_groups_per_part):
+                part = [
+                    self.row_groups[i] for i in indices[start : start + self.row_groups_per_part]
+                ]
+                yield lambda part=part: self.read(part)
+
+    def read(self, row_groups):
+        """Reads `row_groups` into a single DataFrame."""
+        by_file = OrderedDict()
+        for row_group in row_groups:
+            by_file.setdefault(row_group.path, []).append(row_group.index)
+
+        tables = []
+        for path, indices in by_file.items():
+            with _open(path, self.fs) as f:
+                parquet_file = pq.ParquetFile(f, metadata=self.metadata.get(path))
+                tables.append(parquet_file.read_row_groups(indices, columns=self.columns))
+        table = pa.concat_tables(tables) if len(tables) > 1 else tables[0]
+        if self.cpu:
+            return table.to_pandas()
+
+        import cudf
+
+        return cudf.DataFrame.from_arrow(table)
+
+
+def _open(path, fs=None):
+    return fs.open(path, "rb") if fs is not None else open(path, "rb")
@@ -0,0 +1,70 @@
+#
+# Copyright (c) 2021, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+
+
+class StageTimer:
+    """Cumulative wall-clock time, rows and bytes of the stages of a data loader.
+
+    Stages can run in several threads at once, so their times add up to more
+    than the elapsed time. The rates of a stage are its rows and bytes divided
+    by its own cumulative time, i.e. its throughput if it ran alone.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._stages = OrderedDict()
+
+    def reset(self):
+        with self._lock:
+            self._stages.clear()
+
+    def record(self, stage, seconds, num_rows=0, nbytes=0):
+        """Adds a call of `stage` that took `seconds` for `num_rows` rows and `nbytes` bytes."""
+        with self._lock:
+            totals = self._stages.setdefault(stage, [0, 0.0, 0, 0])
+            totals[0] += 1
+            totals[1] += seconds
+            totals[2] += num_rows
+            totals[3] += nbytes
+
+    @contextmanager
+    def time(self, stage, num_rows=0, nbytes=0):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.record(stage, time.perf_counter() - start, num_rows, nbytes)
+
+    @property
+    def metrics(self):
+        """`{stage: {"calls", "seconds", "rows", "bytes", "rows_per_sec", "bytes_per_sec"}}`"""
+        with self._lock:
+            stages = [(stage, list(totals)) for stage, totals in self._stages.items()]
+        metrics = OrderedDict()
+        for stage, (calls, seconds, num_rows, nbytes) in stages:
+            metrics[stage] = {
+                "calls": calls,
+                "seconds": seconds,
+                "rows": num_rows,
+                "bytes": nbytes,
+                "rows_per_sec": num_rows / seconds if seconds > 0 else None,
+                "bytes_per_sec": nbytes / seconds if seconds > 0 else None,
+            }
+        return metrics
@@ -0,0 +1,280 @@
+#
+# Copyright (c) 2021, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import queue
+import traceback
+from collections import OrderedDict
+
+import numpy as np
+
+try:
+    from multiprocessing import shared_memory
+except ImportError:
+    shared_memory = None
+
+from merlin.core.dispatch import concat, is_list_dtype, pull_apart_list
+
+# Byte alignment of every array written to a shared-memory block
+_ALIGNMENT = 64
+
+
+def flatten_chunk(df, groups):
+    """Pulls a (pandas) chunk apart into the flat arrays the loader builds tensors from.
+
+    Parameters
+    -----------
+    df: DataFrame
+        The chunk
+    groups: list(list(str))
+        The categorical, continuous and label column names
+
+    Returns
+    -------
+    dict
+        `num_rows`, one entry per group in `groups` (`None` for an empty group,
+        otherwise the 2D array of scalar columns and a dict with the values of
+        each list column) and the 2D array with the offsets of all list columns.
+    """
+    flat_groups, offsets = [], []
+    for names in groups:
+        if not names:
+            flat_groups.append(None)
+            continue
+        scalars = [name for name in names if not is_list_dtype(df[name])]
+        lists = OrderedDict()
+        for name in names:
+            if name in scalars:
+                continue
+            values, col_offsets = pull_apart_list(df[name])
+            if len(values) and isinstance(values.iloc[0], list):
+                raise ValueError(
+                    f"Nested list column {name} is not supported by process-based loading"
+                )
+            lists[name] = np.ascontiguousarray(values.to_numpy())
+            offsets.append(np.asarray(col_offsets, dtype=np.int64))
+        flat_groups.append(
+            {
+                "scalars": np.ascontiguousarray(df[scalars].to_numpy()) if scalars else None,
+                "lists": lists,
+            }
+        )
+
+    return {
+        "num_rows": len(df),
+        "groups": flat_groups,
+        "offsets": np.ascontiguousarray(np.stack(offsets, axis=1)) if offsets else None,
+    }
+
+
+def _map_arrays(flat, fn):
+    groups = []
+    for group in flat["groups"]:
+        if group is None:
+            groups.append(None)
+            continue
+        scalars = group["scalars"]
+        groups.append(
+            {
+                "scalars": fn(scalars) if scalars is not None else None,
+                "lists": OrderedDict((k, fn(v)) for k, v in group["lists"].items()),
+            }
+        )
+    offsets = flat["offsets"]
+    return {
+        "num_rows": flat["num_rows"],
+        "groups": groups,
+        "offsets": fn(offsets) if offsets is not None else None,
+    }
+
+
+def flat_chunk_nbytes(flat):
+    """Number of bytes of the arrays of a flat chunk."""
+    nbytes = []
+    _map_arrays(flat, lambda array: nbytes.append(array.nbytes))
+    return sum(nbytes)
+
+
+def write_shared_chunk(flat):
+    """Copies a flat chunk into a new shared-memory block.
+
+    Returns the name of the block and a layout (the same structure as `flat`,
+    with every array replaced by its `(offset, shape, dtype)`), which is cheap to pickle.
+    The block is closed, but not unlinked, by the writer.
+    """
+    specs, nbytes = [], 0
+
+    def to_spec(array):
+        nonlocal nbytes
+        if array.dtype.hasobject:
+            raise ValueError(f"Can't write an array of {array.dtype} to shared memory")
+        spec = (nbytes, array.shape, array.dtype.str)
+        specs.append((spec, array))
+        nbytes += _aligned(array.nbytes)
+        return spec
+
+    layout = _map_arrays(flat, to_spec)
+    shm = shared_memory.SharedMemory(create=True, size=max(nbytes, 1))
+    try:
+        for (offset, shape, dtype), array in specs:
+            view = np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+            view[...] = array
+            del view
+    finally:
+        shm.close()
+
+    return shm.name, layout
+
+
+def attach_shared_chunk(name, layout):
+    """Maps a block written by `write_shared_chunk` without copying it.
+
+    The block is unlinked right away, so it is freed as soon as the returned
+    `SharedMemory` is closed, which is only possible once no array uses it anymore.
+    """
+    shm = shared_memory.SharedMemory(name=name)
+    shm.unlink()
+
+    def from_spec(spec):
+        offset, shape, dtype = spec
+        return np.ndarray(shape, dtype=dtype, buffer=shm.buf, offset=offset)
+
+    return _map_arrays(layout, from_spec), shm
+
+
+def discard_shared_chunk(name):
+    shm = shared_memory.SharedMemory(name=name)
+    shm.close()
+    shm.unlink()
+
+
+def concat_flat_chunks(flats):
+    """Concatenates flat chunks, rebasing the offsets of list columns."""
+    if len(flats) == 1:
+        return flats[0]
+
+    first = flats[0]
+    groups = []
+    for i, group in enumerate(first["groups"]):
+        if group is None:
+            groups.append(None)
+            continue
+        scalars = None
+        if group["scalars"] is not None:
+            scalars = np.concatenate([flat["groups"][i]["scalars"] for flat in flats])
+        lists = OrderedDict(
+            (name, np.concatenate([flat["groups"][i]["lists"][name] for flat in flats]))
+            for name in group["lists"]
+        )
+        groups.append({"scalars": scalars, "lists": lists})
+
+    offsets = None
+    if first["offsets"] is not None:
+        rebased = [np.zeros((1, first["offsets"].shape[1]), dtype=np.int64)]
+        start = 0
+        for flat in flats:
+            rebased.append(flat["offsets"][1:] + start)
+            start = start + flat["offsets"][-1]
+        offsets = np.concatenate(rebased)
+
+    return {
+        "num_rows": sum(flat["num_rows"] for flat in flats),
+        "groups": groups,
+        "offsets": offsets,
+    }
+
+
+def slice_flat_chunk(flat, stop):
+    """Keeps the first `stop` rows of a flat chunk."""
+    if stop >= flat["num_rows"]:
+        return flat
+    offsets = flat["offsets"]
+    ends = offsets[stop] if offsets is not None else None
+    groups, list_idx = [], 0
+    for group in flat["groups"]:
+        if group is None:
+            groups.append(None)
+            continue
+        scalars = group["scalars"][:stop] if group["scalars"] is not None else None
+        lists = OrderedDict()
+        for name, values in group["lists"].items():
+            lists[name] = values[: ends[list_idx]]
+            list_idx += 1
+        groups.append({"scalars": scalars, "lists": lists})
+
+    return {
+        "num_rows": stop,
+        "groups": groups,
+        "offsets": offsets[: stop + 1] if offsets is not None else None,
+    }
+
+
+def load_chunks_worker(
+    ddf, chunk_indices, groups, batch_size, shuffle, results, stop_event, put_wait=0.1
+):
+    """Entry point of a loader process.
+
+    Reads the partitions in `chunk_indices` (one list of partition indices per chunk),
+    carries the rows that don't fill a whole batch over to the next chunk and writes every
+    chunk to shared memory. Sends `("chunk", name, layout)` for each chunk, then
+    `("spill", flat_or_None)` with the remaining rows and finally `("done",)`.
+    """
+    from merlin.io.shuffle import shuffle_df
+
+    def send(message):
+        while not stop_event.is_set():
+            try:
+                results.put(message, timeout=put_wait)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    columns = [name for names in groups for name in names]
+    try:
+        spill = None
+        for indices in chunk_indices:
+            if stop_event.is_set():
+                return
+            parts = [
+                ddf.get_partition(i)[columns].compute(scheduler="synchronous") for i in indices
+            ]
+            if spill is not None and len(spill) > 0:
+                parts.insert(0, spill)
+            chunk = concat(parts)
+            chunk.reset_index(drop=True, inplace=True)
+
+            spill_idx = int(len(chunk) / batch_size) * batch_size
+            spill = chunk.iloc[spill_idx:].reset_index(drop=True)
+            chunk = chunk.iloc[:spill_idx].reset_index(drop=True)
+            if shuffle:
+                chunk = shuffle_df(chunk)
+            if len(chunk) > 0:
+                name, layout = write_shared_chunk(flatten_chunk(chunk, groups))
+                if not send(("chunk", name, layout)):
+                    discard_shared_chunk(name)
+                    return
+
+        if spill is not None and len(spill) > 0:
+            send(("spill", flatten_chunk(spill, groups)))
+        else:
+            send(("spill", None))
+    except Exception:  # pylint: disable=broad-except
+        send(("error", traceback.format_exc()))
+    finally:
+        send(("done",))
+
+
+def _aligned(nbytes):
+    return -(-nbytes // _ALIGNMENT) * _ALIGNMENT
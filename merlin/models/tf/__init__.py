@@ -18,7 +18,14 @@
 
 # Must happen before any importing of tensorflow to curtail mem usage
 from merlin.models.loader.tf_utils import configure_tensorflow
-from merlin.models.tf.core.index import IndexBlock, TopKIndexBlock
+from merlin.models.tf.core.index import (
+    IndexBlock,
+    IVFFlatIndexBlock,
+    MemmapTopKIndexBlock,
+    QuantizedIndexBlock,
+    ShardedTopKIndexBlock,
+    TopKIndexBlock,
+)
 from merlin.models.tf.core.tabular import AsTabular, Filter, TabularBlock
 from merlin.models.tf.core.transformations import (
     AsDenseFeatures,
@@ -51,7 +58,11 @@ from merlin.models.tf.blocks.optimizer import (
     OptimizerBlocks,
     split_embeddings_on_size,
 )
-from merlin.models.tf.blocks.retrieval.base import DualEncoderBlock, ItemRetrievalScorer
+from merlin.models.tf.blocks.retrieval.base import (
+    DualEncoderBlock,
+    EmbeddingCache,
+    ItemRetrievalScorer,
+)
 from merlin.models.tf.blocks.retrieval.matrix_factorization import (
     MatrixFactorizationBlock,
     QueryItemIdsEmbeddingsBlock,
@@ -93,6 +104,10 @@ from merlin.models.tf.inputs.embedding import (
     Embeddings,
     EmbeddingTable,
     FeatureConfig,
+    HashedEmbedding,
+    Int8Embedding,
+    MixedDimensionEmbedding,
+    QREmbedding,
     SequenceEmbeddingFeatures,
     TableConfig,
 )
@@ -149,6 +164,7 @@ __all__ = [
     "SequentialBlock",
     "ResidualBlock",
     "DualEncoderBlock",
+    "EmbeddingCache",
     "CrossBlock",
     "DLRMBlock",
     "MLPBlock",
@@ -157,6 +173,10 @@ __all__ = [
     "MMOEBlock",
     "CGCBlock",
     "TopKIndexBlock",
+    "IVFFlatIndexBlock",
+    "MemmapTopKIndexBlock",
+    "QuantizedIndexBlock",
+    "ShardedTopKIndexBlock",
     "IndexBlock",
     "DenseResidualBlock",
     "TabularBlock",
@@ -165,6 +185,10 @@ __all__ = [
     "SequenceEmbeddingFeatures",
     "EmbeddingOptions",
     "EmbeddingTable",
+    "HashedEmbedding",
+    "QREmbedding",
+    "MixedDimensionEmbedding",
+    "Int8Embedding",
     "AverageEmbeddingsByWeightFeature",
     "Embeddings",
     "FeatureConfig",
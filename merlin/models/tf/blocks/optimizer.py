@@ -15,12 +15,15 @@
 #
 
 import collections
+import functools
 import warnings
 from dataclasses import dataclass
 from typing import Callable, List, Optional, Sequence, Tuple, Union
 
 import numpy as np
 import tensorflow as tf
+from keras import backend
+from keras.optimizers.optimizer_v2 import optimizer_v2
 
 import merlin.models.tf as ml
 from merlin.models.tf.core.base import Block
@@ -311,6 +314,10 @@ class LazyAdam(tf.keras.optimizers.Adam):
     training throughput for some applications. However, it provides slightly different semantics
     than the original Adam algorithm, and may lead to different empirical results.
 
+    The moments of reduced-precision (float16 and bfloat16) variables, e.g. embedding tables
+    stored in reduced precision, are kept in float32 slots and their updates are computed in
+    float32, as the squared gradients would underflow in float16.
+
     Note, amsgrad is currently not supported and the argument can only be False.
 
     This implementation was adapted from the original Tensforflow  Addons implementation of
@@ -370,16 +377,74 @@ class LazyAdam(tf.keras.optimizers.Adam):
             **kwargs,
         )
 
-    def _resource_apply_sparse(self, grad, var, indices):
-        var_dtype = var.dtype.base_dtype
-        lr_t = self._decayed_lr(var_dtype)
-        beta_1_t = self._get_hyper("beta_1", var_dtype)
-        beta_2_t = self._get_hyper("beta_2", var_dtype)
-        local_step = tf.cast(self.iterations + 1, var_dtype)
+    def _create_slots(self, var_list):
+        super()._create_slots([var for var in var_list if not _is_reduced_precision(var)])
+        for var in var_list:
+            if _is_reduced_precision(var):
+                self._add_float32_slot(var, "m")
+                self._add_float32_slot(var, "v")
+
+    def _add_float32_slot(self, var, slot_name):
+        """`add_slot`, but the slot is float32 whatever the dtype of `var`."""
+        if slot_name not in self._slot_names:
+            self._slot_names.append(slot_name)
+        slot_dict = self._slots.setdefault(optimizer_v2._var_key(var), {})
+        weight = slot_dict.get(slot_name, None)
+        if weight is None:
+            initial_value = functools.partial(
+                tf.keras.initializers.Zeros(), shape=var.shape, dtype=tf.float32
+            )
+            with self._distribution_strategy_scope():
+                strategy = tf.distribute.get_strategy()
+                with strategy.extended.colocate_vars_with(var):
+                    weight = tf.Variable(
+                        name=f"{var._shared_name}/{slot_name}",
+                        dtype=tf.float32,
+                        trainable=False,
+                        initial_value=initial_value,
+                    )
+            backend.track_variable(weight)
+            slot_dict[slot_name] = weight
+            self._restore_slot_variable(slot_name=slot_name, variable=var, slot_variable=weight)
+            self._weights.append(weight)
+        return weight
+
+    def _coefficients(self, dtype):
+        lr_t = self._decayed_lr(dtype)
+        beta_1_t = self._get_hyper("beta_1", dtype)
+        beta_2_t = self._get_hyper("beta_2", dtype)
+        local_step = tf.cast(self.iterations + 1, dtype)
         beta_1_power = tf.math.pow(beta_1_t, local_step)
         beta_2_power = tf.math.pow(beta_2_t, local_step)
-        epsilon_t = tf.convert_to_tensor(self.epsilon, var_dtype)
+        epsilon_t = tf.convert_to_tensor(self.epsilon, dtype)
         lr = lr_t * tf.math.sqrt(1 - beta_2_power) / (1 - beta_1_power)
+        return lr, beta_1_t, beta_2_t, epsilon_t
+
+    def _resource_apply_dense(self, grad, var, apply_state=None):
+        if not _is_reduced_precision(var):
+            return super()._resource_apply_dense(grad, var, apply_state=apply_state)
+
+        lr, beta_1_t, beta_2_t, epsilon_t = self._coefficients(tf.float32)
+        grad = tf.cast(grad, tf.float32)
+        m, v = self.get_slot(var, "m"), self.get_slot(var, "v")
+        m_t = beta_1_t * m + (1 - beta_1_t) * grad
+        v_t = beta_2_t * v + (1 - beta_2_t) * tf.math.square(grad)
+        var_t = lr * m_t / (tf.math.sqrt(v_t) + epsilon_t)
+
+        return tf.group(
+            *[
+                var.assign_sub(tf.cast(var_t, var.dtype), use_locking=self._use_locking),
+                m.assign(m_t, use_locking=self._use_locking),
+                v.assign(v_t, use_locking=self._use_locking),
+            ]
+        )
+
+    def _resource_apply_sparse(self, grad, var, indices):
+        var_dtype = var.dtype.base_dtype
+        # the slots of reduced-precision variables are float32 (see `_create_slots`)
+        compute_dtype = tf.float32 if _is_reduced_precision(var) else var_dtype
+        lr, beta_1_t, beta_2_t, epsilon_t = self._coefficients(compute_dtype)
+        grad = tf.cast(grad, compute_dtype)
 
         # \\(m := beta1 * m + (1 - beta1) * g_t\\)
         m = self.get_slot(var, "m")
@@ -393,7 +458,7 @@ class LazyAdam(tf.keras.optimizers.Adam):
 
         # \\(variable += -learning_rate * m_t / (epsilon_t + sqrt(v_t))\\)
         var_slice = lr * m_t_slice / (tf.math.sqrt(v_t_slice) + epsilon_t)
-        var_update_op = self._resource_scatter_sub(var, indices, var_slice)
+        var_update_op = self._resource_scatter_sub(var, indices, tf.cast(var_slice, var_dtype))
 
         return tf.group(*[var_update_op, m_update_op, v_update_op])
 
@@ -416,6 +481,10 @@ class LazyAdam(tf.keras.optimizers.Adam):
         return resource_scatter_op(**resource_update_kwargs)
 
 
+def _is_reduced_precision(var) -> bool:
+    return var.dtype.base_dtype in (tf.float16, tf.bfloat16)
+
+
 def split_embeddings_on_size(
     embeddings: ParallelBlock, threshold: int
 ) -> Tuple[List[Block], List[Block]]:
@@ -14,10 +14,12 @@
 # limitations under the License.
 #
 import logging
-from typing import Dict, Optional, Sequence, Union
+import threading
+from typing import Callable, Dict, Optional, Sequence, Union
 
 import tensorflow as tf
 from tensorflow.python.ops import embedding_ops
+from tensorflow.python.saved_model import save_context
 
 from merlin.models.tf.blocks.sampling.base import ItemSampler
 from merlin.models.tf.core.base import Block, BlockType, EmbeddingWithMetadata, PredictionOutput
@@ -39,9 +41,137 @@ LOG = logging.getLogger("merlin_models")
 
 @tf.keras.utils.register_keras_serializable(package="merlin_models")
 class TowerBlock(ModelBlock):
-    """TowerBlock to wrap item or query tower"""
+    """TowerBlock to wrap item or query tower
 
-    pass
+    Outside of training, the embeddings can be cached by id, see `EmbeddingCache`.
+    """
+
+    embedding_cache: Optional["EmbeddingCache"] = None
+
+    def call(self, inputs, **kwargs):
+        cache = self.embedding_cache
+        training = kwargs.get("training")
+        features = kwargs.get("features", inputs)
+        if (
+            cache is None
+            or not (training is None or training is False)
+            or not isinstance(features, dict)
+            or cache.id_column not in features
+            or save_context.in_save_context()
+        ):
+            return super().call(inputs, **kwargs)
+
+        return cache(
+            features[cache.id_column], lambda: super(TowerBlock, self).call(inputs, **kwargs)
+        )
+
+
+class EmbeddingCache:
+    """Cache of the embeddings computed by a tower, by id.
+
+    The cached embeddings are dropped as soon as the version of the weights,
+    returned by `version_fn`, changes (or with `clear`). A batch is only
+    served from the cache when all its ids are cached, otherwise the tower
+    is called and the embeddings of the new ids are added to the cache.
+
+    Parameters
+    ----------
+    id_column : str
+        Name of the feature holding the ids, e.g. the user ids.
+    version_fn : Callable[[], tf.Tensor], optional
+        Returns the version of the weights of the tower,
+        e.g. the number of iterations of the optimizer
+    """
+
+    def __init__(self, id_column: str, version_fn: Optional[Callable[[], tf.Tensor]] = None):
+        self.id_column = id_column
+        self.version_fn = version_fn
+        self._rows = tf.lookup.experimental.MutableHashTable(
+            key_dtype=tf.int64, value_dtype=tf.int64, default_value=-1
+        )
+        self._values = tf.Variable(
+            tf.zeros((0, 0)),
+            trainable=False,
+            validate_shape=False,
+            shape=tf.TensorShape([None, None]),
+        )
+        self._size = tf.Variable(0, dtype=tf.int64, trainable=False)
+        self._version = tf.Variable(-1, dtype=tf.int64, trainable=False)
+        self._dim = None
+        self._dtype = tf.float32
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return int(self._size.numpy())
+
+    def clear(self):
+        """Drops all the cached embeddings."""
+        keys, _ = self._rows.export()
+        return tf.group(self._rows.remove(keys), self._size.assign(0))
+
+    def __call__(self, ids: tf.Tensor, compute_fn: Callable[[], tf.Tensor]) -> tf.Tensor:
+        """Embeddings of `ids`, computed with `compute_fn` unless they are all cached."""
+        with self._lock:
+            ids = tf.reshape(tf.cast(ids, tf.int64), [-1])
+            with tf.control_dependencies([self._check_version()]):
+                rows = self._rows.lookup(ids)
+
+            # the tower is traced first, to know the shape of the cached embeddings
+            return tf.cond(
+                tf.reduce_any(rows < 0),
+                lambda: self._compute_and_insert(ids, rows, compute_fn),
+                lambda: self._gather(rows),
+            )
+
+    def _check_version(self):
+        version = tf.constant(0, dtype=tf.int64)
+        if self.version_fn is not None:
+            version = tf.cast(self.version_fn(), tf.int64)
+
+        def reset():
+            with tf.control_dependencies([self.clear(), self._version.assign(version)]):
+                return tf.constant(True)
+
+        return tf.cond(tf.equal(self._version, version), lambda: tf.constant(False), reset)
+
+    def _gather(self, rows: tf.Tensor) -> tf.Tensor:
+        values = tf.gather(self._values, rows)
+        if self._dim is not None:
+            values = tf.reshape(values, [-1, self._dim])
+        return tf.cast(values, self._dtype)
+
+    def _compute_and_insert(self, ids: tf.Tensor, rows: tf.Tensor, compute_fn) -> tf.Tensor:
+        embeddings = compute_fn()
+        self._dim, self._dtype = embeddings.shape[-1], embeddings.dtype
+
+        missing = tf.squeeze(tf.where(rows < 0), -1)
+        new_ids, first = tf.unique(tf.gather(ids, missing))
+        positions = tf.math.unsorted_segment_min(missing, first, tf.size(new_ids))
+        new_values = tf.cast(tf.gather(embeddings, positions), tf.float32)
+        with tf.control_dependencies([self._insert(new_ids, new_values)]):
+            return tf.identity(embeddings)
+
+    def _insert(self, ids: tf.Tensor, values: tf.Tensor):
+        size = self._size.read_value()
+        num_new = tf.shape(ids, out_type=tf.int64)[0]
+        capacity = tf.shape(self._values, out_type=tf.int64)[0]
+
+        def grow():
+            # the capacity is doubled, so that inserting n embeddings copies O(n) rows
+            new_capacity = tf.maximum(2 * capacity, size + num_new)
+            kept = tf.reshape(self._values[:size], [-1, self._dim])
+            padding = tf.zeros(tf.stack([new_capacity - size, self._dim]))
+            with tf.control_dependencies([self._values.assign(tf.concat([kept, padding], 0))]):
+                return tf.constant(True)
+
+        grown = tf.cond(size + num_new > capacity, grow, lambda: tf.constant(False))
+        with tf.control_dependencies([grown]):
+            rows = size + tf.range(num_new, dtype=tf.int64)
+            return tf.group(
+                self._values.scatter_nd_update(tf.expand_dims(rows, -1), values),
+                self._rows.insert(ids, rows),
+                self._size.assign_add(num_new),
+            )
 
 
 class RetrievalMixin:
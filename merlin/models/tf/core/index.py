@@ -13,7 +13,11 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
-from typing import Optional, Union
+import collections
+import contextlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, NamedTuple, Optional, Union
 
 import numpy as np
 import tensorflow as tf
@@ -23,15 +27,41 @@ import merlin.io
 from merlin.core.dispatch import DataFrameType
 from merlin.models.tf.core.base import Block, PredictionOutput
 from merlin.models.tf.utils import tf_utils
-from merlin.models.tf.utils.batch_utils import TFModelEncode
+from merlin.models.tf.utils.batch_utils import data_iterator_func
 from merlin.models.utils.constants import MIN_FLOAT
+from merlin.models.utils.index_file import read_index, write_index
 from merlin.schema import Tags
 
 
 @tf.keras.utils.register_keras_serializable(package="merlin_models")
 class IndexBlock(Block):
-    def __init__(self, values: tf.Tensor, ids: Optional[tf.Tensor] = None, **kwargs):
+    """Index of the pre-computed embeddings of candidates.
+
+    Candidates can be replaced all at once with `update`, or incrementally with
+    `upsert` and `delete`. Deleted candidates are tombstoned (and never retrieved)
+    until the index is compacted, which happens once they make up more than
+    `compaction_threshold` of the rows.
+
+    Parameters:
+    -----------
+        values: tf.Tensor
+            The pre-computed embedddings of candidates.
+        ids: tf.Tensor
+            The candidates ids.
+        compaction_threshold: float
+            Fraction of deleted rows above which the index is compacted.
+            Defaults to 0.25
+    """
+
+    def __init__(
+        self,
+        values: tf.Tensor,
+        ids: Optional[tf.Tensor] = None,
+        compaction_threshold: float = 0.25,
+        **kwargs,
+    ):
         super(IndexBlock, self).__init__(**kwargs)
+        self.compaction_threshold = compaction_threshold
         self.values = tf.Variable(
             values,
             name="values",
@@ -53,6 +83,15 @@ class IndexBlock(Block):
             validate_shape=False,
             shape=tf.TensorShape([None]),
         )
+        self.tombstones = tf.Variable(
+            tf.zeros(tf.shape(self.ids), dtype=tf.bool),
+            name="tombstones",
+            trainable=False,
+            validate_shape=False,
+            shape=tf.TensorShape([None]),
+        )
+        # id -> row hash table, built on the first `upsert` or `delete`
+        self._row_index = None
 
     @classmethod
     def from_dataset(
@@ -61,6 +100,13 @@ class IndexBlock(Block):
         ids, values = cls.extract_ids_embeddings(data, check_unique_ids)
         return cls(values=values, ids=ids, **kwargs)
 
+    @classmethod
+    def from_file(cls, path: str, **kwargs) -> "IndexBlock":
+        """Loads an index saved with `save`. The embeddings are copied to memory,
+        see `MemmapTopKIndexBlock` to score them from the file instead."""
+        ids, values = read_index(path)
+        return cls(values=np.asarray(values), ids=np.asarray(ids), **kwargs)
+
     @classmethod
     def from_block(
         cls, block: Block, data: merlin.io.Dataset, id_column: Optional[str] = None, **kwargs
@@ -78,14 +124,20 @@ class IndexBlock(Block):
             Note, this will be inferred automatically if the block contains
             a schema with an item-id Tag.
         """
-        embedding_df = cls.get_candidates_dataset(block, data, id_column)
-        return cls.from_dataset(embedding_df, **kwargs)
+        ids, values = cls.encode_candidates(block, data, id_column)
+        cls._check_unique_id_array(ids)
+        return cls(values=values, ids=ids, **kwargs)
 
     @staticmethod
     def _check_unique_ids(data: DataFrameType):
         if data.index.to_series().nunique() != data.shape[0]:
             raise ValueError("Please make sure that `data` contains unique indices")
 
+    @staticmethod
+    def _check_unique_id_array(ids: np.ndarray):
+        if len(np.unique(ids)) != len(ids):
+            raise ValueError("Please make sure that `data` contains unique indices")
+
     @classmethod
     def extract_ids_embeddings(cls, data: merlin.io.Dataset, check_unique_ids: bool = True):
         if hasattr(data, "to_ddf"):
@@ -102,22 +154,111 @@ class IndexBlock(Block):
 
     @classmethod
     def get_candidates_dataset(
-        cls, block: Block, data: merlin.io.Dataset, id_column: Optional[str] = None
+        cls,
+        block: Block,
+        data: merlin.io.Dataset,
+        id_column: Optional[str] = None,
+        batch_size: int = 512,
+        num_workers: Optional[int] = None,
     ):
-        if not id_column and getattr(block, "schema", None):
-            tagged = block.schema.select_by_tag(Tags.ITEM_ID)
-            if tagged.column_schemas:
-                id_column = tagged.first.name
-
-        model_encode = TFModelEncode(model=block, output_concat_func=np.concatenate)
+        """Encodes the candidates of `data` with `block`, see `encode_candidates`.
 
-        data = data.to_ddf()
-        embedding_ddf = data.map_partitions(model_encode, filter_input_columns=[id_column])
-        embedding_df = embedding_ddf.compute(scheduler="synchronous")
+        Returns a dataframe of the embeddings (one column per dimension), indexed by id.
+        """
+        id_column = cls._infer_id_column(block, id_column)
+        ids, values = cls.encode_candidates(block, data, id_column, batch_size, num_workers)
 
+        frame_type = type(data.to_ddf()._meta)
+        embedding_df = frame_type(values, columns=[str(i) for i in range(values.shape[1])])
+        embedding_df[id_column] = ids
         embedding_df.set_index(id_column, inplace=True)
         return embedding_df
 
+    @classmethod
+    def encode_candidates(
+        cls,
+        block: Block,
+        data: merlin.io.Dataset,
+        id_column: Optional[str] = None,
+        batch_size: int = 512,
+        num_workers: Optional[int] = None,
+    ):
+        """Encodes the candidates of `data` with the live `block`, without saving it.
+
+        The partitions of `data` are read and batched by `num_workers` threads ahead
+        of the encoding, while `block` is only called from the calling thread, as
+        Blocks aren't thread-safe. The embeddings are written straight into a
+        pre-allocated buffer at the offset of their partition, so the rows keep the
+        order of `data`.
+
+        Parameters:
+        -----------
+            block: Block
+                The Block that returns embeddings from raw item features.
+            data: merlin.io.Dataset
+                Dataset containing raw item features.
+            id_column: Optional[str]
+                The candidates ids column name, inferred from the item-id Tag of
+                the block's schema by default.
+            batch_size: int
+                Number of candidates encoded per call of `block`. Defaults to 512
+            num_workers: Optional[int]
+                Number of partitions read ahead of the encoding.
+                Defaults to the number of CPUs
+
+        Returns:
+        --------
+            Tuple of the ids (1D) and embeddings (2D) NumPy arrays.
+        """
+        id_column = cls._infer_id_column(block, id_column)
+        ddf = data.to_ddf()
+        # Counting the rows only reads the id column
+        lengths = ddf[[id_column]].map_partitions(len).compute(scheduler="synchronous")
+        offsets = np.concatenate([[0], np.cumsum(np.asarray(lengths, dtype=np.int64))])
+        if offsets[-1] == 0:
+            raise ValueError("There are no candidates to encode in `data`.")
+
+        iterator = data_iterator_func(block.schema, batch_size=batch_size)
+
+        def load_partition(partition):
+            df = ddf.get_partition(partition).compute(scheduler="synchronous")
+            ids = df[id_column]
+            ids = ids.values_host if hasattr(ids, "values_host") else ids.values
+            return [batch[0] for batch in iterator(df)], ids
+
+        partitions = [i for i in range(ddf.npartitions) if offsets[i + 1] > offsets[i]]
+        num_workers = num_workers or os.cpu_count() or 1
+        all_ids, values = None, None
+        with ThreadPoolExecutor(max_workers=num_workers) as executor:
+            loading = collections.deque(
+                executor.submit(load_partition, partition) for partition in partitions[:num_workers]
+            )
+            for i, partition in enumerate(partitions):
+                batches, ids = loading.popleft().result()
+                if i + num_workers < len(partitions):
+                    loading.append(executor.submit(load_partition, partitions[i + num_workers]))
+
+                row = offsets[partition]
+                for inputs in batches:
+                    embeddings = block(inputs).numpy()
+                    if values is None:
+                        values = np.empty((offsets[-1], embeddings.shape[-1]), embeddings.dtype)
+                    values[row : row + len(embeddings)] = embeddings
+                    row += len(embeddings)
+                if all_ids is None:
+                    all_ids = np.empty((offsets[-1],), dtype=ids.dtype)
+                all_ids[offsets[partition] : offsets[partition] + len(ids)] = ids
+
+        return all_ids, values
+
+    @staticmethod
+    def _infer_id_column(block: Block, id_column: Optional[str] = None) -> Optional[str]:
+        if not id_column and getattr(block, "schema", None):
+            tagged = block.schema.select_by_tag(Tags.ITEM_ID)
+            if tagged.column_schemas:
+                id_column = tagged.first.name
+        return id_column
+
     def update_from_block(
         self,
         block: Block,
@@ -125,21 +266,137 @@ class IndexBlock(Block):
         id_column: Optional[str] = None,
         check_unique_ids: bool = True,
     ):
-        embedding_df = IndexBlock.get_candidates_dataset(block, data, id_column)
-        ids, embeddings = IndexBlock.extract_ids_embeddings(embedding_df, check_unique_ids)
+        ids, embeddings = IndexBlock.encode_candidates(block, data, id_column)
+        if check_unique_ids:
+            IndexBlock._check_unique_id_array(ids)
         self.update(embeddings, ids)
 
+    def upsert_from_block(
+        self, block: Block, data: merlin.io.Dataset, id_column: Optional[str] = None
+    ):
+        """Encodes the (new or changed) candidates of `data` with `block` and upserts them."""
+        ids, embeddings = IndexBlock.encode_candidates(block, data, id_column)
+        IndexBlock._check_unique_id_array(ids)
+        return self.upsert(ids, embeddings)
+
     def update(self, values: tf.Tensor, ids: Optional[tf.Tensor] = None):
         if len(tf.shape(values)) != 2:
             raise ValueError(f"The candidates embeddings tensor must be 2D (got {values.shape}).")
         _ids: tf.Tensor = ids if ids is not None else tf.range(values.shape[0])
         self.ids.assign(_ids)
         self.values.assign(values)
+        self.tombstones.assign(tf.zeros(tf.shape(self.ids), dtype=tf.bool))
+        self._row_index = None
+        return self
+
+    def upsert(self, ids: tf.Tensor, values: tf.Tensor):
+        """Replaces the embeddings of the candidates `ids` that are in the index
+        and appends the others.
+
+        Parameters:
+        -----------
+        ids: tf.Tensor
+            Unique ids of the candidates.
+        values: tf.Tensor
+            2D tensor of their embeddings.
+        """
+        ids = tf.convert_to_tensor(ids, dtype=self.ids.dtype)
+        values = tf.convert_to_tensor(values, dtype=tf.float32)
+        if len(values.shape) != 2 or values.shape[-1] != self.values.shape[-1]:
+            raise ValueError(
+                f"The candidates embeddings must be of shape (None, {self.values.shape[-1]}), "
+                f"got {values.shape}"
+            )
+        if tf.size(tf.unique(ids).y) != tf.size(ids):
+            raise ValueError("Please make sure that `ids` are unique")
+
+        row_index = self._get_row_index()
+        rows = row_index.lookup(ids)
+        found = rows >= 0
+        if tf.reduce_any(found):
+            self._overwrite_rows(
+                tf.boolean_mask(rows, found),
+                self._row_values(tf.boolean_mask(values, found), tf.boolean_mask(ids, found)),
+            )
+        new = tf.logical_not(found)
+        if tf.reduce_any(new):
+            num_rows = tf.cast(tf.shape(self.ids)[0], tf.int64)
+            new_ids = tf.boolean_mask(ids, new)
+            self._append_rows(self._row_values(tf.boolean_mask(values, new), new_ids))
+            row_index.insert(new_ids, num_rows + tf.range(tf.size(new_ids, out_type=tf.int64)))
+        self._rows_changed()
+        return self
+
+    def delete(self, ids: tf.Tensor):
+        """Tombstones the candidates `ids`, ignoring the ones that aren't in the index.
+        The index is compacted once the deleted rows exceed `compaction_threshold`."""
+        ids = tf.convert_to_tensor(ids, dtype=self.ids.dtype)
+        row_index = self._get_row_index()
+        rows = row_index.lookup(ids)
+        rows = tf.boolean_mask(rows, rows >= 0)
+        self.tombstones.scatter_nd_update(
+            tf.expand_dims(rows, -1), tf.ones(tf.shape(rows), dtype=tf.bool)
+        )
+        row_index.remove(ids)
+
+        num_rows = int(tf.shape(self.ids)[0])
+        num_deleted = int(tf.reduce_sum(tf.cast(self.tombstones, tf.int64)))
+        if num_rows and num_deleted / num_rows > self.compaction_threshold:
+            self.compact()
         return self
 
+    def compact(self):
+        """Drops the rows of the deleted candidates."""
+        rows = tf.squeeze(tf.where(tf.logical_not(self.tombstones)), -1)
+        for variable in self._row_variables():
+            variable.assign(tf.gather(variable, rows))
+        self._row_index = None
+        self._rows_changed()
+        return self
+
+    def _get_row_index(self):
+        if self._row_index is None:
+            self._row_index = tf.lookup.experimental.MutableHashTable(
+                key_dtype=self.ids.dtype, value_dtype=tf.int64, default_value=-1
+            )
+            live = tf.squeeze(tf.where(tf.logical_not(self.tombstones)), -1)
+            self._row_index.insert(tf.gather(self.ids, live), live)
+        return self._row_index
+
+    def _row_variables(self):
+        """The variables holding one entry per row, in the order of `_row_values`."""
+        return [self.values, self.ids, self.tombstones]
+
+    def _row_values(self, values: tf.Tensor, ids: tf.Tensor):
+        """The entries of `_row_variables` of candidates with embeddings `values`."""
+        return [values, ids, tf.zeros(tf.shape(ids), dtype=tf.bool)]
+
+    def _append_rows(self, row_values):
+        for variable, new in zip(self._row_variables(), row_values):
+            variable.assign(tf.concat([variable, new], axis=0))
+
+    def _overwrite_rows(self, rows: tf.Tensor, row_values):
+        indices = tf.expand_dims(rows, -1)
+        for variable, new in zip(self._row_variables(), row_values):
+            variable.scatter_nd_update(indices, new)
+
+    def _rows_changed(self):
+        """Called after rows were upserted or compacted."""
+
     def call(self, inputs: tf.Tensor, **kwargs) -> tf.Tensor:
         return self.values[inputs]
 
+    def save(self, path: str):
+        """Saves the candidates (without the deleted ones) to a binary file,
+        see `merlin.models.utils.index_file` for its format."""
+        if int(tf.shape(self.values)[0]) != int(tf.shape(self.ids)[0]):
+            raise ValueError(f"{type(self).__name__} doesn't hold the embeddings of its candidates")
+        ids, values = self.ids, self.values
+        if tf.reduce_any(self.tombstones):
+            live = tf.squeeze(tf.where(tf.logical_not(self.tombstones)), -1)
+            ids, values = tf.gather(ids, live), tf.gather(values, live)
+        write_index(path, ids.numpy(), values.numpy())
+
     def to_dataset(self, gpu=True) -> merlin.io.Dataset:
         if gpu:
             import cudf
@@ -169,10 +426,33 @@ class TopKIndexBlock(IndexBlock):
             The pre-computed embedddings of candidates.
         ids: tf.Tensor
             The candidates ids.
+        tile_size: Optional[int]
+            If set, the candidates are scored in tiles of `tile_size` rows,
+            merging the top-k of every tile into a running top-k, so that the
+            scores held in memory are bounded by `batch_size * tile_size`
+            instead of `batch_size * num_candidates`.
+            By default all the candidates are scored at once.
+        exclude_column: Optional[str]
+            Name of a (list) feature holding, for each query, the ids of the
+            candidates not to retrieve, e.g. the items a user already interacted
+            with. It is read from the `features` of the call, see `call`.
+
+    When fewer than `k` candidates can be retrieved, the missing results have a
+    score of `MIN_FLOAT`.
     """
 
-    def __init__(self, k, values: tf.Tensor, ids: Optional[tf.Tensor] = None, **kwargs):
+    def __init__(
+        self,
+        k,
+        values: tf.Tensor,
+        ids: Optional[tf.Tensor] = None,
+        tile_size: Optional[int] = None,
+        exclude_column: Optional[str] = None,
+        **kwargs,
+    ):
         self._k = k
+        self.tile_size = tile_size
+        self.exclude_column = exclude_column
         super(TopKIndexBlock, self).__init__(values, ids, **kwargs)
         self.false_negatives_score = MIN_FLOAT
 
@@ -207,10 +487,21 @@ class TopKIndexBlock(IndexBlock):
         """
         return super().from_block(block=block, data=data, id_column=id_column, k=k, **kwargs)
 
-    def call(self, inputs: tf.Tensor, k=None, **kwargs) -> Union[tf.Tensor, tf.Tensor]:
+    def call(
+        self,
+        inputs: tf.Tensor,
+        k=None,
+        exclude_ids: Optional[Union[tf.Tensor, tf.RaggedTensor]] = None,
+        item_mask: Optional[tf.Tensor] = None,
+        features=None,
+        **kwargs,
+    ) -> Union[tf.Tensor, tf.Tensor]:
         """
         Compute Top-k scores and related indices from query inputs
 
+        The excluded candidates are masked while they are scored, so `k` candidates
+        are retrieved among the others.
+
         Parameters:
         ----------
         inputs: tf.Tensor
@@ -218,18 +509,106 @@ class TopKIndexBlock(IndexBlock):
         k: int
             Number of top candidates to retrieve
             Defaults to constructor `_k` parameter.
+        exclude_ids: Optional[Union[tf.Tensor, tf.RaggedTensor]]
+            Ids of the candidates not to retrieve. Either a 1D tensor of ids excluded
+            for all the queries, or a 2D (ragged) tensor of the ids excluded for each
+            query. Ids that aren't in the index are ignored.
+            Defaults to the `exclude_column` feature, if any.
+        item_mask: Optional[tf.Tensor]
+            1D boolean tensor aligned with `ids`, the candidates that are False
+            are not retrieved.
+        features: Optional[Dict[str, tf.Tensor]]
+            The features of the queries, holding `exclude_column`.
         Returns
         -------
         top_scores, top_indices: tf.Tensor, tf.Tensor
             2D Tensors with the scores for the top-k candidates and related ids.
         """
         k = k if k is not None else self._k
-        scores = tf.matmul(inputs, self.values, transpose_b=True)
-        top_scores, top_indices = tf.math.top_k(scores, k=k)
+        if exclude_ids is None and self.exclude_column and isinstance(features, dict):
+            exclude_ids = features.get(self.exclude_column)
+        exclusions = self._exclusions(exclude_ids, item_mask)
+        top_scores, top_indices = self._top_k(inputs, k, exclusions)
         top_indices = tf.gather(self.ids, top_indices)
 
         return top_scores, top_indices
 
+    def _exclusions(self, exclude_ids=None, item_mask=None) -> "_Exclusions":
+        blocked = tf.convert_to_tensor(self.tombstones)
+        if item_mask is not None:
+            blocked = tf.logical_or(blocked, tf.logical_not(tf.cast(item_mask, tf.bool)))
+        if exclude_ids is None:
+            return _Exclusions(blocked)
+
+        if isinstance(exclude_ids, tuple):
+            exclude_ids = tf_utils.list_col_to_ragged(exclude_ids)
+        if not isinstance(exclude_ids, tf.RaggedTensor):
+            exclude_ids = tf.convert_to_tensor(exclude_ids)
+            if exclude_ids.shape.rank == 1:
+                # the same candidates are excluded for every query
+                excluded = _isin(self.ids, *_sorted_ids(tf.cast(exclude_ids, self.ids.dtype)))
+                return _Exclusions(tf.logical_or(blocked, excluded))
+            exclude_ids = tf.RaggedTensor.from_tensor(exclude_ids)
+        if exclude_ids.shape.rank == 3:
+            exclude_ids = exclude_ids.merge_dims(1, 2)
+        sorted_ids, lengths = _sorted_ids(tf.cast(exclude_ids, self.ids.dtype))
+        return _Exclusions(blocked, sorted_ids, lengths)
+
+    def _mask_excluded(
+        self, scores: tf.Tensor, rows: tf.Tensor, exclusions: "_Exclusions"
+    ) -> tf.Tensor:
+        """Gives the lowest score to the excluded candidates, `rows` are the rows of
+        the scored candidates, either for all the queries (1D) or for each (2D)."""
+        excluded = tf.gather(exclusions.blocked, rows)
+        if exclusions.ids is not None:
+            ids = tf.gather(self.ids, rows)
+            if ids.shape.rank == 1:
+                ids = tf.broadcast_to(ids, tf.shape(scores))
+            excluded = tf.logical_or(excluded, _isin(ids, exclusions.ids, exclusions.lengths))
+        return self._mask_deleted(scores, excluded)
+
+    def _top_k(self, inputs: tf.Tensor, k, exclusions: "_Exclusions"):
+        """Top-k scores and row indices of the candidates, overridden by other search methods."""
+        if self.tile_size:
+            return self._tiled_top_k(inputs, k, self.tile_size, exclusions)
+        scores = tf.matmul(inputs, self.values, transpose_b=True)
+        scores = self._mask_excluded(scores, tf.range(tf.shape(scores)[1]), exclusions)
+        return tf.math.top_k(scores, k=k)
+
+    def _tiled_top_k(self, inputs: tf.Tensor, k, tile_size: int, exclusions: "_Exclusions"):
+        """Top-k scores and row indices of the candidates, scoring `tile_size` candidates
+        at a time. Ties are broken in favor of the first rows, as with `tf.math.top_k`."""
+        num_candidates = self._num_candidates()
+        tf.debugging.assert_greater_equal(
+            num_candidates, k, message="`k` is larger than the number of candidates"
+        )
+        queries = self._prepare_queries(inputs)
+
+        def score_tile(start):
+            scores = self._score_tile(queries, start, tile_size)
+            rows = tf.range(start, start + tf.shape(scores)[1])
+            return self._mask_excluded(scores, rows, exclusions)
+
+        return tf_utils.tiled_top_k(
+            score_tile, num_candidates, tf.shape(inputs)[0], k, tile_size, dtype=inputs.dtype
+        )
+
+    def _mask_deleted(self, scores: tf.Tensor, deleted: tf.Tensor) -> tf.Tensor:
+        """Gives the lowest score to the deleted candidates, `deleted` is aligned
+        with the last dimension of `scores`."""
+        return tf.where(deleted, tf.cast(MIN_FLOAT, scores.dtype), scores)
+
+    def _num_candidates(self):
+        return tf.shape(self.values)[0]
+
+    def _prepare_queries(self, inputs: tf.Tensor):
+        """What `_score_tile` scores the candidates against, computed once per call."""
+        return inputs
+
+    def _score_tile(self, queries, start, tile_size: int) -> tf.Tensor:
+        """Scores of the candidates `start` to `start + tile_size`."""
+        return tf.matmul(queries, self.values[start : start + tile_size], transpose_b=True)
+
     def call_outputs(
         self, outputs: PredictionOutput, training=False, **kwargs
     ) -> "PredictionOutput":
@@ -268,3 +647,608 @@ class TopKIndexBlock(IndexBlock):
     def compute_output_shape(self, input_shape):
         batch_size = input_shape[0]
         return tf.TensorShape((batch_size, self._k)), tf.TensorShape((batch_size, self._k))
+
+
+@tf.keras.utils.register_keras_serializable(package="merlin_models")
+class IVFFlatIndexBlock(TopKIndexBlock):
+    """Approximate top-k index, with an inverted file of the candidates (IVF-flat).
+
+    The candidates are clustered with k-means into `num_lists` lists. A query
+    is only scored exactly against the candidates of the `num_probes` lists whose
+    centroids have the highest scores. `num_probes` trades recall for latency
+    and can be changed after the index was built, probing all the lists
+    gives the same results as `TopKIndexBlock`.
+
+    Parameters:
+    -----------
+        k: int
+            Number of top candidates to retrieve.
+        values: tf.Tensor
+            The pre-computed embedddings of candidates.
+        ids: tf.Tensor
+            The candidates ids.
+        num_lists: int
+            Number of k-means clusters, capped by the number of candidates.
+            Defaults to 100
+        num_probes: int
+            Number of lists scored for each query.
+            Defaults to 8
+        kmeans_iterations: int
+            Number of iterations of k-means.
+            Defaults to 10
+        kmeans_sample_size: Optional[int]
+            Number of candidates the centroids are trained on,
+            defaults to `256 * num_lists`
+        seed: Optional[int]
+            Seed of the sampling of the candidates k-means is trained on.
+
+    When the probed lists hold fewer than `k` candidates, the missing results
+    have a score of `MIN_FLOAT`.
+    """
+
+    def __init__(
+        self,
+        k,
+        values: tf.Tensor,
+        ids: Optional[tf.Tensor] = None,
+        num_lists: int = 100,
+        num_probes: int = 8,
+        kmeans_iterations: int = 10,
+        kmeans_sample_size: Optional[int] = None,
+        seed: Optional[int] = None,
+        **kwargs,
+    ):
+        self.num_lists = num_lists
+        self.num_probes = num_probes
+        self.kmeans_iterations = kmeans_iterations
+        self.kmeans_sample_size = kmeans_sample_size
+        self.seed = seed
+        super(IVFFlatIndexBlock, self).__init__(k, values, ids, **kwargs)
+        self.centroids = tf.Variable(
+            tf.zeros((0, self.values.shape[-1])),
+            name="centroids",
+            trainable=False,
+            dtype=tf.float32,
+            validate_shape=False,
+            shape=tf.TensorShape([None, self.values.shape[-1]]),
+        )
+        # the rows of the candidates sorted by list, and the start of each list
+        self.list_rows = tf.Variable(
+            tf.zeros((0,), dtype=tf.int32),
+            name="list_rows",
+            trainable=False,
+            validate_shape=False,
+            shape=tf.TensorShape([None]),
+        )
+        self.list_offsets = tf.Variable(
+            tf.zeros((1,), dtype=tf.int32),
+            name="list_offsets",
+            trainable=False,
+            validate_shape=False,
+            shape=tf.TensorShape([None]),
+        )
+        # the list of every row
+        self.assignments = tf.Variable(
+            tf.zeros((0,), dtype=tf.int32),
+            name="assignments",
+            trainable=False,
+            validate_shape=False,
+            shape=tf.TensorShape([None]),
+        )
+        self.build_lists()
+
+    def update(self, values: tf.Tensor, ids: Optional[tf.Tensor] = None):
+        super().update(values, ids)
+        self.build_lists()
+        return self
+
+    def build_lists(self):
+        """Clusters the candidates and (re)builds the inverted lists."""
+        values = tf.convert_to_tensor(self.values)
+        num_rows = int(values.shape[0])
+        if num_rows == 0:
+            self.centroids.assign(tf.zeros((0, values.shape[-1])))
+            self.assignments.assign(tf.zeros((0,), dtype=tf.int32))
+            self._sort_lists()
+            return
+        num_lists = max(min(self.num_lists, num_rows), 1)
+        centroids = _kmeans(
+            values,
+            num_lists,
+            self.kmeans_iterations,
+            self.kmeans_sample_size or 256 * num_lists,
+            np.random.default_rng(self.seed),
+        )
+
+        self.centroids.assign(centroids)
+        self.assignments.assign(_nearest_centroids(values, centroids))
+        self._sort_lists()
+
+    def _sort_lists(self):
+        num_lists = tf.shape(self.centroids)[0]
+        counts = tf.math.bincount(
+            self.assignments, minlength=num_lists, maxlength=num_lists, dtype=tf.int32
+        )
+        self.list_rows.assign(tf.argsort(self.assignments, stable=True))
+        self.list_offsets.assign(tf.concat([[0], tf.cumsum(counts)], axis=0))
+
+    def _row_variables(self):
+        return super()._row_variables() + [self.assignments]
+
+    def _row_values(self, values: tf.Tensor, ids: tf.Tensor):
+        # new candidates join the list of their closest centroid, see `build_lists` to re-cluster
+        return super()._row_values(values, ids) + [_nearest_centroids(values, self.centroids)]
+
+    def _rows_changed(self):
+        if int(tf.shape(self.centroids)[0]) == 0:
+            self.build_lists()
+        else:
+            self._sort_lists()
+
+    def _top_k(self, inputs: tf.Tensor, k, exclusions: "_Exclusions"):
+        num_probes = tf.minimum(self.num_probes, tf.shape(self.centroids)[0])
+        centroid_scores = tf.matmul(inputs, self.centroids, transpose_b=True)
+        _, lists = tf.math.top_k(centroid_scores, k=num_probes)
+
+        # positions in `list_rows` of the candidates of the probed lists, per query
+        starts = tf.reshape(tf.gather(self.list_offsets, lists), [-1])
+        limits = tf.reshape(tf.gather(self.list_offsets, lists + 1), [-1])
+        positions = tf.RaggedTensor.from_uniform_row_length(
+            tf.ragged.range(starts, limits), num_probes
+        ).merge_dims(1, 2)
+
+        rows = tf.gather(self.list_rows, positions.flat_values)
+        queries = tf.gather(inputs, positions.value_rowids())
+        scores = tf.reduce_sum(queries * tf.gather(self.values, rows), axis=-1)
+
+        scores = positions.with_flat_values(scores).to_tensor(default_value=MIN_FLOAT)
+        rows = positions.with_flat_values(rows).to_tensor(default_value=0)
+        scores = self._mask_excluded(scores, rows, exclusions)
+        padding = [[0, 0], [0, tf.maximum(k - tf.shape(scores)[1], 0)]]
+        scores = tf.pad(scores, padding, constant_values=MIN_FLOAT)
+        rows = tf.pad(rows, padding)
+
+        top_scores, top_positions = tf.math.top_k(scores, k=k)
+        return top_scores, tf.gather(rows, top_positions, batch_dims=1)
+
+
+@tf.keras.utils.register_keras_serializable(package="merlin_models")
+class QuantizedIndexBlock(TopKIndexBlock):
+    """Top-k index storing quantized codes of the candidates' embeddings.
+
+    The scores of the queries are computed directly from the codes
+    (asymmetric distance computation: the queries aren't quantized),
+    `tile_size` candidates at a time, so the float32 embeddings are never
+    materialized. Two quantizations are supported:
+
+    - `"int8"`: every dimension is scaled to [-127, 127] and stored as int8
+      (4x smaller than float32).
+    - `"pq"`: product quantization, the embeddings are split in `num_subspaces`
+      sub-vectors, each stored as the uint8 index of its closest k-means centroid
+      among 256 (`4 * dim / num_subspaces` times smaller than float32).
+
+    The approximate scores can be refined by an exact re-rank of the top
+    `rerank_size` candidates, which requires keeping the float32 embeddings
+    in `values`. Otherwise `values` is left empty.
+
+    Parameters:
+    -----------
+        k: int
+            Number of top candidates to retrieve.
+        values: tf.Tensor
+            The pre-computed embedddings of candidates.
+        ids: tf.Tensor
+            The candidates ids.
+        quantization: str
+            `"int8"` or `"pq"`.
+            Defaults to `"int8"`
+        num_subspaces: int
+            Number of sub-vectors of product quantization,
+            must divide the dimension of the embeddings.
+            Defaults to 8
+        rerank_size: Optional[int]
+            Number of candidates re-ranked with their exact scores,
+            by default the approximate top-k is returned as is.
+        tile_size: int
+            Number of candidates scored at a time.
+            Defaults to 65536
+        kmeans_iterations: int
+            Number of iterations of the k-means of product quantization.
+            Defaults to 10
+        kmeans_sample_size: Optional[int]
+            Number of candidates the codebooks are trained on, defaults to 65536
+        seed: Optional[int]
+            Seed of the k-means of product quantization.
+    """
+
+    def __init__(
+        self,
+        k,
+        values: tf.Tensor,
+        ids: Optional[tf.Tensor] = None,
+        quantization: str = "int8",
+        num_subspaces: int = 8,
+        rerank_size: Optional[int] = None,
+        tile_size: int = 65536,
+        kmeans_iterations: int = 10,
+        kmeans_sample_size: Optional[int] = None,
+        seed: Optional[int] = None,
+        **kwargs,
+    ):
+        if quantization not in ("int8", "pq"):
+            raise ValueError(f"`quantization` must be 'int8' or 'pq', got {quantization}")
+        values = tf.convert_to_tensor(values, dtype=tf.float32)
+        dim = values.shape[-1]
+        if quantization == "pq" and dim % num_subspaces != 0:
+            raise ValueError(
+                f"The dimension of the embeddings ({dim}) must be a multiple "
+                f"of `num_subspaces` ({num_subspaces})"
+            )
+        self.quantization = quantization
+        self.num_subspaces = num_subspaces
+        self.rerank_size = rerank_size
+        self.kmeans_iterations = kmeans_iterations
+        self.kmeans_sample_size = kmeans_sample_size
+        self.seed = seed
+        if ids is None:
+            ids = tf.range(tf.shape(values)[0], dtype=tf.int64)
+        super(QuantizedIndexBlock, self).__init__(
+            k, self._kept_values(values), ids, tile_size=tile_size, **kwargs
+        )
+
+        if quantization == "int8":
+            code_shape, code_dtype = [None, dim], tf.int8
+            self.scales = tf.Variable(
+                tf.ones((dim,)), name="scales", trainable=False, dtype=tf.float32
+            )
+        else:
+            code_shape, code_dtype = [None, num_subspaces], tf.uint8
+            self.codebooks = tf.Variable(
+                tf.zeros((num_subspaces, 0, dim // num_subspaces)),
+                name="codebooks",
+                trainable=False,
+                dtype=tf.float32,
+                validate_shape=False,
+                shape=tf.TensorShape([num_subspaces, None, dim // num_subspaces]),
+            )
+        self.codes = tf.Variable(
+            tf.zeros([0, code_shape[1]], dtype=code_dtype),
+            name="codes",
+            trainable=False,
+            dtype=code_dtype,
+            validate_shape=False,
+            shape=tf.TensorShape(code_shape),
+        )
+        self.quantize(values)
+
+    def update(self, values: tf.Tensor, ids: Optional[tf.Tensor] = None):
+        values = tf.convert_to_tensor(values, dtype=tf.float32)
+        if len(tf.shape(values)) != 2:
+            raise ValueError(f"The candidates embeddings tensor must be 2D (got {values.shape}).")
+        if ids is None:
+            ids = tf.range(tf.shape(values)[0], dtype=self.ids.dtype)
+        super().update(self._kept_values(values), ids)
+        self.quantize(values)
+        return self
+
+    def _kept_values(self, values: tf.Tensor) -> tf.Tensor:
+        return values if self.rerank_size else values[:0]
+
+    def quantize(self, values: tf.Tensor):
+        """(Re)computes the scales or the codebooks from `values`, and their codes.
+        Candidates added with `upsert` are encoded with the current scales or codebooks."""
+        if self.quantization == "int8":
+            scales = tf.reduce_max(tf.abs(values), axis=0) / 127.0
+            self.scales.assign(tf.where(scales > 0, scales, tf.ones_like(scales)))
+        else:
+            num_rows = int(values.shape[0])
+            num_clusters = min(256, num_rows)
+            rng = np.random.default_rng(self.seed)
+            codebooks = [
+                (
+                    _kmeans(
+                        subspace,
+                        num_clusters,
+                        self.kmeans_iterations,
+                        self.kmeans_sample_size or 65536,
+                        rng,
+                    )
+                    if num_rows
+                    else subspace
+                )
+                for subspace in tf.split(values, self.num_subspaces, axis=1)
+            ]
+            self.codebooks.assign(tf.stack(codebooks))
+        self.codes.assign(self._encode(values))
+
+    def _encode(self, values: tf.Tensor) -> tf.Tensor:
+        if self.quantization == "int8":
+            codes = tf.clip_by_value(tf.round(values / self.scales), -127.0, 127.0)
+            return tf.cast(codes, tf.int8)
+
+        if values.shape[0] and int(tf.shape(self.codebooks)[1]) == 0:
+            raise ValueError("The codebooks of an empty index can't encode candidates")
+        subspaces = tf.split(values, self.num_subspaces, axis=1)
+        codes = [
+            tf.cast(_nearest_centroids(subspace, codebook), tf.uint8)
+            for subspace, codebook in zip(subspaces, tf.unstack(self.codebooks))
+        ]
+        return tf.stack(codes, axis=1)
+
+    def _row_variables(self):
+        variables = [self.ids, self.tombstones, self.codes]
+        return variables + [self.values] if self.rerank_size else variables
+
+    def _row_values(self, values: tf.Tensor, ids: tf.Tensor):
+        row_values = [ids, tf.zeros(tf.shape(ids), dtype=tf.bool), self._encode(values)]
+        return row_values + [values] if self.rerank_size else row_values
+
+    def _top_k(self, inputs: tf.Tensor, k, exclusions: "_Exclusions"):
+        if not self.rerank_size:
+            return self._tiled_top_k(inputs, k, self.tile_size, exclusions)
+
+        shortlist = tf.minimum(tf.maximum(self.rerank_size, k), self._num_candidates())
+        _, rows = self._tiled_top_k(inputs, shortlist, self.tile_size, exclusions)
+        scores = tf.einsum("bd,bsd->bs", inputs, tf.gather(self.values, rows))
+        scores = self._mask_excluded(scores, rows, exclusions)
+        top_scores, positions = tf.math.top_k(scores, k=k)
+        return top_scores, tf.gather(rows, positions, batch_dims=1)
+
+    def _num_candidates(self):
+        return tf.shape(self.codes)[0]
+
+    def _prepare_queries(self, inputs: tf.Tensor):
+        if self.quantization == "int8":
+            # q . (codes * scales) == (q * scales) . codes
+            return inputs * self.scales
+
+        # look-up table of the scores of every sub-vector of the queries with every centroid
+        sub_queries = tf.reshape(inputs, [tf.shape(inputs)[0], self.num_subspaces, -1])
+        table = tf.einsum("bmd,mcd->bmc", sub_queries, self.codebooks)
+        return tf.reshape(table, [tf.shape(inputs)[0], -1])
+
+    def _score_tile(self, queries, start, tile_size: int) -> tf.Tensor:
+        codes = self.codes[start : start + tile_size]
+        if self.quantization == "int8":
+            return tf.matmul(queries, tf.cast(codes, queries.dtype), transpose_b=True)
+
+        num_clusters = tf.shape(self.codebooks)[1]
+        positions = tf.cast(codes, tf.int32) + tf.range(self.num_subspaces) * num_clusters
+        return tf.reduce_sum(tf.gather(queries, positions, axis=1), axis=-1)
+
+
+@tf.keras.utils.register_keras_serializable(package="merlin_models")
+class MemmapTopKIndexBlock(TopKIndexBlock):
+    """Top-k index scoring the candidates from a file written by `IndexBlock.save`.
+
+    The embeddings are memory-mapped, read-only, and scored `tile_size` rows at a
+    time: only the ids are loaded in memory, so the index is ready right away and
+    the pages of the file are shared by all the processes of a host that map it.
+    Candidates can be deleted (they are tombstoned), but not upserted.
+
+    Parameters:
+    -----------
+        k: int
+            Number of top candidates to retrieve.
+        path: str
+            Path of the index file.
+        tile_size: int
+            Number of candidates read and scored at a time.
+            Defaults to 65536
+    """
+
+    def __init__(self, k, path: str, tile_size: int = 65536, **kwargs):
+        ids, self._mapped_values = read_index(path)
+        self.path = path
+        # the file is never rewritten, see `compact`
+        kwargs.setdefault("compaction_threshold", 1.0)
+        super(MemmapTopKIndexBlock, self).__init__(
+            k,
+            np.zeros((0, self._mapped_values.shape[1]), dtype=np.float32),
+            np.asarray(ids),
+            tile_size=tile_size,
+            **kwargs,
+        )
+
+    def update(self, values: tf.Tensor, ids: Optional[tf.Tensor] = None):
+        raise NotImplementedError(
+            "MemmapTopKIndexBlock is read-only, save a new index file and load it instead"
+        )
+
+    def upsert(self, ids: tf.Tensor, values: tf.Tensor):
+        raise NotImplementedError(
+            "MemmapTopKIndexBlock is read-only, save a new index file and load it instead"
+        )
+
+    def compact(self):
+        raise NotImplementedError(
+            "MemmapTopKIndexBlock can't be compacted, save a new index file and load it instead"
+        )
+
+    def save(self, path: str):
+        live = tf.squeeze(tf.where(tf.logical_not(self.tombstones)), -1).numpy()
+        write_index(path, self.ids.numpy()[live], _RowsView(self._mapped_values, live))
+
+    def _top_k(self, inputs: tf.Tensor, k, exclusions: "_Exclusions"):
+        return self._tiled_top_k(inputs, k, self.tile_size, exclusions)
+
+    def _num_candidates(self):
+        return tf.shape(self.ids)[0]
+
+    def _score_tile(self, queries, start, tile_size: int) -> tf.Tensor:
+        tile = tf.numpy_function(self._read_tile, [start, tile_size], tf.float32, stateful=False)
+        tile.set_shape([None, self._mapped_values.shape[1]])
+        return tf.matmul(queries, tile, transpose_b=True)
+
+    def _read_tile(self, start, tile_size):
+        return np.asarray(self._mapped_values[start : start + tile_size])
+
+
+@tf.keras.utils.register_keras_serializable(package="merlin_models")
+class ShardedTopKIndexBlock(TopKIndexBlock):
+    """Exact top-k index scoring shards of the candidates concurrently.
+
+    The candidates are split into `num_shards` contiguous ranges of rows, the
+    top-k of every shard is computed on its own and the top-k of the shards are
+    merged. When called eagerly, the shards are scored by a pool of threads, in
+    a graph they are independent ops run by the inter-op thread pool. The results
+    are the same as `TopKIndexBlock`'s, ties included.
+
+    Parameters:
+    -----------
+        k: int
+            Number of top candidates to retrieve.
+        values: tf.Tensor
+            The pre-computed embedddings of candidates.
+        ids: tf.Tensor
+            The candidates ids.
+        num_shards: Optional[int]
+            Number of shards, defaults to the number of CPUs.
+        devices: Optional[List[str]]
+            Devices the shards are scored on, in a round-robin way,
+            e.g. `["/cpu:0", "/gpu:0"]`. By default they are placed by TensorFlow.
+    """
+
+    def __init__(
+        self,
+        k,
+        values: tf.Tensor,
+        ids: Optional[tf.Tensor] = None,
+        num_shards: Optional[int] = None,
+        devices: Optional[List[str]] = None,
+        **kwargs,
+    ):
+        self.num_shards = num_shards or os.cpu_count() or 1
+        self.devices = devices
+        self._executor = None
+        super(ShardedTopKIndexBlock, self).__init__(k, values, ids, **kwargs)
+
+    def _top_k(self, inputs: tf.Tensor, k, exclusions: "_Exclusions"):
+        num_rows = tf.shape(self.values)[0]
+        tf.debugging.assert_greater_equal(
+            num_rows, k, message="`k` is larger than the number of candidates"
+        )
+        bounds = self._shard_bounds(num_rows, self.num_shards)
+        shards = [
+            (bounds[shard], bounds[shard + 1], self._device(shard))
+            for shard in range(self.num_shards)
+        ]
+
+        def shard_top_k(shard):
+            return self._shard_top_k(inputs, k, exclusions, *shard)
+
+        if tf.executing_eagerly() and self.num_shards > 1:
+            if self._executor is None:
+                self._executor = ThreadPoolExecutor(max_workers=self.num_shards)
+            results = list(self._executor.map(shard_top_k, shards))
+        else:
+            results = [shard_top_k(shard) for shard in shards]
+
+        # the shards are in the order of the rows, so the first rows win the ties
+        scores = tf.concat([shard_scores for shard_scores, _ in results], axis=1)
+        rows = tf.concat([shard_rows for _, shard_rows in results], axis=1)
+        top_scores, positions = tf.math.top_k(scores, k=k)
+        return top_scores, tf.gather(rows, positions, batch_dims=1)
+
+    @staticmethod
+    def _shard_bounds(num_rows: tf.Tensor, num_shards: int) -> List[tf.Tensor]:
+        """The `num_shards + 1` bounds of contiguous shards of `num_rows` rows,
+        where the first `num_rows % num_shards` shards get one more row.
+
+        Unlike `num_rows * shard // num_shards`, this doesn't overflow int32.
+        """
+        shard_size, remainder = num_rows // num_shards, num_rows % num_shards
+        return [
+            shard * shard_size + tf.minimum(shard, remainder) for shard in range(num_shards + 1)
+        ]
+
+    def _shard_top_k(self, inputs: tf.Tensor, k, exclusions: "_Exclusions", start, end, device):
+        with tf.device(device) if device else contextlib.nullcontext():
+            scores = tf.matmul(inputs, self.values[start:end], transpose_b=True)
+            scores = self._mask_excluded(scores, tf.range(start, end), exclusions)
+            top_scores, rows = tf.math.top_k(scores, k=tf.minimum(k, end - start))
+            return top_scores, rows + start
+
+    def _device(self, shard: int) -> Optional[str]:
+        if not self.devices:
+            return None
+        return self.devices[shard % len(self.devices)]
+
+
+class _Exclusions(NamedTuple):
+    """The candidates a call of a top-k index doesn't retrieve."""
+
+    # rows that are excluded for all the queries
+    blocked: tf.Tensor
+    # sorted ids excluded for each query, see `_sorted_ids`
+    ids: Optional[tf.Tensor] = None
+    lengths: Optional[tf.Tensor] = None
+
+
+def _sorted_ids(ids: Union[tf.Tensor, tf.RaggedTensor]):
+    """Sorts the last dimension of (ragged) `ids` into a dense tensor, padded with (at
+    least one column of) the largest value of their dtype, so that `tf.searchsorted`
+    positions are valid indices. Returns it along with the number of ids of each row."""
+    largest = ids.dtype.max
+    if isinstance(ids, tf.RaggedTensor):
+        lengths = ids.row_lengths()
+        ids = ids.to_tensor(default_value=largest)
+    else:
+        lengths = tf.shape(ids, out_type=tf.int64)[-1]
+    padding = tf.fill(tf.concat([tf.shape(ids)[:-1], [1]], 0), tf.constant(largest, ids.dtype))
+    return tf.concat([tf.sort(ids, axis=-1), padding], axis=-1), lengths
+
+
+def _isin(values: tf.Tensor, sorted_ids: tf.Tensor, lengths: tf.Tensor) -> tf.Tensor:
+    """Whether each of `values` is in the `sorted_ids` of its row (or in the 1D `sorted_ids`)."""
+    positions = tf.searchsorted(sorted_ids, values, out_type=tf.int64)
+    found = tf.equal(tf.gather(sorted_ids, positions, batch_dims=sorted_ids.shape.rank - 1), values)
+    if sorted_ids.shape.rank > 1:
+        lengths = tf.expand_dims(lengths, -1)
+    return tf.logical_and(found, positions < lengths)
+
+
+class _RowsView:
+    """Rows `rows` of a 2D array, sliced lazily by `write_index`."""
+
+    def __init__(self, array, rows):
+        self.array = array
+        self.rows = rows
+        self.shape = (len(rows), array.shape[1])
+
+    def __getitem__(self, key):
+        return self.array[self.rows[key]]
+
+
+def _kmeans(values: tf.Tensor, num_clusters: int, iterations: int, sample_size: int, rng):
+    """Centroids of `num_clusters` clusters of the rows of `values`, trained with Lloyd's
+    algorithm on a sample of `sample_size` rows."""
+    num_rows = int(values.shape[0])
+    sample = values
+    if sample_size < num_rows:
+        sample = tf.gather(values, np.sort(rng.choice(num_rows, sample_size, replace=False)))
+    centroids = tf.gather(sample, rng.choice(int(sample.shape[0]), num_clusters, replace=False))
+    for _ in range(iterations):
+        assignments = _nearest_centroids(sample, centroids)
+        sums = tf.math.unsorted_segment_sum(sample, assignments, num_clusters)
+        counts = tf.math.bincount(assignments, minlength=num_clusters, dtype=tf.float32)
+        # empty clusters keep their centroid
+        centroids = tf.where(
+            tf.expand_dims(counts > 0, -1),
+            sums / tf.expand_dims(tf.maximum(counts, 1.0), -1),
+            centroids,
+        )
+    return centroids
+
+
+def _nearest_centroids(values: tf.Tensor, centroids: tf.Tensor, batch_size: int = 65536):
+    """Index of the closest centroid (L2) of every row of `values`, computed in batches."""
+    centroid_norms = tf.reduce_sum(tf.square(centroids), axis=-1)
+    assignments = []
+    for start in range(0, int(values.shape[0]), batch_size):
+        batch = values[start : start + batch_size]
+        distances = centroid_norms - 2 * tf.matmul(batch, centroids, transpose_b=True)
+        assignments.append(tf.argmin(distances, axis=-1, output_type=tf.int32))
+    if not assignments:
+        return tf.zeros((0,), dtype=tf.int32)
+    return tf.concat(assignments, axis=0)
@@ -19,6 +19,7 @@ import os
 
 import dask.dataframe as dd
 import numpy as np
+import pandas as pd
 import tensorflow as tf
 from packaging import version
 
@@ -243,6 +244,51 @@ class BatchedDataset(tf.keras.utils.Sequence, DataLoader):
         dictionary of key: column_name + value: integer representing max sequence length for column
     sparse_as_dense : bool
         bool value to activate transforming sparse tensors to dense
+    sparse_as_ragged : bool
+        Whether to output every list column as a `tf.RaggedTensor`, built
+        directly from its values and row lengths (without padding it to
+        `sparse_max`), instead of a tuple of values & row lengths or a
+        sparse tensor, by default False
+    num_workers : int
+        Number of threads reading and concatenating partitions in parallel.
+        With the default of 1, a single thread reads, shuffles and converts chunks
+    num_conversion_workers : int, optional
+        Number of threads shuffling chunks and converting them to tensors
+        when `num_workers > 1`, defaults to `num_workers`
+    deterministic : bool
+        When using multiple workers, whether batches must keep the order
+        of the underlying partitions, by default True
+    worker_type : {'thread', 'process'}
+        With "process", `num_workers` processes read the partitions and pull them
+        apart into flat arrays, which are handed back through shared memory. Keeps
+        the pandas work of CPU-only pipelines from competing with the training loop
+        for the GIL. Only supported on CPU, by default "thread"
+    row_groups_per_part : int, optional
+        If set, reads the row groups of the dataset's Parquet files directly (only the
+        columns used by the loader), `row_groups_per_part` row groups per part, instead
+        of whole Dask partitions. With `shuffle=True` every chunk then holds row groups
+        drawn from the whole dataset. Not supported with `worker_type="process"`
+    cache_batches : bool
+        Whether to cache the batches of the first pass over the data and replay them
+        in the next ones, instead of reading and converting the data again. Requires
+        `shuffle=False` (e.g. validation data). Functions added with `map` are applied
+        before caching, by default False
+    cache_max_bytes : int, optional
+        Memory budget of the cache. Beyond it, the least recently used batches are
+        spilled to `cache_spill_dir`, by default unlimited
+    cache_spill_dir : str, optional
+        Directory of the memory-mapped file holding the batches evicted from memory.
+        Without it, the cache is disabled when the batches don't fit in `cache_max_bytes`
+    adaptive_chunking : bool
+        Whether to adapt the number of partitions per chunk and the depth of the chunk
+        queue to the rates at which batches are produced and consumed, within
+        `chunk_memory_cap`. Decisions are exposed by `chunk_metrics`. Only supported with
+        a single thread worker, by default False
+    max_parts_per_chunk : int, optional
+        Max number of partitions per chunk with `adaptive_chunking`,
+        defaults to `4 * parts_per_chunk`
+    chunk_memory_cap : int, optional
+        Max estimated bytes of the chunks buffered with `adaptive_chunking`
     """
 
     _use_nnz = True
@@ -269,8 +315,22 @@ class BatchedDataset(tf.keras.utils.Sequence, DataLoader):
         sparse_max=None,
         multi_label_as_dict=True,
         sparse_as_dense=False,
+        sparse_as_ragged=False,
         schema=None,
+        num_workers=1,
+        num_conversion_workers=None,
+        deterministic=True,
+        worker_type="thread",
+        row_groups_per_part=None,
+        cache_batches=False,
+        cache_max_bytes=None,
+        cache_spill_dir=None,
+        adaptive_chunking=False,
+        max_parts_per_chunk=None,
+        chunk_memory_cap=None,
     ):
+        if sparse_as_dense and sparse_as_ragged:
+            raise ValueError("sparse_as_dense and sparse_as_ragged can't both be set")
         dataset = _validate_dataset(
             paths_or_dataset, batch_size, buffer_size, engine, device, reader_kwargs
         )
@@ -299,7 +359,19 @@ class BatchedDataset(tf.keras.utils.Sequence, DataLoader):
             sparse_names=sparse_names,
             sparse_max=sparse_max,
             sparse_as_dense=sparse_as_dense,
+            num_workers=num_workers,
+            num_conversion_workers=num_conversion_workers,
+            deterministic=deterministic,
+            worker_type=worker_type,
+            row_groups_per_part=row_groups_per_part,
+            cache_batches=cache_batches,
+            cache_max_bytes=cache_max_bytes,
+            cache_spill_dir=cache_spill_dir,
+            adaptive_chunking=adaptive_chunking,
+            max_parts_per_chunk=max_parts_per_chunk,
+            chunk_memory_cap=chunk_memory_cap,
         )
+        self.sparse_as_ragged = sparse_as_ragged
         self._map_fns = []
         if len(label_names) > 1 and multi_label_as_dict:
             self._map_fns.append(lambda X, y: (X, dict(zip(label_names, y))))
@@ -436,6 +508,47 @@ class BatchedDataset(tf.keras.utils.Sequence, DataLoader):
             x = tf.transpose(x)
         return x
 
+    def _to_column_tensors(self, gdf, columns, dtype=None):
+        if not isinstance(gdf, pd.DataFrame):
+            return None
+        # every column of a pandas frame is a contiguous array, so each
+        # tensor is created from that buffer without stacking or transposing
+        arrays = [gdf[column].to_numpy() for column in columns]
+        if any(array.dtype.hasobject for array in arrays):
+            return None
+        # same dtype as the single (rows, columns) tensor `_to_tensor` would create
+        common_dtype = np.result_type(*arrays)
+        arrays = [array.astype(common_dtype, copy=False) for array in arrays]
+        return [tf.expand_dims(tf.convert_to_tensor(array), -1) for array in arrays]
+
+    def _from_array(self, array, dtype=None):
+        x = tf.convert_to_tensor(array)
+        if len(x.shape) == 1:
+            x = tf.expand_dims(x, -1)
+        return x
+
+    def _rows_to_list(self, tensor, rows):
+        return tf.gather(tensor, rows).numpy().tolist()
+
+    def _batch_nbytes(self, batch):
+        return sum(
+            tensor.shape.num_elements() * tensor.dtype.size
+            for tensor in tf.nest.flatten(batch, expand_composites=True)
+            if tensor is not None
+        )
+
+    def _batch_to_arrays(self, batch):
+        # the type specs describe sparse & ragged tensors without holding their values
+        specs = tf.nest.map_structure(
+            lambda tensor: tf.type_spec_from_value(tensor) if tensor is not None else None, batch
+        )
+        tensors = tf.nest.flatten(batch, expand_composites=True)
+        return specs, [tensor.numpy() if tensor is not None else None for tensor in tensors]
+
+    def _batch_from_arrays(self, structure, arrays):
+        tensors = [tf.convert_to_tensor(array) if array is not None else None for array in arrays]
+        return tf.nest.pack_sequence_as(structure, tensors, expand_composites=True)
+
     def _pull_values_offsets(self, values_offset):
         """
         values_offset is either a tuple (values, offsets) or just values.
@@ -477,8 +590,18 @@ class BatchedDataset(tf.keras.utils.Sequence, DataLoader):
         )
         return sparse_tensor
 
+    def _build_ragged_tensor(self, values_offset):
+        # the loader represents list columns as values & row lengths (nnzs)
+        values = tf.reshape(values_offset[0], [-1])
+        row_lengths = tf.cast(tf.reshape(values_offset[1], [-1]), tf.int64)
+        return tf.RaggedTensor.from_row_lengths(
+            values=values, row_lengths=row_lengths, validate=False
+        )
+
     def _build_sparse_tensor(self, values, offsets, diff_offsets, num_rows, seq_limit):
         ragged = tf.RaggedTensor.from_row_lengths(values=values, row_lengths=diff_offsets)
+        if self.sparse_as_ragged:
+            return ragged
         tensor = tf.RaggedTensor.from_tensor(ragged.to_tensor(shape=[None, seq_limit])).to_sparse()
         if self.sparse_as_dense:
             tensor = tf.sparse.to_dense(tensor)
@@ -486,6 +609,11 @@ class BatchedDataset(tf.keras.utils.Sequence, DataLoader):
 
     def _handle_tensors(self, cats, conts, labels):
         to_return = super()._handle_tensors(cats, conts, labels)
+        if self.sparse_as_ragged:
+            X = to_return[0]
+            for column_name, value in X.items():
+                if isinstance(value, tuple):
+                    X[column_name] = self._build_ragged_tensor(value)
 
         for map_fn in self._map_fns:
             to_return = map_fn(*to_return)
@@ -555,7 +683,9 @@ def sample_batch(
     from merlin.models.tf.core.transformations import AsDenseFeatures, AsRaggedFeatures
 
     if not isinstance(data, BatchedDataset):
-        data = BatchedDataset(data, batch_size=batch_size, shuffle=shuffle)
+        data = BatchedDataset(
+            data, batch_size=batch_size, shuffle=shuffle, sparse_as_ragged=to_ragged
+        )
 
     batch = next(iter(data))
     # batch could be of type Prediction, so we can't unpack directly
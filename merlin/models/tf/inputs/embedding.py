@@ -14,9 +14,12 @@
 # limitations under the License.
 #
 
+import math
+import random
 from copy import copy, deepcopy
 from dataclasses import dataclass
-from typing import Any, Callable, Dict, Optional, Union
+from functools import partial
+from typing import Any, Callable, Dict, List, Optional, Union
 
 import tensorflow as tf
 from tensorflow.keras import backend
@@ -34,7 +37,11 @@ from merlin.models.tf.core.tabular import (
     TabularAggregationType,
     TabularBlock,
 )
-from merlin.models.tf.core.transformations import AsDenseFeatures, AsSparseFeatures
+from merlin.models.tf.core.transformations import (
+    AsDenseFeatures,
+    AsRaggedFeatures,
+    AsSparseFeatures,
+)
 
 # pylint has issues with TF array ops, so disable checks until fixed:
 # https://github.com/PyCQA/pylint/issues/3613
@@ -100,6 +107,99 @@ class EmbeddingTableBase(Block):
         return cls(col_schema=col_schema, **config)
 
 
+STORAGE_DTYPES = (None, "float32", "float16", "bfloat16", "int8")
+
+
+@tf.keras.utils.register_keras_serializable(package="merlin.models")
+class Int8Embedding(tf.keras.layers.Layer):
+    """Frozen embedding table stored as int8, with a float32 scale per row.
+
+    Each row is scaled to [-127, 127] and rounded, which makes the table about
+    4x smaller than in float32. The rows are dequantized to float32 when they
+    are looked up. As int8 variables can't be trained, the table is quantized
+    once from `embeddings_initializer` (e.g. pre-trained embeddings).
+
+    Parameters
+    ----------
+    input_dim: int
+        Number of ids
+    output_dim: int
+        Dimension of the embeddings
+    embeddings_initializer:
+        Initializer of the embeddings before quantization, by default "uniform"
+    """
+
+    def __init__(self, input_dim: int, output_dim: int, embeddings_initializer="uniform", **kwargs):
+        kwargs["trainable"] = False
+        super().__init__(**kwargs)
+        self.input_dim = input_dim
+        self.output_dim = output_dim
+        self.embeddings_initializer = tf.keras.initializers.get(embeddings_initializer)
+
+    def build(self, input_shape=None):
+        embeddings = self.embeddings_initializer(
+            (self.input_dim, self.output_dim), dtype=tf.float32
+        )
+        codes, scales = self.quantize(embeddings)
+        self.codes = self.add_weight(
+            name="codes",
+            shape=(self.input_dim, self.output_dim),
+            dtype=tf.int8,
+            initializer=lambda shape, dtype=None: codes,
+            trainable=False,
+        )
+        self.scales = self.add_weight(
+            name="scales",
+            shape=(self.input_dim,),
+            dtype=tf.float32,
+            initializer=lambda shape, dtype=None: scales,
+            trainable=False,
+        )
+        super().build(input_shape)
+
+    @staticmethod
+    def quantize(embeddings: tf.Tensor):
+        """The int8 codes and the float32 scales of the rows of `embeddings`"""
+        scales = tf.reduce_max(tf.abs(embeddings), axis=-1) / 127.0
+        scales = tf.where(scales > 0, scales, tf.ones_like(scales))
+        codes = tf.cast(tf.round(embeddings / tf.expand_dims(scales, -1)), tf.int8)
+
+        return codes, scales
+
+    def set_embeddings(self, embeddings: tf.Tensor):
+        """Quantizes `embeddings` into the table"""
+        codes, scales = self.quantize(tf.convert_to_tensor(embeddings, tf.float32))
+        self.codes.assign(codes)
+        self.scales.assign(scales)
+
+    @property
+    def embeddings(self) -> tf.Tensor:
+        """The dequantized table"""
+        return tf.cast(self.codes, tf.float32) * tf.expand_dims(self.scales, -1)
+
+    def call(self, inputs: Union[tf.Tensor, tf.RaggedTensor]) -> Union[tf.Tensor, tf.RaggedTensor]:
+        if isinstance(inputs, tf.RaggedTensor):
+            return tf.ragged.map_flat_values(self.call, inputs)
+        if inputs.dtype not in (tf.int32, tf.int64):
+            inputs = tf.cast(inputs, tf.int32)
+        rows = tf.cast(tf.gather(self.codes, inputs), tf.float32)
+
+        return rows * tf.expand_dims(tf.gather(self.scales, inputs), -1)
+
+    def compute_output_shape(self, input_shape):
+        return tf.TensorShape(input_shape).concatenate([self.output_dim])
+
+    def get_config(self):
+        config = super().get_config()
+        config["input_dim"] = self.input_dim
+        config["output_dim"] = self.output_dim
+        config["embeddings_initializer"] = tf.keras.initializers.serialize(
+            self.embeddings_initializer
+        )
+
+        return config
+
+
 @tf.keras.utils.register_keras_serializable(package="merlin.models")
 class EmbeddingTable(EmbeddingTableBase):
     """Embedding table that is backed by a standard Keras Embedding Layer.
@@ -144,6 +244,16 @@ class EmbeddingTable(EmbeddingTableBase):
        for example, or generally for any layer that manipulates tensors
        using Python control flow. If `False`, we assume that the layer can
        safely be used to generate a static computation graph.
+    storage_dtype: The dtype the table is stored in, independently of `dtype`:
+       "float16" or "bfloat16" (2x smaller than float32), or "int8" (`Int8Embedding`,
+       about 4x smaller, which can't be trained). The looked up embeddings are cast
+       to the compute dtype of the layer. `LazyAdam` updates reduced-precision tables
+       in float32; "bfloat16" keeps the range of float32 and is preferable for
+       trained tables. Default of `None` stores the table in the variable dtype.
+    deduplicate_ids: Boolean, whether to look up each distinct id of a batch once
+       (see `unique_lookup`), which saves memory traffic and gives gradients with
+       one row per distinct id when popular ids repeat within batches.
+       Default is False
     **kwargs: Forwarded Keras Layer parameters
     """
 
@@ -163,6 +273,8 @@ class EmbeddingTable(EmbeddingTableBase):
         dtype=None,
         dynamic=False,
         table=None,
+        storage_dtype: Optional[str] = None,
+        deduplicate_ids: bool = False,
         **kwargs,
     ):
         """Create an EmbeddingTable."""
@@ -170,8 +282,23 @@ class EmbeddingTable(EmbeddingTableBase):
         super(EmbeddingTable, self).__init__(
             dim, col_schema, trainable=trainable, name=name, dtype=dtype, dynamic=dynamic, **kwargs
         )
+        if storage_dtype not in STORAGE_DTYPES:
+            raise ValueError(
+                f"`storage_dtype` should be one of {STORAGE_DTYPES}, found {storage_dtype}"
+            )
+        self.storage_dtype = storage_dtype
+        self.deduplicate_ids = deduplicate_ids
         if table is not None:
             self.table = table
+        elif storage_dtype == "int8":
+            if trainable:
+                raise ValueError("int8 embedding tables can't be trained, set `trainable=False`")
+            self.table = Int8Embedding(
+                self.input_dim,
+                self.dim,
+                embeddings_initializer=embeddings_initializer,
+                name=self.col_schema.name,
+            )
         else:
             table_kwargs = dict(
                 embeddings_initializer=embeddings_initializer,
@@ -182,6 +309,8 @@ class EmbeddingTable(EmbeddingTableBase):
                 input_length=input_length,
                 trainable=trainable,
             )
+            if storage_dtype is not None:
+                table_kwargs["dtype"] = storage_dtype
             self.table = tf.keras.layers.Embedding(
                 input_dim=self.input_dim,
                 output_dim=self.dim,
@@ -278,9 +407,13 @@ class EmbeddingTable(EmbeddingTableBase):
                 )
             if isinstance(inputs, tf.RaggedTensor):
                 inputs = inputs.to_sparse()
-            out = tf.nn.safe_embedding_lookup_sparse(
-                self.table.embeddings, inputs, None, combiner=self.combiner
-            )
+            if not isinstance(self.table, tf.keras.layers.Embedding):
+                inputs = tf.sparse.retain(inputs, inputs.values >= 0)
+                out = _combine_sparse(self._lookup(inputs.values, **kwargs), inputs, self.combiner)
+            else:
+                out = tf.nn.safe_embedding_lookup_sparse(
+                    self.table.embeddings, inputs, None, combiner=self.combiner
+                )
         else:
             if not isinstance(inputs, (tf.RaggedTensor, tf.Tensor)):
                 raise ValueError(
@@ -288,17 +421,25 @@ class EmbeddingTable(EmbeddingTableBase):
                     f"Received: {type(inputs)}"
                 )
 
-            out = call_layer(self.table, inputs, **kwargs)
+            out = self._lookup(inputs, **kwargs)
             if isinstance(self.combiner, tf.keras.layers.Layer):
                 out = call_layer(self.combiner, out, **kwargs)
 
-        if self._dtype_policy.compute_dtype != self._dtype_policy.variable_dtype:
+        if out.dtype != self._dtype_policy.compute_dtype:
             # Instead of casting the variable as in most layers, cast the output, as
             # this is mathematically equivalent but is faster.
             out = tf.cast(out, self._dtype_policy.compute_dtype)
 
         return out
 
+    def _lookup(self, ids, **kwargs):
+        if self.deduplicate_ids:
+            return unique_lookup(
+                lambda unique_ids: call_layer(self.table, unique_ids, **kwargs), ids
+            )
+
+        return call_layer(self.table, ids, **kwargs)
+
     def compute_output_shape(
         self, input_shape: Union[tf.TensorShape, Dict[str, tf.TensorShape]]
     ) -> tf.Tensor:
@@ -324,6 +465,8 @@ class EmbeddingTable(EmbeddingTableBase):
 
     def get_config(self):
         config = super().get_config()
+        config["storage_dtype"] = self.storage_dtype
+        config["deduplicate_ids"] = self.deduplicate_ids
         config["table"] = tf.keras.layers.serialize(self.table)
         if isinstance(self.combiner, tf.keras.layers.Layer):
             config["combiner-layer"] = tf.keras.layers.serialize(self.combiner)
@@ -333,6 +476,429 @@ class EmbeddingTable(EmbeddingTableBase):
         return config
 
 
+class CompositionalEmbedding(tf.keras.layers.Layer):
+    """Base class of the embedding layers composing the embedding of each of
+    `input_dim` ids from rows of smaller tables, so that their memory doesn't
+    grow with `input_dim`. The tables are looked up with `tf.gather`, so their
+    gradients are sparse (e.g. for `LazyAdam`).
+
+    Parameters
+    ----------
+    input_dim: int
+        Number of ids
+    output_dim: int
+        Dimension of the embeddings
+    embeddings_initializer:
+        Initializer of the tables, by default "uniform"
+    """
+
+    def __init__(self, input_dim: int, output_dim: int, embeddings_initializer="uniform", **kwargs):
+        super().__init__(**kwargs)
+        self.input_dim = input_dim
+        self.output_dim = output_dim
+        self.embeddings_initializer = tf.keras.initializers.get(embeddings_initializer)
+
+    def call(self, inputs: Union[tf.Tensor, tf.RaggedTensor]) -> Union[tf.Tensor, tf.RaggedTensor]:
+        if isinstance(inputs, tf.RaggedTensor):
+            return tf.ragged.map_flat_values(self.lookup, inputs)
+
+        return self.lookup(inputs)
+
+    def lookup(self, ids: tf.Tensor) -> tf.Tensor:
+        raise NotImplementedError()
+
+    @classmethod
+    def from_column_schema(cls, col_schema: ColumnSchema, output_dim: int, **kwargs):
+        """Creates the layer for the ids of a categorical column"""
+        return cls(col_schema.int_domain.max + 1, output_dim, **kwargs)
+
+    def compute_output_shape(self, input_shape):
+        return tf.TensorShape(input_shape).concatenate([self.output_dim])
+
+    def get_config(self):
+        config = super().get_config()
+        config["input_dim"] = self.input_dim
+        config["output_dim"] = self.output_dim
+        config["embeddings_initializer"] = tf.keras.initializers.serialize(
+            self.embeddings_initializer
+        )
+
+        return config
+
+
+# Mersenne prime 2**31 - 1, so that the products of the hashes fit in an int64
+_HASH_PRIME = 2147483647
+
+
+@tf.keras.utils.register_keras_serializable(package="merlin.models")
+class HashedEmbedding(CompositionalEmbedding):
+    """Embedding table of `num_buckets` rows shared by the `input_dim` ids
+    (hashing trick).
+
+    Each id is mapped to `num_hashes` buckets by universal hash functions and
+    its embedding is the sum of the embeddings of its buckets, so that two ids
+    are unlikely to collide on all of them.
+
+    Parameters
+    ----------
+    input_dim: int
+        Number of ids
+    output_dim: int
+        Dimension of the embeddings
+    num_buckets: int, optional
+        Number of rows of the table, by default `min(input_dim, 2 ** 20)`
+    num_hashes: int, optional
+        Number of hash functions, by default 2
+    seed: int, optional
+        Seed of the hash functions, by default 0
+
+    References:
+    ----------
+    .. [1] Weinberger, Kilian, et al. "Feature hashing for large scale multitask learning."
+       ICML 2009.
+    .. [2] Svenstrup, Dan, et al. "Hash embeddings for efficient word representations."
+       NeurIPS 2017.
+    """
+
+    def __init__(
+        self,
+        input_dim: int,
+        output_dim: int,
+        num_buckets: Optional[int] = None,
+        num_hashes: int = 2,
+        seed: int = 0,
+        **kwargs,
+    ):
+        super().__init__(input_dim, output_dim, **kwargs)
+        self.num_buckets = num_buckets or min(input_dim, 2**20)
+        self.num_hashes = num_hashes
+        self.seed = seed
+        rng = random.Random(seed)
+        self._hash_a = [rng.randint(1, _HASH_PRIME - 1) for _ in range(num_hashes)]
+        self._hash_b = [rng.randint(0, _HASH_PRIME - 1) for _ in range(num_hashes)]
+
+    def build(self, input_shape):
+        self.bucket_embeddings = self.add_weight(
+            name="bucket_embeddings",
+            shape=(self.num_buckets, self.output_dim),
+            initializer=self.embeddings_initializer,
+        )
+        super().build(input_shape)
+
+    def buckets(self, ids: tf.Tensor) -> tf.Tensor:
+        """Buckets of `ids`, of shape `ids.shape + [num_hashes]`"""
+        ids = tf.expand_dims(tf.math.floormod(tf.cast(ids, tf.int64), _HASH_PRIME), -1)
+        hash_a = tf.constant(self._hash_a, tf.int64)
+        hash_b = tf.constant(self._hash_b, tf.int64)
+        hashes = tf.math.floormod(hash_a * ids + hash_b, _HASH_PRIME)
+
+        return tf.math.floormod(hashes, self.num_buckets)
+
+    def lookup(self, ids: tf.Tensor) -> tf.Tensor:
+        return tf.reduce_sum(tf.gather(self.bucket_embeddings, self.buckets(ids)), axis=-2)
+
+    def get_config(self):
+        config = super().get_config()
+        config["num_buckets"] = self.num_buckets
+        config["num_hashes"] = self.num_hashes
+        config["seed"] = self.seed
+
+        return config
+
+
+@tf.keras.utils.register_keras_serializable(package="merlin.models")
+class QREmbedding(CompositionalEmbedding):
+    """Quotient-remainder compositional embedding.
+
+    The embedding of the id `x` combines the `x // num_remainders`-th row of a
+    quotient table and the `x % num_remainders`-th row of a remainder table,
+    which together identify `x`. The two tables have
+    `ceil(input_dim / num_remainders) + num_remainders` rows.
+
+    Parameters
+    ----------
+    input_dim: int
+        Number of ids
+    output_dim: int
+        Dimension of the embeddings
+    num_remainders: int, optional
+        Number of rows of the remainder table, by default `ceil(sqrt(input_dim))`,
+        which minimizes the total number of rows
+    operation: str, optional
+        How the two embeddings are combined, "mult" or "add", by default "mult"
+
+    References:
+    ----------
+    .. [1] Shi, Hao-Jun Michael, et al. "Compositional embeddings using complementary
+       partitions for memory-efficient recommendation systems." KDD 2020.
+    """
+
+    def __init__(
+        self,
+        input_dim: int,
+        output_dim: int,
+        num_remainders: Optional[int] = None,
+        operation: str = "mult",
+        **kwargs,
+    ):
+        super().__init__(input_dim, output_dim, **kwargs)
+        if operation not in ("mult", "add"):
+            raise ValueError(f"`operation` should be 'mult' or 'add', found {operation}")
+        self.num_remainders = num_remainders or math.ceil(math.sqrt(input_dim))
+        self.num_quotients = math.ceil(input_dim / self.num_remainders)
+        self.operation = operation
+
+    def build(self, input_shape):
+        self.quotient_embeddings = self.add_weight(
+            name="quotient_embeddings",
+            shape=(self.num_quotients, self.output_dim),
+            initializer=self.embeddings_initializer,
+        )
+        self.remainder_embeddings = self.add_weight(
+            name="remainder_embeddings",
+            shape=(self.num_remainders, self.output_dim),
+            initializer=self.embeddings_initializer,
+        )
+        super().build(input_shape)
+
+    def lookup(self, ids: tf.Tensor) -> tf.Tensor:
+        ids = tf.cast(ids, tf.int64)
+        quotients = tf.gather(self.quotient_embeddings, ids // self.num_remainders)
+        remainders = tf.gather(self.remainder_embeddings, ids % self.num_remainders)
+        if self.operation == "mult":
+            return quotients * remainders
+
+        return quotients + remainders
+
+    def get_config(self):
+        config = super().get_config()
+        config["num_remainders"] = self.num_remainders
+        config["operation"] = self.operation
+
+        return config
+
+
+@tf.keras.utils.register_keras_serializable(package="merlin.models")
+class MixedDimensionEmbedding(CompositionalEmbedding):
+    """Embedding table with `output_dim`-dimensional rows for the `num_hot` most
+    frequent ids, and `tail_dim`-dimensional rows projected to `output_dim` for
+    the long tail of the other ids.
+
+    The ids are expected to be encoded by decreasing frequency, as NVTabular's
+    `Categorify` does, so that the hot ids are the ids below `num_hot`. When the
+    layer is created from a column schema (e.g. by `Embeddings`), the split is
+    inferred from the frequencies written by `Categorify`, see
+    `schema_utils.get_mixed_embedding_split`.
+
+    Parameters
+    ----------
+    input_dim: int
+        Number of ids
+    output_dim: int
+        Dimension of the embeddings
+    num_hot: int
+        Number of hot ids
+    tail_dim: int, optional
+        Dimension of the rows of the tail, by default `output_dim // 4`
+
+    References:
+    ----------
+    .. [1] Ginart, Antonio A., et al. "Mixed dimension embeddings with application to
+       memory-efficient recommendation systems." ISIT 2021.
+    """
+
+    def __init__(
+        self,
+        input_dim: int,
+        output_dim: int,
+        num_hot: int,
+        tail_dim: Optional[int] = None,
+        **kwargs,
+    ):
+        super().__init__(input_dim, output_dim, **kwargs)
+        self.num_hot = min(num_hot, input_dim)
+        self.tail_dim = tail_dim or max(1, output_dim // 4)
+
+    @classmethod
+    def from_column_schema(
+        cls,
+        col_schema: ColumnSchema,
+        output_dim: int,
+        num_hot: Optional[int] = None,
+        tail_dim: Optional[int] = None,
+        head_coverage: float = 0.9,
+        alpha: float = 0.25,
+        categories_dir: Optional[str] = None,
+        **kwargs,
+    ):
+        """Creates the layer for the ids of a categorical column, splitting them
+        from the frequencies of the column unless `num_hot` is provided.
+
+        Parameters
+        ----------
+        col_schema: ColumnSchema
+            Schema of the column
+        output_dim: int
+            Dimension of the embeddings
+        num_hot: int, optional
+            Number of hot ids, inferred from the frequencies by default
+        tail_dim: int, optional
+            Dimension of the rows of the tail, inferred from the frequencies by default
+        head_coverage: float, optional
+            Fraction of the occurrences covered by the hot ids, by default 0.9
+        alpha: float, optional
+            Exponent of the relative popularity of the tail, by default 0.25
+        categories_dir: str, optional
+            Directory the `cat_path` of the column is resolved from,
+            by default the current directory
+        """
+        input_dim = col_schema.int_domain.max + 1
+        if num_hot is None:
+            frequencies = schema_utils.categorical_frequencies(col_schema, categories_dir)
+            if frequencies is None:
+                raise ValueError(
+                    f"The column {col_schema.name} has no frequencies (`cat_path` property), "
+                    "`num_hot` should be provided"
+                )
+            num_hot, inferred_tail_dim = schema_utils.get_mixed_embedding_split(
+                frequencies[:input_dim], output_dim, head_coverage=head_coverage, alpha=alpha
+            )
+            tail_dim = tail_dim or inferred_tail_dim
+
+        return cls(input_dim, output_dim, num_hot=num_hot, tail_dim=tail_dim, **kwargs)
+
+    def build(self, input_shape):
+        self.hot_embeddings = self.add_weight(
+            name="hot_embeddings",
+            shape=(self.num_hot, self.output_dim),
+            initializer=self.embeddings_initializer,
+        )
+        self.tail_embeddings = self.add_weight(
+            name="tail_embeddings",
+            shape=(self.input_dim - self.num_hot, self.tail_dim),
+            initializer=self.embeddings_initializer,
+        )
+        self.tail_projection = self.add_weight(
+            name="tail_projection",
+            shape=(self.tail_dim, self.output_dim),
+            initializer="glorot_uniform",
+        )
+        super().build(input_shape)
+
+    def lookup(self, ids: tf.Tensor) -> tf.Tensor:
+        flat_ids = tf.reshape(tf.cast(ids, tf.int64), [-1])
+        is_hot = flat_ids < self.num_hot
+        hot_positions = tf.cast(tf.where(is_hot)[:, 0], tf.int32)
+        tail_positions = tf.cast(tf.where(tf.logical_not(is_hot))[:, 0], tf.int32)
+
+        hot = tf.gather(self.hot_embeddings, tf.gather(flat_ids, hot_positions))
+        tail = tf.gather(self.tail_embeddings, tf.gather(flat_ids, tail_positions) - self.num_hot)
+        tail = tf.matmul(tail, self.tail_projection)
+        out = tf.dynamic_stitch([hot_positions, tail_positions], [hot, tail])
+
+        return tf.reshape(out, tf.concat([tf.shape(ids), [self.output_dim]], 0))
+
+    def get_config(self):
+        config = super().get_config()
+        config["num_hot"] = self.num_hot
+        config["tail_dim"] = self.tail_dim
+
+        return config
+
+
+COMPOSITIONAL_EMBEDDINGS = {
+    "hashed": HashedEmbedding,
+    "qr": QREmbedding,
+    "mixed": MixedDimensionEmbedding,
+}
+TableType = Union[str, Dict[str, Any]]
+
+
+def compositional_embedding(
+    table_type: TableType,
+    input_dim: int,
+    output_dim: int,
+    col_schema: Optional[ColumnSchema] = None,
+    **kwargs,
+) -> CompositionalEmbedding:
+    """Creates a compositional embedding layer from its type: "hashed", "qr" or "mixed",
+    or a dict with the "type" and the parameters of the layer,
+    e.g. `{"type": "hashed", "num_buckets": 100_000, "num_hashes": 2}`.
+    When `col_schema` is provided, the layer is created for its ids (see
+    `CompositionalEmbedding.from_column_schema`).
+    """
+    params = {"type": table_type} if isinstance(table_type, str) else dict(table_type)
+    name = params.pop("type", None)
+    if name not in COMPOSITIONAL_EMBEDDINGS:
+        raise ValueError(
+            f"Unknown embedding table type: {name}, "
+            f"should be one of {list(COMPOSITIONAL_EMBEDDINGS.keys())}"
+        )
+
+    layer_cls = COMPOSITIONAL_EMBEDDINGS[name]
+    if col_schema is not None:
+        return layer_cls.from_column_schema(col_schema, output_dim, **params, **kwargs)
+
+    return layer_cls(input_dim, output_dim, **params, **kwargs)
+
+
+def unique_lookup(
+    lookup: Callable[[tf.Tensor], tf.Tensor], ids: Union[tf.Tensor, tf.RaggedTensor]
+) -> Union[tf.Tensor, tf.RaggedTensor]:
+    """`lookup(ids)` computed once per distinct id of `ids`.
+
+    The rows of the distinct ids are looked up, then scattered back to every
+    occurrence. In the backward pass, the gradients of the occurrences are summed
+    per distinct id before reaching `lookup`, so a table looked up with `tf.gather`
+    gets an `IndexedSlices` gradient with one row per distinct id.
+
+    Parameters
+    ----------
+    lookup : Callable[[tf.Tensor], tf.Tensor]
+        Maps a 1-D tensor of ids to their rows, e.g. `partial(tf.gather, table)`
+    ids : Union[tf.Tensor, tf.RaggedTensor]
+        The ids to look up
+
+    Returns
+    -------
+    Union[tf.Tensor, tf.RaggedTensor]
+        The rows of `ids`, of shape `ids.shape + rows.shape[1:]`
+    """
+    if isinstance(ids, tf.RaggedTensor):
+        return tf.ragged.map_flat_values(partial(unique_lookup, lookup), ids)
+
+    unique_ids, positions = tf.unique(tf.reshape(ids, [-1]))
+    rows = _expand_rows(lookup(unique_ids), positions)
+
+    return tf.reshape(rows, tf.concat([tf.shape(ids), tf.shape(rows)[1:]], 0))
+
+
+@tf.custom_gradient
+def _expand_rows(rows: tf.Tensor, positions: tf.Tensor):
+    def grad(upstream):
+        return tf.math.unsorted_segment_sum(upstream, positions, tf.shape(rows)[0]), None
+
+    return tf.gather(rows, positions), grad
+
+
+def _combine_sparse(embeddings: tf.Tensor, ids: tf.SparseTensor, combiner: str) -> tf.Tensor:
+    """Combines the `embeddings` of the values of each row of `ids`,
+    as `tf.nn.safe_embedding_lookup_sparse` does."""
+    segment_ids = ids.indices[:, 0]
+    num_rows = ids.dense_shape[0]
+    out = tf.math.unsorted_segment_sum(embeddings, segment_ids, num_rows)
+    if combiner == "sum":
+        return out
+    counts = tf.math.unsorted_segment_sum(
+        tf.ones_like(segment_ids, dtype=embeddings.dtype), segment_ids, num_rows
+    )
+    counts = tf.maximum(counts, 1.0)
+    if combiner == "sqrtn":
+        counts = tf.sqrt(counts)
+
+    return out / tf.expand_dims(counts, -1)
+
+
 def Embeddings(
     schema: Schema,
     pre: Optional[BlockType] = None,
@@ -351,6 +917,9 @@ def Embeddings(
     embeddings_initializers: Optional[
         Union[Dict[str, Callable[[Any], None]], Callable[[Any], None]]
     ] = None,
+    table_types: Optional[Dict[str, TableType]] = None,
+    storage_dtypes: Optional[Dict[str, str]] = None,
+    storage_dtype: Optional[str] = None,
     **kwargs,
 ) -> ParallelBlock:
     """Creates a ParallelBlock with an EmbeddingTable for each categorical feature
@@ -394,6 +963,19 @@ def Embeddings(
         An initializer function or a dict where keys are feature names and values are
         callable to initialize embedding tables. Pre-trained embeddings can be fed via
         embeddings_initializers arg.
+    table_types : Optional[Dict[str, TableType]], optional
+        A dict like {"feature_name": table type, ...} to bound the memory of the tables of
+        features with huge cardinalities. The type is "hashed" (`HashedEmbedding`), "qr"
+        (`QREmbedding`) or "mixed" (`MixedDimensionEmbedding`, split from the frequencies
+        of the feature), or a dict with the "type" and the parameters of the table,
+        e.g. {"type": "hashed", "num_buckets": 100_000}. By default None (full tables)
+    storage_dtypes : Optional[Dict[str, str]], optional
+        A dict like {"feature_name": storage dtype, ...} of the tables stored in reduced
+        precision ("float16", "bfloat16" or "int8", see `EmbeddingTable`). The int8 tables
+        aren't trainable, and features of `table_types` can't be listed. By default None
+    storage_dtype : Optional[str], optional
+        The storage dtype of the tables of the features that aren't in `storage_dtypes`,
+        except the ones of `table_types`, by default None
 
     Returns
     -------
@@ -419,6 +1001,14 @@ def Embeddings(
         embedding_dims = {**embedding_dims, **inferred_embedding_dims}
 
     trainable = trainable or {}
+    table_types = table_types or {}
+    storage_dtypes = storage_dtypes or {}
+    conflicts = sorted(set(table_types) & set(storage_dtypes))
+    if conflicts:
+        raise ValueError(
+            f"The features {conflicts} have both a `table_types` and a `storage_dtypes` entry, "
+            "but only full tables can be stored in reduced precision"
+        )
     for col in cols:
         combiner = None
         if Tags.SEQUENCE in col.tags or Tags.LIST in col.tags or col.is_list:
@@ -428,6 +1018,10 @@ def Embeddings(
                 combiner = sequence_combiner
 
         embedding_size = embedding_dims.get(col.name, embedding_dim_default)
+        col_storage_dtype = None
+        if col.name not in table_types:
+            col_storage_dtype = storage_dtypes.get(col.name, storage_dtype)
+        col_trainable = trainable.get(col.name, col_storage_dtype != "int8")
 
         if embeddings_initializers:
             if isinstance(embeddings_initializers, dict):
@@ -436,11 +1030,25 @@ def Embeddings(
                 emb_initializer = embeddings_initializers
             kwargs["embeddings_initializer"] = emb_initializer
 
+        table = None
+        if col.name in table_types:
+            table = compositional_embedding(
+                table_types[col.name],
+                col.int_domain.max + 1,
+                embedding_size,
+                col_schema=col,
+                embeddings_initializer=kwargs.get("embeddings_initializer", "uniform"),
+                trainable=col_trainable,
+                name=col.name,
+            )
+
         tables[col.name] = EmbeddingTable(
             embedding_size,
             col,
             combiner=combiner,
-            trainable=trainable.get(col.name, True),
+            trainable=col_trainable,
+            table=table,
+            storage_dtype=col_storage_dtype,
             **kwargs,
         )
 
@@ -538,6 +1146,71 @@ class EmbeddingOptions:
     ] = None
     embeddings_l2_reg: float = 0.0
     combiner: Optional[str] = "mean"
+    fuse_tables: bool = False
+    table_types: Optional[Dict[str, TableType]] = None
+    deduplicate_ids: bool = False
+
+
+class FusedEmbeddings(tf.keras.layers.Layer):
+    """Embedding tables of the same dimension packed into a single variable.
+
+    The rows of each table start at its offset in the variable, so that the
+    features of all the tables can be looked up with a single gather.
+
+    Parameters
+    ----------
+    tables: List[TableConfig]
+        The tables to pack, which must all have the same dimension
+    """
+
+    def __init__(self, tables: List[TableConfig], **kwargs):
+        super().__init__(**kwargs)
+        dims = {table.dim for table in tables}
+        if len(dims) != 1:
+            raise ValueError(f"The fused tables should have the same dim, found {sorted(dims)}")
+        self.tables = tables
+        self.dim = dims.pop()
+        self.offsets, offset = {}, 0
+        for table in tables:
+            self.offsets[table.name] = offset
+            offset += table.vocabulary_size
+        self.input_dim = offset
+
+    def build(self, input_shape=None):
+        def initializer(shape, dtype=None):
+            return tf.concat(
+                [
+                    tf.keras.initializers.get(table.initializer)(
+                        (table.vocabulary_size, self.dim), dtype=dtype
+                    )
+                    for table in self.tables
+                ],
+                axis=0,
+            )
+
+        self.embeddings = self.add_weight(
+            name="embeddings", shape=(self.input_dim, self.dim), initializer=initializer
+        )
+        super().build(input_shape)
+
+
+class FusedEmbeddingTable:
+    """One of the tables of a `FusedEmbeddings` layer, exposing the `input_dim`,
+    `output_dim` and `embeddings` of a `tf.keras.layers.Embedding`."""
+
+    def __init__(self, fused: FusedEmbeddings, table: TableConfig):
+        self.fused = fused
+        self.offset = fused.offsets[table.name]
+        self.input_dim = table.vocabulary_size
+        self.output_dim = table.dim
+
+    def build(self, input_shape=None):
+        if not self.fused.built:
+            self.fused.build(input_shape)
+
+    @property
+    def embeddings(self):
+        return self.fused.embeddings[self.offset : self.offset + self.input_dim]
 
 
 @docstring_parameter(
@@ -553,6 +1226,19 @@ class EmbeddingFeatures(TabularBlock):
     Parameters
     ----------
     {embedding_features_parameters}
+    fuse_tables: bool
+        Whether to pack the tables of the same dimension into a single variable, so that
+        all their features are looked up with one gather instead of one per feature.
+        This reduces the number of ops when there are many categorical features,
+        by default False
+    table_types: Dict[str, TableType], optional
+        A dict like {"table_name": table type, ...} of the tables created as
+        `CompositionalEmbedding` (see `Embeddings`), which are not fused. They are created
+        from the column schema of their first feature when it's in `schema` (e.g. the
+        "mixed" tables are split from its frequencies), by default None
+    deduplicate_ids: bool
+        Whether to look up each distinct id of a batch once (see `unique_lookup`),
+        by default False
     {tabular_module_parameters}
     """
 
@@ -566,6 +1252,9 @@ class EmbeddingFeatures(TabularBlock):
         name=None,
         add_default_pre=True,
         l2_reg: Optional[float] = 0.0,
+        fuse_tables: bool = False,
+        table_types: Optional[Dict[str, TableType]] = None,
+        deduplicate_ids: bool = False,
         **kwargs,
     ):
         if add_default_pre:
@@ -573,21 +1262,48 @@ class EmbeddingFeatures(TabularBlock):
             pre = [embedding_pre, pre] if pre else embedding_pre  # type: ignore
         self.feature_config = feature_config
         self.l2_reg = l2_reg
+        self.fuse_tables = fuse_tables
+        self.table_types = table_types or {}
+        self.deduplicate_ids = deduplicate_ids
 
         self.embedding_tables = {}
         tables: Dict[str, TableConfig] = {}
-        for _, feature in self.feature_config.items():
+        table_features: Dict[str, str] = {}
+        for feature_name, feature in self.feature_config.items():
             table: TableConfig = feature.table
             if table.name not in tables:
                 tables[table.name] = table
+                table_features[table.name] = feature_name
 
+        self.fused_embeddings = {}
+        tables_by_dim: Dict[int, List[TableConfig]] = {}
         for table_name, table in tables.items():
-            self.embedding_tables[table_name] = tf.keras.layers.Embedding(
-                table.vocabulary_size,
-                table.dim,
-                name=table_name,
-                embeddings_initializer=table.initializer,
-            )
+            if table_name in self.table_types:
+                col_schema = None
+                if schema is not None and table_features[table_name] in schema.column_names:
+                    col_schema = schema[table_features[table_name]]
+                self.embedding_tables[table_name] = compositional_embedding(
+                    self.table_types[table_name],
+                    table.vocabulary_size,
+                    table.dim,
+                    col_schema=col_schema,
+                    name=table_name,
+                    embeddings_initializer=table.initializer,
+                )
+            elif fuse_tables:
+                tables_by_dim.setdefault(table.dim, []).append(table)
+            else:
+                self.embedding_tables[table_name] = tf.keras.layers.Embedding(
+                    table.vocabulary_size,
+                    table.dim,
+                    name=table_name,
+                    embeddings_initializer=table.initializer,
+                )
+        for dim, dim_tables in tables_by_dim.items():
+            fused = FusedEmbeddings(dim_tables, name=f"fused_embeddings_{dim}")
+            self.fused_embeddings[str(dim)] = fused
+            for table in dim_tables:
+                self.embedding_tables[table.name] = FusedEmbeddingTable(fused, table)
 
         super().__init__(
             pre=pre,
@@ -664,6 +1380,10 @@ class EmbeddingFeatures(TabularBlock):
         tables: Dict[str, TableConfig] = {}
 
         domains = schema_utils.categorical_domains(schema)
+        table_types = {
+            domains[name]: table_type
+            for name, table_type in (embedding_options.table_types or {}).items()
+        }
         for name, (vocab_size, dim, emb_initilizer) in emb_config.items():
             table_name = domains[name]
             table = tables.get(table_name, None)
@@ -685,6 +1405,9 @@ class EmbeddingFeatures(TabularBlock):
             feature_config,
             schema=schema_copy,
             l2_reg=embedding_options.embeddings_l2_reg,
+            fuse_tables=embedding_options.fuse_tables,
+            table_types=table_types,
+            deduplicate_ids=embedding_options.deduplicate_ids,
             **kwargs,
         )
 
@@ -703,14 +1426,66 @@ class EmbeddingFeatures(TabularBlock):
             tf.keras.layers.Layer.build(self, input_shapes)
 
     def call(self, inputs: TabularData, **kwargs) -> TabularData:
-        embedded_outputs = {}
-        for name, val in inputs.items():
-            embedded_outputs[name] = self.lookup_feature(name, val)
-            if self.l2_reg > 0:
+        embedded_outputs = self.lookup_features(inputs)
+        if self.l2_reg > 0:
+            for name in inputs:
                 self.add_loss(self.l2_reg * tf.reduce_sum(tf.square(embedded_outputs[name])))
 
         return embedded_outputs
 
+    def lookup_features(self, inputs: TabularData, output_sequence=False) -> TabularData:
+        """Looks up the embeddings of all the features, with a single gather per
+        group of fused tables when `fuse_tables` is set."""
+        if not self.fuse_tables:
+            return {name: self.lookup_feature(name, val) for name, val in inputs.items()}
+
+        embedded_outputs, ids, rebuilds = {}, {}, {}
+        for name, val in inputs.items():
+            table: TableConfig = self.feature_config[name].table
+            if not isinstance(self.embedding_tables[table.name], FusedEmbeddingTable):
+                embedded_outputs[name] = self.lookup_feature(
+                    name, val, output_sequence=output_sequence
+                )
+                continue
+            if isinstance(val, tf.RaggedTensor) and not output_sequence:
+                val = val.to_sparse()
+            if isinstance(val, tf.SparseTensor):
+                val = tf.sparse.retain(val, val.values >= 0)
+                flat_ids = val.values
+                rebuild = partial(_combine_sparse, ids=val, combiner=table.combiner)
+            elif isinstance(val, tf.RaggedTensor):
+                flat_ids = val.flat_values
+                rebuild = val.with_flat_values
+            else:
+                if not output_sequence and len(val.shape) > 1:
+                    val = val[:, 0]
+                flat_ids = tf.reshape(val, [-1])
+                rebuild = self._reshape_fn(tf.shape(val), table.dim)
+            fused = self.embedding_tables[table.name]
+            ids.setdefault(str(table.dim), []).append(tf.cast(flat_ids, tf.int32) + fused.offset)
+            rebuilds[name] = rebuild
+
+        rows = {}
+        for dim, dim_ids in ids.items():
+            gather = partial(tf.gather, self.fused_embeddings[dim].embeddings)
+            if self.deduplicate_ids:
+                gather = partial(unique_lookup, gather)
+            embeddings = gather(tf.concat(dim_ids, 0))
+            sizes = tf.stack([tf.size(feature_ids) for feature_ids in dim_ids])
+            rows[dim] = iter(tf.split(embeddings, sizes, num=len(dim_ids)))
+
+        for name in rebuilds:
+            out = rebuilds[name](next(rows[str(self.feature_config[name].table.dim)]))
+            if self._dtype_policy.compute_dtype != self._dtype_policy.variable_dtype:
+                out = tf.cast(out, self._dtype_policy.compute_dtype)
+            embedded_outputs[name] = out
+
+        return {name: embedded_outputs[name] for name in inputs}
+
+    @staticmethod
+    def _reshape_fn(shape: tf.Tensor, dim: int):
+        return lambda embeddings: tf.reshape(embeddings, tf.concat([shape, [dim]], 0))
+
     def compute_call_output_shape(self, input_shapes):
         batch_size = self.calculate_batch_size_from_input_shapes(input_shapes)
 
@@ -726,19 +1501,35 @@ class EmbeddingFeatures(TabularBlock):
             val = tf.cast(val, "int32")
 
         table: TableConfig = self.feature_config[name].table
-        table_var = self.embedding_tables[table.name].embeddings
+        embedding_table = self.embedding_tables[table.name]
+        if isinstance(embedding_table, CompositionalEmbedding):
+            gather = embedding_table
+        else:
+            table_var = embedding_table.embeddings
+            gather = partial(tf.gather, table_var)
+        if self.deduplicate_ids:
+            gather = partial(unique_lookup, gather)
+        if isinstance(val, tf.RaggedTensor) and not output_sequence:
+            val = val.to_sparse()
         if isinstance(val, tf.SparseTensor):
-            out = tf.nn.safe_embedding_lookup_sparse(table_var, val, None, combiner=table.combiner)
+            if isinstance(embedding_table, CompositionalEmbedding):
+                val = tf.sparse.retain(val, val.values >= 0)
+                out = _combine_sparse(gather(val.values), val, table.combiner)
+            else:
+                out = tf.nn.safe_embedding_lookup_sparse(
+                    table_var, val, None, combiner=table.combiner
+                )
         else:
             if output_sequence:
-                out = tf.gather(table_var, tf.cast(val, tf.int32))
+                # also keeps RaggedTensor inputs ragged: (batch, None, dim)
+                out = gather(tf.cast(val, tf.int32))
             else:
                 if len(val.shape) > 1:
                     # TODO: Check if it is correct to retrieve only the 1st element
                     # of second dim for non-sequential multi-hot categ features
-                    out = tf.gather(table_var, tf.cast(val, tf.int32)[:, 0])
+                    out = gather(tf.cast(val, tf.int32)[:, 0])
                 else:
-                    out = tf.gather(table_var, tf.cast(val, tf.int32))
+                    out = gather(tf.cast(val, tf.int32))
         if self._dtype_policy.compute_dtype != self._dtype_policy.variable_dtype:
             # Instead of casting the variable as in most layers, cast the output, as
             # this is mathematically equivalent but is faster.
@@ -861,6 +1652,9 @@ class EmbeddingFeatures(TabularBlock):
 
     def get_config(self):
         config = super().get_config()
+        config["fuse_tables"] = self.fuse_tables
+        config["table_types"] = self.table_types
+        config["deduplicate_ids"] = self.deduplicate_ids
 
         feature_configs = {}
 
@@ -910,6 +1704,12 @@ class SequenceEmbeddingFeatures(EmbeddingFeatures):
     {embedding_features_parameters}
     padding_idx: int
         The symbol to use for padding.
+    ragged: bool
+        Whether to keep sequences ragged instead of padding them to `max_seq_length`.
+        List features are then looked up as `tf.RaggedTensor` (for instance the ones
+        yielded by `BatchedDataset(..., sparse_as_ragged=True)`) and the embeddings
+        are returned as `tf.RaggedTensor` of shape (batch_size, None, dim),
+        by default False
     {tabular_module_parameters}
     """
 
@@ -925,10 +1725,12 @@ class SequenceEmbeddingFeatures(EmbeddingFeatures):
         schema: Optional[Schema] = None,
         name: Optional[str] = None,
         add_default_pre=True,
+        ragged: bool = False,
         **kwargs,
     ):
         if add_default_pre:
-            embedding_pre = [Filter(list(feature_config.keys())), AsDenseFeatures(max_seq_length)]
+            as_sequence = AsRaggedFeatures() if ragged else AsDenseFeatures(max_seq_length)
+            embedding_pre = [Filter(list(feature_config.keys())), as_sequence]
             pre = [embedding_pre, pre] if pre else embedding_pre  # type: ignore
 
         super().__init__(
@@ -943,12 +1745,16 @@ class SequenceEmbeddingFeatures(EmbeddingFeatures):
         )
         self.padding_idx = padding_idx
         self.mask_zero = mask_zero
+        self.ragged = ragged
 
     def lookup_feature(self, name, val, **kwargs):
         return super(SequenceEmbeddingFeatures, self).lookup_feature(
             name, val, output_sequence=True
         )
 
+    def lookup_features(self, inputs: TabularData, **kwargs) -> TabularData:
+        return super(SequenceEmbeddingFeatures, self).lookup_features(inputs, output_sequence=True)
+
     def compute_call_output_shape(self, input_shapes):
         batch_size = self.calculate_batch_size_from_input_shapes(input_shapes)
         sequence_length = input_shapes[list(self.feature_config.keys())[0]][1]
@@ -962,7 +1768,8 @@ class SequenceEmbeddingFeatures(EmbeddingFeatures):
         return output_shapes
 
     def compute_mask(self, inputs, mask=None):
-        if not self.mask_zero:
+        if not self.mask_zero or self.ragged:
+            # ragged sequences aren't padded, so there is nothing to mask
             return None
         outputs = {}
         for key, val in inputs.items():
@@ -974,6 +1781,7 @@ class SequenceEmbeddingFeatures(EmbeddingFeatures):
         config = super().get_config()
         config["mask_zero"] = self.mask_zero
         config["padding_idx"] = self.padding_idx
+        config["ragged"] = self.ragged
 
         return config
 
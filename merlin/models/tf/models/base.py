@@ -3,8 +3,9 @@ from __future__ import annotations
 import inspect
 import sys
 from collections.abc import Sequence as SequenceCollection
-from typing import TYPE_CHECKING, Dict, List, Optional, Protocol, Union, runtime_checkable
+from typing import TYPE_CHECKING, Dict, List, Optional, Protocol, Type, Union, runtime_checkable
 
+import numpy as np
 import six
 import tensorflow as tf
 from keras.utils.losses_utils import cast_losses_to_common_dtype
@@ -1067,6 +1068,10 @@ class RetrievalModel(Model):
 
             if isinstance(item_corpus, TopKIndexBlock):
                 self.loss_block.pre_eval_topk = item_corpus  # type: ignore
+                # `test_step` retrieves the top-k from the model's `pre_eval_topk`
+                if not getattr(item_corpus, "_context", None):
+                    item_corpus._set_context(self.context)
+                self.pre_eval_topk = item_corpus
             elif isinstance(item_corpus, merlin.io.Dataset):
                 item_corpus = unique_rows_by_features(item_corpus, Tags.ITEM, Tags.ITEM_ID)
                 item_block = self.retrieval_block.item_block()
@@ -1120,6 +1125,57 @@ class RetrievalModel(Model):
     def retrieval_block(self) -> RetrievalBlock:
         return next(b for b in self.blocks if isinstance(b, RetrievalBlock))
 
+    @property
+    def query_cache(self):
+        """The cache of the query embeddings, see `enable_query_cache`."""
+        return getattr(self.retrieval_block.query_block(), "embedding_cache", None)
+
+    def enable_query_cache(self, id_column: Optional[str] = None):
+        """Caches the query embeddings by query id, outside of training.
+
+        The embeddings are reused by `evaluate`, `query_embeddings` and the
+        recommenders of `to_top_k_recommender` until the weights change, i.e. until
+        the next training step. Call `query_cache.clear()` after setting the weights
+        of the model in another way (e.g. `load_weights`).
+
+        Parameters
+        ----------
+        id_column: Optional[str]
+            Name of the query id feature, defaults to the one tagged with `Tags.USER_ID`.
+
+        Returns
+        -------
+        EmbeddingCache
+        """
+        from merlin.models.tf.blocks.retrieval.base import EmbeddingCache
+
+        query_block = self.retrieval_block.query_block()
+        if not id_column:
+            id_schema = query_block.schema.select_by_tag(Tags.USER_ID)
+            if not id_schema.column_schemas:
+                raise ValueError("Please provide the `id_column` of the queries")
+            id_column = id_schema.first.name
+
+        def version_fn():
+            optimizer = getattr(self, "optimizer", None)
+            if optimizer is None:
+                return tf.constant(0, dtype=tf.int64)
+            return optimizer.iterations
+
+        query_block.embedding_cache = EmbeddingCache(id_column, version_fn=version_fn)
+        self._reset_compiled_functions()
+        return query_block.embedding_cache
+
+    def disable_query_cache(self):
+        """Drops the cache of the query embeddings, see `enable_query_cache`."""
+        self.retrieval_block.query_block().embedding_cache = None
+        self._reset_compiled_functions()
+
+    def _reset_compiled_functions(self):
+        # the traced functions are rebuilt with (or without) the cache lookups
+        self.test_function = None
+        self.predict_function = None
+
     def query_embeddings(
         self,
         dataset: merlin.io.Dataset,
@@ -1148,13 +1204,31 @@ class RetrievalModel(Model):
         """
         from merlin.models.tf.utils.batch_utils import QueryEmbeddings
 
-        get_user_emb = QueryEmbeddings(self, batch_size=batch_size)
-
         dataset = unique_rows_by_features(dataset, query_tag, query_id_tag).to_ddf()
+        if self.query_cache is not None:
+            return merlin.io.Dataset(self._cached_query_embeddings(dataset, batch_size))
+
+        get_user_emb = QueryEmbeddings(self, batch_size=batch_size)
         embeddings = dataset.map_partitions(get_user_emb)
 
         return merlin.io.Dataset(embeddings)
 
+    def _cached_query_embeddings(self, ddf, batch_size: int):
+        """Encodes the partitions of `ddf` right away with the live query tower, which reuses
+        (and fills) the cache. Dask would call it lazily, and on fake rows to infer the meta."""
+        from merlin.core.dispatch import concat
+        from merlin.models.tf.utils.batch_utils import ModelEncode, data_iterator_func, model_encode
+
+        query_block = self.retrieval_block.query_block()
+        encode = ModelEncode(
+            query_block,
+            data_iterator_func=data_iterator_func(query_block.schema, batch_size=batch_size),
+            model_encode_func=model_encode,
+            output_concat_func=np.concatenate,
+        )
+        partitions = (ddf.get_partition(i).compute() for i in range(ddf.npartitions))
+        return concat([encode(df) for df in partitions if len(df)])
+
     def item_embeddings(
         self,
         dataset: merlin.io.Dataset,
@@ -1204,6 +1278,7 @@ class RetrievalModel(Model):
         self,
         item_corpus: Union[merlin.io.Dataset, TopKIndexBlock],
         k: Optional[int] = None,
+        index_cls: Optional[Type[TopKIndexBlock]] = None,
         **kwargs,
     ) -> ModelBlock:
         """Convert the model to a Top-k Recommender.
@@ -1213,6 +1288,10 @@ class RetrievalModel(Model):
             Dataset to convert to a Top-k Recommender.
         k: int
             Number of recommendations to make.
+        index_cls: Optional[Type[TopKIndexBlock]]
+            The top-k index built from a Dataset `item_corpus`, e.g. `IVFFlatIndexBlock`
+            for approximate retrieval. Its options are passed as `kwargs`.
+            Defaults to `TopKIndexBlock`
         Returns
         -------
         SequentialBlock
@@ -1228,7 +1307,8 @@ class RetrievalModel(Model):
                     raise ValueError("You must specify a k for the Top-k Recommender.")
 
             data = unique_rows_by_features(item_corpus, Tags.ITEM, Tags.ITEM_ID)
-            topk_index = ml.TopKIndexBlock.from_block(
+            index_cls = index_cls or ml.TopKIndexBlock
+            topk_index = index_cls.from_block(
                 self.retrieval_block.item_block(), data=data, k=k, **kwargs
             )
         else:
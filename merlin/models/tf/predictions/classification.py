@@ -30,6 +30,7 @@ from merlin.models.tf.predictions.sampling.base import (
     parse_negative_samplers,
 )
 from merlin.models.tf.typing import TabularData
+from merlin.models.tf.utils import tf_utils
 from merlin.models.tf.utils.tf_utils import (
     call_layer,
     maybe_deserialize_keras_objects,
@@ -148,6 +149,16 @@ class CategoricalPrediction(ContrastivePredictionBlock):
     get_default_metrics: Callable, optional
         A function returning the list of default metrics
         to use for categorical-classification
+    eval_top_k: int, optional
+        If set, the model is evaluated on the top-`eval_top_k` classes only: their
+        logits are computed `eval_tile_size` classes at a time, keeping a running
+        top-k, so that the logits of all the classes are never materialized.
+        It must be at least the largest cut-off of the top-k metrics.
+        The evaluation loss is then the cross-entropy over the top-k classes.
+        By default the logits of all the classes are computed
+    eval_tile_size: int, optional
+        Number of classes scored at a time when `eval_top_k` is set,
+        by default 65536
 
     References:
     ----------
@@ -170,6 +181,8 @@ class CategoricalPrediction(ContrastivePredictionBlock):
         name: Optional[str] = None,
         default_loss: Union[str, tf.keras.losses.Loss] = "categorical_crossentropy",
         default_metrics_fn: MetricsFn = default_categorical_prediction_metrics,
+        eval_top_k: Optional[int] = None,
+        eval_tile_size: int = 65536,
         **kwargs,
     ):
         self.max_num_samples = kwargs.pop("max_num_samples", None)
@@ -197,6 +210,16 @@ class CategoricalPrediction(ContrastivePredictionBlock):
             ),
         )
         self.target_name = kwargs.pop("target", target_name)
+        self.eval_top_k = eval_top_k
+        self.eval_tile_size = eval_tile_size
+        self.eval_top_k_lookups = None
+        if eval_top_k:
+            self.eval_top_k_lookups = TopKLookUps(
+                prediction=_prediction,
+                k=eval_top_k,
+                tile_size=eval_tile_size,
+                feature_name=target_name,
+            )
         super().__init__(
             prediction=_prediction,
             prediction_with_negatives=prediction_with_negatives,
@@ -210,6 +233,14 @@ class CategoricalPrediction(ContrastivePredictionBlock):
             **kwargs,
         )
 
+    def call(self, inputs, training=False, testing=False, **kwargs):
+        if testing and not training and self.eval_top_k_lookups is not None:
+            return call_layer(
+                self.eval_top_k_lookups, inputs, training=training, testing=testing, **kwargs
+            )
+
+        return super().call(inputs, training=training, testing=testing, **kwargs)
+
     def compile(self, negative_sampling=None, downscore_false_negatives=False):
         if negative_sampling is not None:
             negative_sampling = parse_negative_samplers(negative_sampling)
@@ -220,6 +251,8 @@ class CategoricalPrediction(ContrastivePredictionBlock):
         config = super(ContrastivePredictionBlock, self).get_config()
         config["max_num_samples"] = self.max_num_samples
         config["target_name"] = self.target_name
+        config["eval_top_k"] = self.eval_top_k
+        config["eval_tile_size"] = self.eval_tile_size
         return config
 
 
@@ -310,6 +343,15 @@ class CategoricalTarget(tf.keras.layers.Dense):
         """
         return embedding_ops.embedding_lookup(tf.transpose(self.kernel), inputs, **kwargs)
 
+    def tile_logits(self, inputs: tf.Tensor, start, tile_size: int) -> tf.Tensor:
+        """Logits of the classes `start` to `start + tile_size`."""
+        logits = tf.matmul(inputs, self.kernel[:, start : start + tile_size])
+        if self.use_bias:
+            logits = tf.nn.bias_add(logits, self.bias[start : start + tile_size])
+        if self.activation is not None:
+            logits = self.activation(logits)
+        return logits
+
 
 @tf.keras.utils.register_keras_serializable(package="merlin.models")
 class EmbeddingTablePrediction(Layer):
@@ -345,7 +387,9 @@ class EmbeddingTablePrediction(Layer):
         return super().build(input_shape)
 
     def call(self, inputs, training=False, **kwargs) -> tf.Tensor:
-        logits = tf.matmul(inputs, self.table.table.embeddings, transpose_b=True)
+        # the table can be stored in reduced precision (see `EmbeddingTable.storage_dtype`)
+        embeddings = tf.cast(self.table.table.embeddings, inputs.dtype)
+        logits = tf.matmul(inputs, embeddings, transpose_b=True)
         logits = tf.nn.bias_add(logits, self.bias)
 
         return logits
@@ -353,6 +397,12 @@ class EmbeddingTablePrediction(Layer):
     def embedding_lookup(self, inputs, **kwargs):
         return self.table.table(inputs, **kwargs)
 
+    def tile_logits(self, inputs: tf.Tensor, start, tile_size: int) -> tf.Tensor:
+        """Logits of the classes `start` to `start + tile_size`."""
+        embeddings = self.table.table.embeddings[start : start + tile_size]
+        logits = tf.matmul(inputs, tf.cast(embeddings, inputs.dtype), transpose_b=True)
+        return tf.nn.bias_add(logits, self.bias[start : start + tile_size])
+
     def compute_output_shape(self, input_shape):
         return (input_shape[0], self.num_classes)
 
@@ -381,6 +431,96 @@ class LookUpProtocol(Protocol):
         pass
 
 
+@tf.keras.utils.register_keras_serializable(package="merlin.models")
+class TopKLookUps(Layer):
+    """Evaluation layer returning the logits of the top-k classes only.
+
+    The logits are computed for `tile_size` classes at a time and merged into a
+    running top-k, so the memory used is bounded by `batch_size * tile_size`
+    instead of `batch_size * num_classes`. The targets are the one-hot
+    representation of the positive class among the top-k (all zeros when it
+    isn't retrieved), so that the top-k metrics can be computed from them.
+
+    Parameters
+    ----------
+    prediction : Layer
+        The prediction layer, which computes the logits of a range of classes
+        with `tile_logits`, e.g. `CategoricalTarget` or `EmbeddingTablePrediction`.
+    k : int
+        Number of top classes.
+    tile_size : int, optional
+        Number of classes scored at a time, by default 65536
+    feature_name : str, optional
+        The name of the target feature, by default None
+    """
+
+    def __init__(
+        self,
+        prediction: Layer,
+        k: int,
+        tile_size: int = 65536,
+        feature_name: str = None,
+        **kwargs,
+    ):
+        if not hasattr(prediction, "tile_logits"):
+            raise ValueError(
+                f"{type(prediction).__name__} doesn't support evaluating on the top-k "
+                "classes, it should implement `tile_logits`"
+            )
+        self.prediction = prediction
+        self.k = k
+        self.tile_size = tile_size
+        self.feature_name = feature_name
+        super().__init__(**kwargs)
+
+    def call(self, inputs, targets, training=False, testing=False):
+        if isinstance(targets, dict):
+            if self.feature_name is None:
+                raise ValueError(
+                    "When training with multi-task, you should specify the "
+                    "`target_name` for the top-k evaluation"
+                )
+            targets = targets[self.feature_name]
+        if targets.shape.rank == 2 and targets.shape[-1] != 1:
+            # one-hot targets
+            targets = tf.argmax(targets, axis=-1)
+        positive_ids = tf.reshape(tf.cast(targets, tf.int32), [-1, 1])
+
+        top_scores, top_ids = tf_utils.tiled_top_k(
+            lambda start: self.prediction.tile_logits(inputs, start, self.tile_size),
+            self.prediction.num_classes,
+            tf.shape(inputs)[0],
+            self.k,
+            self.tile_size,
+            dtype=inputs.dtype,
+        )
+
+        # To ensure that the output is always fp32, avoiding numerical
+        # instabilities with mixed_float16 policy
+        outputs = tf.cast(top_scores, tf.float32)
+        targets = tf.cast(tf.equal(top_ids, positive_ids), outputs.dtype)
+
+        return Prediction(outputs, targets)
+
+    def get_config(self):
+        config = maybe_serialize_keras_objects(
+            self,
+            {
+                **super().get_config(),
+                "k": self.k,
+                "tile_size": self.tile_size,
+                "feature_name": self.feature_name,
+            },
+            ["prediction"],
+        )
+        return config
+
+    @classmethod
+    def from_config(cls, config):
+        config = maybe_deserialize_keras_objects(config, ["prediction"])
+        return super().from_config(config)
+
+
 @tf.keras.utils.register_keras_serializable(package="merlin.models")
 class SampledLookUps(Layer):
     """Contrastive layer for sampled logits.
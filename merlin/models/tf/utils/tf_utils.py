@@ -23,6 +23,7 @@ from packaging import version
 from merlin.core.dispatch import DataFrameType
 from merlin.io import Dataset
 from merlin.models.tf.typing import TabularData
+from merlin.models.utils.constants import MIN_FLOAT
 from merlin.models.utils.misc_utils import filter_kwargs
 
 if version.parse(tf.__version__) < version.parse("2.3.0"):
@@ -147,6 +148,35 @@ def extract_topk(k, predictions, labels):
     return topk_predictions, topk_labels, label_relevant_counts
 
 
+def tiled_top_k(score_tile, num_candidates, batch_size, k, tile_size: int, dtype=tf.float32):
+    """Top-k scores and indices of `num_candidates` candidates, scored `tile_size` at a time.
+
+    `score_tile(start)` returns the `(batch_size, <= tile_size)` scores of the candidates
+    `start` to `start + tile_size`, only a running top-k is kept across the tiles.
+    Ties are broken in favor of the first candidates, as with `tf.math.top_k`.
+    """
+    top_scores = tf.fill(tf.stack([batch_size, k]), tf.cast(MIN_FLOAT, dtype))
+    top_indices = tf.zeros(tf.stack([batch_size, k]), dtype=tf.int32)
+
+    def body(start, top_scores, top_indices):
+        scores = score_tile(start)
+        scores, indices = tf.math.top_k(scores, k=tf.minimum(k, tf.shape(scores)[1]))
+        # the running top-k comes first, so it wins the ties
+        scores = tf.concat([top_scores, scores], axis=1)
+        indices = tf.concat([top_indices, indices + start], axis=1)
+        top_scores, positions = tf.math.top_k(scores, k=k)
+        top_indices = tf.gather(indices, positions, batch_dims=1)
+        return start + tile_size, top_scores, top_indices
+
+    _, top_scores, top_indices = tf.while_loop(
+        lambda start, *_: start < num_candidates,
+        body,
+        (tf.constant(0), top_scores, top_indices),
+        parallel_iterations=1,
+    )
+    return top_scores, top_indices
+
+
 def transform_label_to_onehot(labels, vocab_size):
     return tf.one_hot(tf.reshape(labels, (-1,)), vocab_size)
 
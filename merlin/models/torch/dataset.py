@@ -13,6 +13,8 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import warnings
+
 import numpy as np
 import pandas as pd
 import torch
@@ -50,6 +52,33 @@ class Dataset(torch.utils.data.IterableDataset, DataLoader):
         dictionary of key: column_name + value: integer representing max sequence length for column
     sparse_as_dense : bool
         bool value to activate transforming sparse tensors to dense
+    num_workers : int
+        number of threads reading and concatenating partitions in parallel
+    num_conversion_workers : int
+        number of threads converting chunks to tensors when num_workers > 1,
+        defaults to num_workers
+    deterministic : bool
+        with multiple workers, keep batches in the order of the underlying partitions
+    worker_type : str
+        "thread" or "process". Process workers hand chunks back through shared memory,
+        which keeps pandas work off the training process (CPU only)
+    row_groups_per_part : int
+        if set, read this many Parquet row groups (only the columns used) per part,
+        instead of whole partitions, for near-global shuffling with small chunks
+    cache_batches : bool
+        cache the batches of the first pass and replay them in the next ones (requires
+        shuffle=False)
+    cache_max_bytes : int
+        memory budget of the batch cache, least recently used batches are evicted beyond it
+    cache_spill_dir : str
+        directory of the memory-mapped file holding the batches evicted from memory
+    adaptive_chunking : bool
+        adapt partitions per chunk and the depth of the chunk queue to the producer and
+        consumer rates (single thread worker only), see `chunk_metrics`
+    max_parts_per_chunk : int
+        max number of partitions per chunk with adaptive_chunking
+    chunk_memory_cap : int
+        max estimated bytes of the chunks buffered with adaptive_chunking
     """
 
     def __init__(
@@ -69,6 +98,17 @@ class Dataset(torch.utils.data.IterableDataset, DataLoader):
         sparse_names=None,
         sparse_max=None,
         sparse_as_dense=False,
+        num_workers=1,
+        num_conversion_workers=None,
+        deterministic=True,
+        worker_type="thread",
+        row_groups_per_part=None,
+        cache_batches=False,
+        cache_max_bytes=None,
+        cache_spill_dir=None,
+        adaptive_chunking=False,
+        max_parts_per_chunk=None,
+        chunk_memory_cap=None,
     ):
         DataLoader.__init__(
             self,
@@ -87,6 +127,17 @@ class Dataset(torch.utils.data.IterableDataset, DataLoader):
             sparse_names=sparse_names,
             sparse_max=sparse_max,
             sparse_as_dense=sparse_as_dense,
+            num_workers=num_workers,
+            num_conversion_workers=num_conversion_workers,
+            deterministic=deterministic,
+            worker_type=worker_type,
+            row_groups_per_part=row_groups_per_part,
+            cache_batches=cache_batches,
+            cache_max_bytes=cache_max_bytes,
+            cache_spill_dir=cache_spill_dir,
+            adaptive_chunking=adaptive_chunking,
+            max_parts_per_chunk=max_parts_per_chunk,
+            chunk_memory_cap=chunk_memory_cap,
         )
 
     def __iter__(self):
@@ -109,8 +160,8 @@ class Dataset(torch.utils.data.IterableDataset, DataLoader):
                 and dlpack.values.shape[1] == 1
                 and isinstance(dlpack.values[0], np.ndarray)
             ):
-                return torch.squeeze(torch.Tensor(dlpack.values))
-            return torch.Tensor(dlpack.values)
+                return torch.squeeze(_from_numpy(dlpack.values))
+            return _from_numpy(dlpack.values)
         return from_dlpack(dlpack)
 
     def _to_tensor(self, gdf, dtype=None):
@@ -118,6 +169,47 @@ class Dataset(torch.utils.data.IterableDataset, DataLoader):
         tensor = self._unpack(dl_pack)
         return tensor.type(dtype)
 
+    def _to_column_tensors(self, gdf, columns, dtype=None):
+        if not isinstance(gdf, pd.DataFrame):
+            return None
+        arrays = [gdf[column].to_numpy() for column in columns]
+        if any(array.dtype.hasobject for array in arrays):
+            return None
+        tensors = [_from_numpy(array).type(dtype) for array in arrays]
+        if len(tensors) > 1:
+            # same shapes as splitting a (rows, columns) tensor
+            tensors = [tensor.unsqueeze(-1) for tensor in tensors]
+        return tensors
+
+    def _from_array(self, array, dtype=None):
+        # shares the memory of `array`, unless a cast to `dtype` is needed
+        tensor = torch.from_numpy(array)
+        return tensor.type(dtype) if dtype is not None else tensor
+
+    def _rows_to_list(self, tensor, rows):
+        return tensor[rows].tolist()
+
+    def _batch_nbytes(self, batch):
+        nbytes = []
+        _map_tensors(batch, lambda tensor: nbytes.append(tensor.element_size() * tensor.nelement()))
+        return sum(nbytes)
+
+    def _batch_to_arrays(self, batch):
+        arrays = []
+
+        def to_array(tensor):
+            if tensor.is_sparse:
+                raise NotImplementedError("Sparse tensors can't be spilled to disk")
+            arrays.append(tensor.cpu().numpy())
+            return _TENSOR
+
+        return _map_tensors(batch, to_array), arrays
+
+    def _batch_from_arrays(self, structure, arrays):
+        device = "cpu" if self.device == "cpu" else f"cuda:{self.device}"
+        tensors = iter(_from_numpy(array).to(device) for array in arrays)
+        return _map_tensors(structure, lambda _: next(tensors), is_tensor=lambda x: x is _TENSOR)
+
     def _split_fn(self, tensor, idx, axis=0):
         return torch.split(tensor, idx, dim=axis)
 
@@ -172,3 +264,34 @@ class Dataset(torch.utils.data.IterableDataset, DataLoader):
     def _build_sparse_tensor(self, values, offsets, diff_offsets, num_rows, seq_limit):
         indices = self._get_indices(offsets, diff_offsets)
         return self._get_sparse_tensor(values, indices, num_rows, seq_limit)
+
+
+def _from_numpy(values):
+    """Creates a tensor sharing the memory of `values` when possible,
+    instead of the float32 copy made by `torch.Tensor(values)`."""
+    if values.dtype.hasobject:
+        return torch.Tensor(values)
+    values = np.ascontiguousarray(values)
+    with warnings.catch_warnings():
+        # the loader never writes to its tensors, read-only buffers are fine
+        warnings.simplefilter("ignore", UserWarning)
+        try:
+            return torch.from_numpy(values)
+        except TypeError:
+            # dtype not supported by torch (e.g. uint32)
+            return torch.Tensor(values)
+
+
+# placeholder of the tensors in the structure of a batch spilled to disk
+_TENSOR = object()
+
+
+def _map_tensors(value, fn, is_tensor=torch.is_tensor):
+    """Applies `fn` to the tensors of a batch (nested dicts, tuples and lists)."""
+    if is_tensor(value):
+        return fn(value)
+    if isinstance(value, dict):
+        return {key: _map_tensors(val, fn, is_tensor) for key, val in value.items()}
+    if isinstance(value, (list, tuple)):
+        return type(value)(_map_tensors(val, fn, is_tensor) for val in value)
+    return value
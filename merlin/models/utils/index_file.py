@@ -0,0 +1,121 @@
+#
+# Copyright (c) 2021, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+"""Binary format of an index of embeddings, memory-mappable with `np.memmap`.
+
+The file holds a header, the ids of the rows and the row-major float32 matrix of
+their embeddings. The header is made of a magic string, the size of the header as a
+little-endian uint32 and a JSON object (`version`, `num_rows`, `dim` and the
+`ids_dtype` and `values_dtype` in NumPy's notation), padded with spaces. The ids and the
+matrix start at multiples of 64 bytes, the ids right after the header.
+"""
+
+import json
+import struct
+
+import numpy as np
+
+MAGIC = b"\x93MERLINIDX"
+VERSION = 1
+_ALIGNMENT = 64
+_VALUES_DTYPE = np.dtype("<f4")
+
+
+def write_index(path, ids, values, chunk_size: int = 65536):
+    """Writes the `ids` and 2D `values` of an index to `path`.
+
+    Parameters
+    -----------
+    path: str
+        Path of the file
+    ids: array-like
+        Integer or fixed-width bytes ids
+    values: array-like
+        The embeddings, one row per id, converted to float32
+    chunk_size: int
+        Number of rows of `values` converted and written at a time
+    """
+    ids = np.ascontiguousarray(ids)
+    if ids.dtype.kind not in "iuS":
+        raise ValueError(f"Only integer or fixed-width bytes ids are supported, got {ids.dtype}")
+    if len(values.shape) != 2 or values.shape[0] != ids.shape[0]:
+        raise ValueError(
+            f"`values` must be 2D with one row per id, got {values.shape} for {ids.shape[0]} ids"
+        )
+    ids = ids.astype(ids.dtype.newbyteorder("<"), copy=False)
+    num_rows, dim = int(values.shape[0]), int(values.shape[1])
+    header = json.dumps(
+        {
+            "version": VERSION,
+            "num_rows": num_rows,
+            "dim": dim,
+            "ids_dtype": ids.dtype.str,
+            "values_dtype": _VALUES_DTYPE.str,
+        }
+    ).encode()
+    header_size = _aligned(len(MAGIC) + 4 + len(header))
+    header = header.ljust(header_size - len(MAGIC) - 4)
+
+    with open(path, "wb") as f:
+        f.write(MAGIC)
+        f.write(struct.pack("<I", header_size))
+        f.write(header)
+        ids.tofile(f)
+        f.write(b"\0" * (_aligned(f.tell()) - f.tell()))
+        for start in range(0, num_rows, chunk_size):
+            chunk = np.asarray(values[start : start + chunk_size], dtype=_VALUES_DTYPE)
+            np.ascontiguousarray(chunk).tofile(f)
+
+
+def read_index(path, mmap_mode: str = "r"):
+    """Maps the ids and values of an index written by `write_index`.
+
+    Parameters
+    -----------
+    path: str
+        Path of the file
+    mmap_mode: str
+        Mode of `np.memmap`. With the default, read-only mode, the pages of the
+        file are shared by all the processes mapping it
+
+    Returns
+    -------
+    ids, values: np.ndarray, np.ndarray
+        The ids and 2D values, memory-mapped
+    """
+    with open(path, "rb") as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{path} is not an index file")
+        (header_size,) = struct.unpack("<I", f.read(4))
+        header = json.loads(f.read(header_size - len(MAGIC) - 4))
+    if header["version"] > VERSION:
+        raise ValueError(f"Unsupported version {header['version']} of index file {path}")
+
+    num_rows, dim = header["num_rows"], header["dim"]
+    ids_dtype = np.dtype(header["ids_dtype"])
+    values_dtype = np.dtype(header["values_dtype"])
+    if num_rows == 0:
+        return np.zeros((0,), dtype=ids_dtype), np.zeros((0, dim), dtype=values_dtype)
+
+    values_offset = _aligned(header_size + num_rows * ids_dtype.itemsize)
+    ids = np.memmap(path, dtype=ids_dtype, mode=mmap_mode, offset=header_size, shape=(num_rows,))
+    values = np.memmap(
+        path, dtype=values_dtype, mode=mmap_mode, offset=values_offset, shape=(num_rows, dim)
+    )
+    return ids, values
+
+
+def _aligned(nbytes):
+    return -(-nbytes // _ALIGNMENT) * _ALIGNMENT
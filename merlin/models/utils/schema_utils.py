@@ -15,7 +15,7 @@
 #
 import math
 import os
-from typing import Dict, Optional
+from typing import Dict, Optional, Tuple
 
 import numpy as np
 
@@ -205,3 +205,97 @@ def get_embedding_size_from_cardinality(
         embedding_size = int(math.ceil((embedding_size / 8)) * 8)
 
     return embedding_size
+
+
+def categorical_frequencies(
+    col_schema: ColumnSchema, categories_dir: Optional[str] = None
+) -> Optional[np.ndarray]:
+    """Number of occurrences of each encoded id of a categorical column, read
+    from the unique values written by NVTabular's `Categorify` (the `cat_path`
+    property of the column).
+
+    Parameters
+    ----------
+    col_schema : ColumnSchema
+        Schema of the categorical column
+    categories_dir : str, optional
+        Directory the relative `cat_path` is resolved from, usually the output
+        directory of the NVTabular workflow, by default the current directory
+
+    Returns
+    -------
+    Optional[np.ndarray]
+        The counts indexed by encoded id, or None if the column has no `cat_path`
+    """
+    cat_path = col_schema.properties.get("cat_path")
+    if not cat_path:
+        return None
+    if categories_dir and not os.path.isabs(cat_path):
+        cat_path = os.path.join(categories_dir, cat_path)
+
+    import pandas as pd
+
+    uniques = pd.read_parquet(cat_path)
+    size_columns = [col for col in uniques.columns if str(col).endswith("_size")]
+    if not size_columns:
+        return None
+    counts = uniques[size_columns[0]].fillna(0).to_numpy(dtype=np.int64)
+    start_index = int(col_schema.properties.get("start_index") or 0)
+
+    return np.concatenate([np.zeros(start_index, dtype=np.int64), counts])
+
+
+def get_mixed_embedding_split(
+    frequencies: np.ndarray,
+    dim: int,
+    head_coverage: float = 0.9,
+    alpha: float = 0.25,
+    ensure_multiple_of_8: bool = False,
+) -> Tuple[int, int]:
+    """Splits the ids of a categorical feature into a head of frequent ids,
+    embedded with `dim` dimensions, and a tail embedded with fewer dimensions.
+
+    The head is the smallest prefix of ids that covers `head_coverage` of the
+    occurrences (NVTabular's `Categorify` encodes the ids by decreasing
+    frequency). Following [1], the dimension of the tail is scaled by its
+    popularity relative to the head: `dim * (tail_mean / head_mean) ** alpha`.
+
+    Parameters
+    ----------
+    frequencies : np.ndarray
+        Number of occurrences of each id, e.g. from `categorical_frequencies`
+    dim : int
+        Dimension of the head embeddings
+    head_coverage : float, optional
+        Fraction of the occurrences covered by the head, by default 0.9
+    alpha : float, optional
+        Exponent of the relative popularity of the tail, by default 0.25
+    ensure_multiple_of_8 : bool, optional
+        If enabled, rounds up the tail dimension to a multiple of 8, by default False
+
+    Returns
+    -------
+    Tuple[int, int]
+        The number of head ids and the dimension of the tail embeddings
+
+    References
+    ----------
+    .. [1] Ginart, Antonio A., et al. "Mixed dimension embeddings with application to
+       memory-efficient recommendation systems." ISIT 2021.
+    """
+    frequencies = np.asarray(frequencies, dtype=np.float64)
+    cumulative = np.cumsum(frequencies)
+    if len(frequencies) == 0 or cumulative[-1] == 0:
+        return len(frequencies), dim
+    num_hot = int(np.searchsorted(cumulative, head_coverage * cumulative[-1]) + 1)
+    num_hot = min(num_hot, len(frequencies))
+    if num_hot == len(frequencies):
+        return num_hot, dim
+
+    head_mean = cumulative[num_hot - 1] / num_hot
+    tail_mean = (cumulative[-1] - cumulative[num_hot - 1]) / (len(frequencies) - num_hot)
+    tail_dim = int(math.ceil(dim * math.pow(tail_mean / head_mean, alpha)))
+    if ensure_multiple_of_8:
+        tail_dim = int(math.ceil(tail_dim / 8) * 8)
+
+    return num_hot, max(1, min(tail_dim, dim))
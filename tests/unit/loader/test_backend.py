@@ -0,0 +1,79 @@
+#
+# Copyright (c) 2021, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import threading
+import time
+
+from merlin.models.loader.backend import AdaptiveChunkController, ChunkQueue
+
+
+def test_controller_grows_when_consumer_waits():
+    controller = AdaptiveChunkController(num_parts=1, qsize=1, max_parts=3, max_qsize=2)
+    controller.record_get(0.0)
+    for _ in range(10):
+        controller.record_chunk(1000, 1000, controller.num_parts, 0.01, 0.0)
+        time.sleep(0.001)
+        controller.record_get(0.05)
+
+    assert controller.num_parts == 3
+    assert controller.qsize == 2
+    metrics = controller.metrics
+    assert metrics["decisions"][0] == {"num_parts": 2, "qsize": 1, "reason": "consumer waiting"}
+    assert metrics["producer_rows_per_sec"] > 0
+    assert metrics["consumer_wait_fraction"] > controller.wait_threshold
+
+
+def test_controller_shrinks_when_producer_waits():
+    controller = AdaptiveChunkController(num_parts=2, qsize=3, max_qsize=3)
+    for _ in range(10):
+        controller.record_chunk(1000, 1000, controller.num_parts, 0.01, 0.1)
+
+    assert controller.qsize == 1
+    assert controller.num_parts == 2
+    assert controller.metrics["decisions"][-1]["reason"] == "producer waiting"
+
+
+def test_controller_memory_cap():
+    controller = AdaptiveChunkController(num_parts=1, qsize=1, max_parts=8, memory_cap=4000)
+    controller.record_get(0.0)
+    for _ in range(10):
+        controller.record_chunk(1000, 1000, controller.num_parts, 0.01, 0.0)
+        controller.record_get(0.05)
+
+    # 1000 bytes per part, (qsize + 1) chunks in memory
+    assert (controller.num_parts, controller.qsize) == (2, 1)
+    assert controller.num_parts * (controller.qsize + 1) * 1000 <= 4000
+    assert controller.metrics["estimated_bytes"] <= 4000
+
+
+class _Loader:
+    def _data_iter(self, epochs):
+        return []
+
+
+def test_stop_wakes_up_blocked_put():
+    chunk_queue = ChunkQueue(_Loader(), 1, put_wait=10)
+    chunk_queue.put("chunk")
+
+    results = []
+    thread = threading.Thread(target=lambda: results.append(chunk_queue.put("next")))
+    thread.start()
+    time.sleep(0.05)
+    start = time.perf_counter()
+    chunk_queue.stop()
+    thread.join(timeout=5)
+
+    assert not thread.is_alive()
+    assert time.perf_counter() - start < 5
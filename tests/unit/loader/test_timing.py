@@ -0,0 +1,51 @@
+#
+# Copyright (c) 2021, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import pytest
+
+from merlin.models.loader.timing import StageTimer
+
+
+def test_stage_timer():
+    timer = StageTimer()
+    timer.record("batch", 2.0, num_rows=100, nbytes=800)
+    timer.record("batch", 2.0, num_rows=100, nbytes=800)
+    with timer.time("_handle_tensors", num_rows=10):
+        pass
+
+    metrics = timer.metrics
+    assert list(metrics) == ["batch", "_handle_tensors"]
+    assert metrics["batch"] == {
+        "calls": 2,
+        "seconds": 4.0,
+        "rows": 200,
+        "bytes": 1600,
+        "rows_per_sec": 50.0,
+        "bytes_per_sec": 400.0,
+    }
+    assert metrics["_handle_tensors"]["calls"] == 1
+    assert metrics["_handle_tensors"]["seconds"] >= 0
+
+    timer.reset()
+    assert timer.metrics == {}
+
+
+def test_stage_timer_records_failures():
+    timer = StageTimer()
+    with pytest.raises(ValueError):
+        with timer.time("make_tensors", num_rows=1):
+            raise ValueError
+
+    assert timer.metrics["make_tensors"]["calls"] == 1
@@ -416,6 +416,61 @@ def test_lazy_adam_sparse_repeated_indices(dtype):
             )
 
 
+@pytest.mark.parametrize("dtype", [tf.half, tf.bfloat16])
+def test_lazy_adam_sparse_reduced_precision(dtype):
+    var_np = np.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]], dtype=np.float32)
+    grads_np = np.array([[1e-4, 1e-4], [1e-5, 1e-5]], dtype=np.float32)
+    indices = tf.constant([0, 2])
+
+    var = tf.Variable(tf.cast(var_np, dtype))
+    var_fp32 = tf.Variable(var_np)
+    opt, opt_fp32 = ml.LazyAdam(0.1), ml.LazyAdam(0.1)
+    for _ in range(3):
+        grads = tf.IndexedSlices(tf.cast(grads_np, dtype), indices, tf.constant([3, 2]))
+        opt.apply_gradients([(grads, var)])
+        grads_fp32 = tf.IndexedSlices(tf.constant(grads_np), indices, tf.constant([3, 2]))
+        opt_fp32.apply_gradients([(grads_fp32, var_fp32)])
+
+    # the tiny squared gradients would underflow in float16
+    assert opt.get_slot(var, "v").dtype == tf.float32
+    assert np.all(opt.get_slot(var, "v").numpy()[[0, 2]] > 0)
+    np.testing.assert_allclose(
+        tf.cast(var, tf.float32).numpy(), var_fp32.numpy(), rtol=1e-2, atol=1e-2
+    )
+
+
+@pytest.mark.parametrize("dtype", [tf.half, tf.bfloat16])
+def test_lazy_adam_dense_and_sparse_reduced_precision(dtype):
+    var_np = np.array([[1.0, 2.0], [3.0, 4.0], [5.0, 6.0]], dtype=np.float32)
+    dense_grads_np = np.array([[0.1, 0.2], [0.3, 0.4], [0.5, 0.6]], dtype=np.float32)
+    sparse_grads_np = np.array([[0.25, 0.5], [0.75, 1.0]], dtype=np.float32)
+    indices = tf.constant([0, 2])
+
+    var = tf.Variable(tf.cast(var_np, dtype))
+    var_fp32 = tf.Variable(var_np)
+    opt, opt_fp32 = ml.LazyAdam(0.1), ml.LazyAdam(0.1)
+    for step in range(4):
+        for v, o, cast in [(var, opt, dtype), (var_fp32, opt_fp32, tf.float32)]:
+            if step % 2:
+                grads = tf.IndexedSlices(
+                    tf.cast(sparse_grads_np, cast), indices, tf.constant([3, 2])
+                )
+            else:
+                grads = tf.cast(dense_grads_np, cast)
+            o.apply_gradients([(grads, v)])
+
+    # both paths update the same (float32) first and second moments
+    for slot_name in ["m", "v"]:
+        slot = opt.get_slot(var, slot_name)
+        assert slot.dtype == tf.float32
+        np.testing.assert_allclose(
+            slot.numpy(), opt_fp32.get_slot(var_fp32, slot_name).numpy(), rtol=1e-2
+        )
+    np.testing.assert_allclose(
+        tf.cast(var, tf.float32).numpy(), var_fp32.numpy(), rtol=1e-2, atol=1e-2
+    )
+
+
 @pytest.mark.parametrize("use_callable_params", [True, False])
 @pytest.mark.parametrize("dtype", [tf.half, tf.float32, tf.float64])
 def test_lazy_adam_callable_lr(use_callable_params, dtype):
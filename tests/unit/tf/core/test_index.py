@@ -132,3 +132,410 @@ def test_topk_recommender_outputs(ecommerce_data: Dataset, batch_size=100):
     recall_at_10 = numpy_recall(positive_item_ids, topk_items, k=10)
 
     np.isclose(recall_at_10, eval_metrics["recall_at_10"], rtol=1e-6)
+
+
+def test_encode_candidates(ecommerce_data: Dataset):
+    import numpy as np
+
+    from merlin.models.tf.core.index import IndexBlock
+    from merlin.models.tf.utils.batch_utils import TFModelEncode
+    from merlin.models.utils.dataset import unique_rows_by_features
+
+    model = mm.TwoTowerModel(ecommerce_data.schema, query_tower=mm.MLPBlock([64]))
+    model.compile("adam", run_eagerly=False)
+    model.fit(ecommerce_data, batch_size=50, epochs=1)
+    item_block = model.retrieval_block.item_block()
+
+    item_dataset = unique_rows_by_features(ecommerce_data, Tags.ITEM, Tags.ITEM_ID)
+    item_dataset = Dataset(item_dataset.to_ddf().repartition(npartitions=4))
+    ids, values = IndexBlock.encode_candidates(
+        item_block, item_dataset, batch_size=32, num_workers=3
+    )
+
+    # same embeddings, in the same order, as encoding a saved copy of the block
+    model_encode = TFModelEncode(model=item_block, output_concat_func=np.concatenate)
+    expected = (
+        item_dataset.to_ddf()
+        .map_partitions(model_encode, filter_input_columns=["item_id"])
+        .compute(scheduler="synchronous")
+    )
+    np.testing.assert_array_equal(ids, expected["item_id"].to_numpy())
+    np.testing.assert_allclose(values, expected.drop(columns="item_id").to_numpy(), atol=1e-5)
+
+    # reading partitions ahead doesn't change the order of the candidates
+    ids_1, values_1 = IndexBlock.encode_candidates(
+        item_block, item_dataset, batch_size=32, num_workers=1
+    )
+    np.testing.assert_array_equal(ids_1, ids)
+    np.testing.assert_array_equal(values_1, values)
+
+    index = mm.TopKIndexBlock.from_block(item_block, item_dataset, k=10)
+    assert index.values.shape == values.shape
+
+
+@pytest.mark.parametrize("tile_size", [7, 50, 1000])
+@pytest.mark.parametrize("run_eagerly", [True, False])
+def test_topk_index_tiled(tile_size, run_eagerly):
+    import tensorflow as tf
+
+    from merlin.models.tf.core.index import TopKIndexBlock
+
+    values = tf.random.uniform((100, 16))
+    ids = tf.range(1000, 1100, dtype=tf.int64)
+    queries = tf.random.uniform((8, 16))
+
+    index = TopKIndexBlock(k=10, values=values, ids=ids)
+    tiled_index = TopKIndexBlock(k=10, values=values, ids=ids, tile_size=tile_size)
+    call = tiled_index if run_eagerly else tf.function(tiled_index)
+
+    expected_scores, expected_ids = index(queries)
+    top_scores, top_ids = call(queries)
+    tf.debugging.assert_near(top_scores, expected_scores)
+    tf.debugging.assert_equal(top_ids, expected_ids)
+
+    top_scores, top_ids = call(queries, k=3)
+    assert top_ids.shape == (8, 3)
+    tf.debugging.assert_equal(top_ids, expected_ids[:, :3])
+
+
+@pytest.mark.parametrize("tile_size", [None, 7])
+@pytest.mark.parametrize("run_eagerly", [True, False])
+def test_topk_index_exclusions(tile_size, run_eagerly):
+    import numpy as np
+    import tensorflow as tf
+
+    from merlin.models.tf.core.index import TopKIndexBlock
+
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(100, 16)).astype(np.float32)
+    ids = np.arange(1000, 1100, dtype=np.int64)
+    queries = rng.normal(size=(4, 16)).astype(np.float32)
+    scores = queries @ values.T
+
+    index = TopKIndexBlock(k=10, values=values, ids=ids, tile_size=tile_size)
+    call = index if run_eagerly else tf.function(index)
+
+    # the current top-5 of each query (plus an unknown id) are excluded
+    top_ids = np.asarray(index(queries)[1])
+    exclude_ids = tf.ragged.constant(
+        [list(top_ids[0, :5]) + [5], [], list(top_ids[2, :2]), list(top_ids[3, :5])],
+        dtype=tf.int64,
+    )
+    item_mask = np.ones(100, dtype=bool)
+    item_mask[::2] = False
+    index.delete([1001])
+
+    top_scores, top_ids = call(queries, exclude_ids=exclude_ids, item_mask=item_mask)
+    for query, excluded in enumerate(exclude_ids.to_list()):
+        allowed = item_mask & ~np.isin(ids, excluded + [1001])
+        expected = np.argsort(-np.where(allowed, scores[query], -np.inf), kind="stable")[:10]
+        np.testing.assert_array_equal(top_ids[query], ids[expected])
+        np.testing.assert_allclose(top_scores[query], scores[query, expected], rtol=1e-5)
+
+    # ids excluded for all the queries
+    _, top_ids = call(queries, exclude_ids=tf.constant(ids[:90]))
+    assert set(np.asarray(top_ids).ravel()) <= set(ids[90:])
+
+    # from the features of the queries
+    index.exclude_column = "history"
+    _, top_ids = index(queries, features={"history": exclude_ids})
+    assert not set(np.asarray(top_ids[0])) & set(exclude_ids[0].numpy())
+
+
+@pytest.mark.parametrize("num_shards", [1, 3, 7])
+@pytest.mark.parametrize("run_eagerly", [True, False])
+def test_sharded_topk_index(num_shards, run_eagerly):
+    import tensorflow as tf
+
+    from merlin.models.tf.core.index import ShardedTopKIndexBlock, TopKIndexBlock
+
+    values = tf.random.uniform((100, 16))
+    ids = tf.range(1000, 1100, dtype=tf.int64)
+    queries = tf.random.uniform((8, 16))
+    exclude_ids = tf.ragged.constant([[1000, 1050]] * 4 + [[]] * 4, dtype=tf.int64)
+
+    index = TopKIndexBlock(k=10, values=values, ids=ids)
+    sharded_index = ShardedTopKIndexBlock(k=10, values=values, ids=ids, num_shards=num_shards)
+    index.delete([1010])
+    sharded_index.delete([1010])
+    call = sharded_index if run_eagerly else tf.function(sharded_index)
+
+    expected_scores, expected_ids = index(queries, exclude_ids=exclude_ids)
+    top_scores, top_ids = call(queries, exclude_ids=exclude_ids)
+    tf.debugging.assert_near(top_scores, expected_scores)
+    tf.debugging.assert_equal(top_ids, expected_ids)
+
+    # shards can hold fewer than k candidates
+    sharded_index.update(values[:12], ids[:12])
+    index.update(values[:12], ids[:12])
+    tf.debugging.assert_equal(call(queries, k=11)[1], index(queries, k=11)[1])
+
+
+def test_sharded_topk_index_bounds():
+    import numpy as np
+    import tensorflow as tf
+
+    from merlin.models.tf.core.index import ShardedTopKIndexBlock
+
+    # num_rows * num_shards overflows int32
+    num_rows, num_shards = 40_000_003, 64
+    bounds = ShardedTopKIndexBlock._shard_bounds(tf.constant(num_rows), num_shards)
+    bounds = np.array([int(bound) for bound in bounds])
+
+    assert bounds[0] == 0 and bounds[-1] == num_rows
+    sizes = np.diff(bounds)
+    assert sizes.min() >= num_rows // num_shards and sizes.max() - sizes.min() <= 1
+
+
+def test_ivf_flat_index():
+    import numpy as np
+    import tensorflow as tf
+
+    from merlin.models.tf.core.index import IVFFlatIndexBlock, TopKIndexBlock
+
+    rng = np.random.default_rng(0)
+    centers = rng.normal(size=(20, 16)) * 5
+    values = (centers[rng.integers(0, 20, 2000)] + rng.normal(size=(2000, 16))).astype(np.float32)
+    queries = tf.constant(rng.normal(size=(32, 16)), dtype=tf.float32)
+    ids = tf.range(2000, dtype=tf.int64) * 2
+
+    exact_scores, exact_ids = TopKIndexBlock(k=10, values=values, ids=ids)(queries)
+    index = IVFFlatIndexBlock(k=10, values=values, ids=ids, num_lists=20, num_probes=4, seed=0)
+    assert index.centroids.shape == (20, 16)
+    assert int(index.list_offsets[-1]) == 2000
+
+    _, top_ids = index(queries)
+    recall = np.mean(
+        [len(set(a) & set(b)) / 10 for a, b in zip(top_ids.numpy(), exact_ids.numpy())]
+    )
+    assert recall > 0.8
+
+    # probing every list is exact
+    index.num_probes = 20
+    top_scores, top_ids = index(queries)
+    tf.debugging.assert_near(top_scores, exact_scores)
+    tf.debugging.assert_equal(top_ids, exact_ids)
+
+    # the lists are rebuilt on update
+    index.update(values[:100], ids[:100])
+    assert int(index.list_offsets[-1]) == 100
+    _, top_ids = index(queries, k=5)
+    assert top_ids.shape == (32, 5)
+
+
+def test_ivf_flat_index_recommender(ecommerce_data: Dataset):
+    model: mm.RetrievalModel = mm.TwoTowerModel(
+        ecommerce_data.schema, query_tower=mm.MLPBlock([64, 128])
+    )
+    model.compile(run_eagerly=False, optimizer="adam")
+    model.fit(ecommerce_data, epochs=1, batch_size=50)
+
+    item_features = ecommerce_data.schema.select_by_tag(Tags.ITEM).column_names
+    item_dataset = Dataset(ecommerce_data.to_ddf()[item_features].drop_duplicates().compute())
+    recommender = model.to_top_k_recommender(
+        item_dataset, k=10, index_cls=mm.IVFFlatIndexBlock, num_lists=8, num_probes=2
+    )
+    assert isinstance(recommender.block.layers[-1], mm.IVFFlatIndexBlock)
+
+    batch = mm.sample_batch(ecommerce_data, batch_size=10, include_targets=False)
+    _, top_ids = recommender(batch)
+    assert top_ids.shape == (10, 10)
+
+
+def _recall(top_ids, expected_ids):
+    import numpy as np
+
+    return np.mean(
+        [len(set(a) & set(b)) / len(b) for a, b in zip(top_ids.numpy(), expected_ids.numpy())]
+    )
+
+
+@pytest.mark.parametrize("quantization", ["int8", "pq"])
+def test_quantized_index(quantization):
+    import numpy as np
+    import tensorflow as tf
+
+    from merlin.models.tf.core.index import QuantizedIndexBlock, TopKIndexBlock
+
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(3000, 32)).astype(np.float32)
+    queries = tf.constant(rng.normal(size=(16, 32)), dtype=tf.float32)
+    ids = tf.range(3000, dtype=tf.int64) + 7
+
+    exact_scores, exact_ids = TopKIndexBlock(k=10, values=values, ids=ids)(queries)
+    index = QuantizedIndexBlock(
+        k=10, values=values, ids=ids, quantization=quantization, tile_size=1000, seed=0
+    )
+    assert index.values.shape[0] == 0
+    assert index.codes.dtype == (tf.int8 if quantization == "int8" else tf.uint8)
+
+    _, top_ids = index(queries)
+    assert _recall(top_ids, exact_ids) > (0.9 if quantization == "int8" else 0.3)
+
+    reranked = QuantizedIndexBlock(
+        k=10,
+        values=values,
+        ids=ids,
+        quantization=quantization,
+        rerank_size=200,
+        tile_size=1000,
+        seed=0,
+    )
+    top_scores, top_ids = reranked(queries)
+    assert _recall(top_ids, exact_ids) > 0.9
+    # the scores of the re-ranked candidates are exact
+    found = tf.reduce_all(top_ids == exact_ids, axis=1)
+    tf.debugging.assert_near(
+        tf.boolean_mask(top_scores, found), tf.boolean_mask(exact_scores, found)
+    )
+
+    reranked.update(values[:500], ids[:500])
+    assert reranked.codes.shape[0] == 500
+    _, top_ids = reranked(queries, k=5)
+    assert top_ids.shape == (16, 5)
+    assert np.all(top_ids.numpy() < 507)
+
+
+def test_quantized_index_errors():
+    import numpy as np
+
+    from merlin.models.tf.core.index import QuantizedIndexBlock
+
+    values = np.ones((10, 6), dtype=np.float32)
+    with pytest.raises(ValueError):
+        QuantizedIndexBlock(k=2, values=values, quantization="float16")
+    with pytest.raises(ValueError):
+        QuantizedIndexBlock(k=2, values=values, quantization="pq", num_subspaces=4)
+
+
+def test_quantized_index_evaluate(ecommerce_data: Dataset):
+    from merlin.models.utils.dataset import unique_rows_by_features
+
+    model: mm.RetrievalModel = mm.TwoTowerModel(
+        ecommerce_data.schema, query_tower=mm.MLPBlock([64]), samplers=[mm.InBatchSampler()]
+    )
+    model.compile("adam", metrics=[mm.RecallAt(10)], run_eagerly=False)
+    model.fit(ecommerce_data, batch_size=50, epochs=1)
+
+    item_dataset = unique_rows_by_features(ecommerce_data, Tags.ITEM, Tags.ITEM_ID)
+    index = mm.QuantizedIndexBlock.from_block(
+        model.retrieval_block.item_block(),
+        data=item_dataset,
+        k=10,
+        id_column="item_id",
+        rerank_size=50,
+    )
+    exact_metrics = model.evaluate(
+        ecommerce_data, item_corpus=ecommerce_data, batch_size=50, return_dict=True
+    )
+    metrics = model.evaluate(ecommerce_data, item_corpus=index, batch_size=50, return_dict=True)
+    assert abs(metrics["recall_at_10"] - exact_metrics["recall_at_10"]) < 0.1
+
+
+@pytest.mark.parametrize(
+    "index_cls,kwargs",
+    [
+        ("TopKIndexBlock", {}),
+        ("TopKIndexBlock", {"tile_size": 7}),
+        ("IVFFlatIndexBlock", {"num_lists": 4, "num_probes": 4}),
+        ("QuantizedIndexBlock", {"rerank_size": 20, "tile_size": 16}),
+    ],
+)
+def test_index_upsert_delete(index_cls, kwargs):
+    import numpy as np
+    import tensorflow as tf
+
+    from merlin.models.tf.core import index as index_module
+
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(50, 8)).astype(np.float32)
+    ids = np.arange(100, 150, dtype=np.int64)
+    queries = tf.constant(rng.normal(size=(4, 8)), dtype=tf.float32)
+
+    def expected(values, ids, k=5):
+        scores = queries.numpy() @ values.T
+        return ids[np.argsort(-scores, axis=1, kind="stable")[:, :k]]
+
+    index = getattr(index_module, index_cls)(
+        k=5, values=values, ids=ids, compaction_threshold=0.5, **kwargs
+    )
+
+    # changed and new candidates
+    new_values = rng.normal(size=(6, 8)).astype(np.float32)
+    new_ids = np.array([100, 101, 102, 200, 201, 202], dtype=np.int64)
+    index.upsert(new_ids, new_values)
+    all_values = np.concatenate([new_values[:3], values[3:], new_values[3:]])
+    all_ids = np.concatenate([ids, new_ids[3:]])
+    assert index.ids.shape[0] == 53
+    np.testing.assert_array_equal(index(queries)[1].numpy(), expected(all_values, all_ids))
+
+    # deleted candidates are never retrieved, unknown ids are ignored
+    top_ids = index(queries)[1].numpy()
+    deleted = np.unique(top_ids[:, :2])
+    index.delete(np.concatenate([deleted, [999]]))
+    assert index.ids.shape[0] == 53
+    keep = ~np.isin(all_ids, deleted)
+    np.testing.assert_array_equal(
+        index(queries)[1].numpy(), expected(all_values[keep], all_ids[keep])
+    )
+
+    # a deleted candidate can be upserted again
+    index.upsert(deleted[:1], all_values[all_ids == deleted[0]])
+    keep |= all_ids == deleted[0]
+    np.testing.assert_array_equal(
+        index(queries)[1].numpy(), expected(all_values[keep], all_ids[keep])
+    )
+
+    # deleting more than `compaction_threshold` of the rows compacts the index
+    index.delete(all_ids[:40])
+    assert index.ids.shape[0] < 53
+    assert not np.any(index.tombstones.numpy())
+    remaining = index.ids.numpy()
+    assert not np.any(np.isin(remaining, all_ids[:40]))
+    assert index(queries, k=3)[1].shape == (4, 3)
+    assert np.all(np.isin(index(queries, k=3)[1].numpy(), remaining))
+
+    with pytest.raises(ValueError):
+        index.upsert([300, 300], values[:2])
+    with pytest.raises(ValueError):
+        index.upsert([300], values[:1, :4])
+
+
+def test_index_save_load(tmpdir):
+    import numpy as np
+    import tensorflow as tf
+
+    from merlin.models.tf.core.index import MemmapTopKIndexBlock, TopKIndexBlock
+
+    rng = np.random.default_rng(0)
+    values = rng.normal(size=(100, 8)).astype(np.float32)
+    ids = np.arange(100, dtype=np.int64) * 3
+    queries = tf.constant(rng.normal(size=(4, 8)), dtype=tf.float32)
+    path = str(tmpdir / "index.bin")
+
+    index = TopKIndexBlock(k=5, values=values, ids=ids)
+    index.delete(ids[:10])
+    index.save(path)
+    expected_scores, expected_ids = index(queries)
+
+    loaded = TopKIndexBlock.from_file(path, k=5)
+    assert loaded.values.shape[0] == 90
+    tf.debugging.assert_equal(loaded(queries)[1], expected_ids)
+
+    mapped = MemmapTopKIndexBlock(k=5, path=path, tile_size=16)
+    assert mapped.values.shape[0] == 0
+    top_scores, top_ids = mapped(queries)
+    tf.debugging.assert_near(top_scores, expected_scores)
+    tf.debugging.assert_equal(top_ids, expected_ids)
+    tf.debugging.assert_equal(tf.function(mapped)(queries)[1], expected_ids)
+
+    # deleted candidates are masked, but the file is read-only
+    mapped.delete(expected_ids[:, 0])
+    assert not np.any(np.isin(mapped(queries)[1].numpy(), expected_ids.numpy()[:, 0]))
+    with pytest.raises(NotImplementedError):
+        mapped.upsert(ids[:1], values[:1])
+
+    mapped.save(str(tmpdir / "compacted.bin"))
+    compacted = MemmapTopKIndexBlock(k=5, path=str(tmpdir / "compacted.bin"))
+    assert compacted.ids.shape[0] == 90 - len(np.unique(expected_ids.numpy()[:, 0]))
+    tf.debugging.assert_equal(compacted(queries)[1], mapped(queries)[1])
@@ -24,7 +24,7 @@ import merlin.models.tf as mm
 from merlin.io import Dataset
 from merlin.models.tf.utils import testing_utils
 from merlin.models.tf.utils.testing_utils import model_test
-from merlin.schema import ColumnSchema, Tags
+from merlin.schema import ColumnSchema, Schema, Tags
 
 
 def test_embedding_features(tf_cat_features):
@@ -186,6 +186,65 @@ class TestEmbeddingTable:
         np.testing.assert_array_almost_equal(output_before_fit, output_after_fit)
         np.testing.assert_array_almost_equal(embeddings_before_fit, embeddings_after_fit)
 
+    @pytest.mark.parametrize("storage_dtype", ["float16", "bfloat16"])
+    def test_storage_dtype(self, storage_dtype, music_streaming_data: Dataset):
+        item_id_col_schema = music_streaming_data.schema.select_by_name("item_id").first
+        embedding_layer = mm.EmbeddingTable(16, item_id_col_schema, storage_dtype=storage_dtype)
+
+        outputs = embedding_layer(tf.constant([[1], [2]]))
+        assert embedding_layer.table.embeddings.dtype == tf.as_dtype(storage_dtype)
+        assert outputs.dtype == tf.float32
+
+        model = mm.Model(
+            tf.keras.layers.Lambda(lambda inputs: inputs["item_id"]),
+            embedding_layer,
+            mm.BinaryClassificationTask("click"),
+        )
+        embeddings_before_fit = embedding_layer.table.embeddings.numpy()
+        model_test(model, music_streaming_data, optimizer=mm.LazyAdam())
+        assert embedding_layer.table.embeddings.dtype == tf.as_dtype(storage_dtype)
+        assert np.any(embedding_layer.table.embeddings.numpy() != embeddings_before_fit)
+
+    def test_int8_storage(self, music_streaming_data: Dataset):
+        vocab_size = music_streaming_data.schema.column_schemas["item_id"].int_domain.max + 1
+        weights = np.random.rand(vocab_size, 32).astype(np.float32) - 0.5
+
+        embedding_table = mm.EmbeddingTable.from_pretrained(
+            pd.DataFrame(weights), name="item_id", trainable=False, storage_dtype="int8"
+        )
+        outputs = embedding_table(tf.constant([[0], [3]]))
+
+        assert isinstance(embedding_table.table, mm.Int8Embedding)
+        assert embedding_table.table.codes.dtype == tf.int8
+        np.testing.assert_allclose(outputs.numpy(), weights[[0, 3]], atol=0.5 / 127)
+
+        with pytest.raises(ValueError) as exc_info:
+            mm.EmbeddingTable(32, self.sample_column_schema, storage_dtype="int8")
+        assert "can't be trained" in str(exc_info.value)
+
+    @pytest.mark.parametrize("ids", [[[1], [3], [1], [1]], [[1, 3, 1], [3, 3, 1]]])
+    def test_deduplicate_ids(self, ids):
+        embedding_layer = mm.EmbeddingTable(16, self.sample_column_schema)
+        dedup_layer = mm.EmbeddingTable(
+            16, self.sample_column_schema, table=embedding_layer.table, deduplicate_ids=True
+        )
+
+        with tf.GradientTape(persistent=True) as tape:
+            outputs = embedding_layer(tf.constant(ids))
+            dedup_outputs = dedup_layer(tf.constant(ids))
+        grad = tape.gradient(outputs, embedding_layer.table.embeddings)
+        dedup_grad = tape.gradient(dedup_outputs, embedding_layer.table.embeddings)
+
+        np.testing.assert_allclose(dedup_outputs.numpy(), outputs.numpy())
+        assert isinstance(dedup_grad, tf.IndexedSlices)
+        assert sorted(dedup_grad.indices.numpy().tolist()) == [1, 3]
+        np.testing.assert_allclose(
+            tf.convert_to_tensor(dedup_grad).numpy(), tf.convert_to_tensor(grad).numpy()
+        )
+
+        copy_layer = testing_utils.assert_serialization(dedup_layer)
+        assert copy_layer.deduplicate_ids
+
     @pytest.mark.parametrize("trainable", [True, False])
     def test_from_pretrained(self, trainable, music_streaming_data: Dataset):
         vocab_size = music_streaming_data.schema.column_schemas["item_id"].int_domain.max + 1
@@ -215,6 +274,149 @@ class TestEmbeddingTable:
             np.testing.assert_array_almost_equal(weights, embedding_table.table.embeddings)
 
 
+def test_embeddings_storage_dtypes(music_streaming_data: Dataset):
+    schema = music_streaming_data.schema.select_by_tag(Tags.CATEGORICAL)
+    embeddings = mm.Embeddings(
+        schema,
+        storage_dtypes={"item_id": "float16"},
+        storage_dtype="bfloat16",
+        table_types={"item_genres": "qr"},
+    )
+
+    assert embeddings["item_id"].table.dtype == "float16"
+    assert embeddings["item_category"].table.dtype == "bfloat16"
+    assert isinstance(embeddings["item_genres"].table, mm.QREmbedding)
+    assert embeddings["item_genres"].storage_dtype is None
+
+    with pytest.raises(ValueError) as exc_info:
+        mm.Embeddings(schema, storage_dtypes={"item_id": "int8"}, table_types={"item_id": "qr"})
+    assert "only full tables" in str(exc_info.value)
+
+
+@pytest.mark.parametrize(
+    "table_type", ["qr", {"type": "hashed", "num_buckets": 20, "num_hashes": 2}]
+)
+def test_compositional_embeddings(table_type, music_streaming_data: Dataset):
+    schema = music_streaming_data.schema
+    embeddings = mm.Embeddings(
+        schema.select_by_tag(Tags.CATEGORICAL),
+        table_types={"item_id": table_type, "item_genres": table_type},
+    )
+    table = embeddings["item_id"].table
+    vocab_size = schema["item_id"].int_domain.max + 1
+    assert isinstance(table, (mm.QREmbedding, mm.HashedEmbedding))
+    assert table.input_dim == vocab_size
+
+    model = mm.Model(
+        mm.InputBlockV2(schema, embeddings=embeddings),
+        mm.MLPBlock([4]),
+        mm.BinaryClassificationTask("click"),
+    )
+    testing_utils.model_test(model, music_streaming_data, optimizer=mm.LazyAdam())
+
+    num_rows = sum(weight.shape[0] for weight in table.weights)
+    assert num_rows < vocab_size
+    outputs = table(tf.ragged.constant([[0, 1], [2]]))
+    assert outputs.shape.as_list() == [2, None, table.output_dim]
+
+
+def test_qr_embedding_unique_rows():
+    table = mm.QREmbedding(100, 4, operation="add")
+    ids = tf.range(100)
+    outputs = table(ids)
+
+    assert table.num_remainders == 10
+    assert len({tuple(row) for row in outputs.numpy().tolist()}) == 100
+    copy_layer = mm.QREmbedding.from_config(table.get_config())
+    assert copy_layer.num_quotients == table.num_quotients
+
+
+def test_mixed_dimension_embedding(tmp_path):
+    frequencies = [0, 500, 300, 100] + [1] * 46
+    pd.DataFrame({"item_id_size": frequencies}).to_parquet(tmp_path / "unique.item_id.parquet")
+    col_schema = ColumnSchema(
+        "item_id",
+        dtype=np.int64,
+        tags=[Tags.CATEGORICAL],
+        properties={"domain": {"min": 0, "max": 49}, "cat_path": "unique.item_id.parquet"},
+    )
+
+    table = mm.MixedDimensionEmbedding.from_column_schema(
+        col_schema, 16, categories_dir=str(tmp_path)
+    )
+    outputs = table(tf.constant([[1, 30], [45, 2]]))
+
+    assert table.num_hot == 4
+    assert table.tail_dim < 16
+    assert outputs.shape.as_list() == [2, 2, 16]
+    np.testing.assert_allclose(outputs[0, 0], table.hot_embeddings[1], rtol=1e-6)
+    np.testing.assert_allclose(
+        outputs[1, 0], tf.matmul(table.tail_embeddings[41:42], table.tail_projection)[0], rtol=1e-5
+    )
+
+    copy_layer = mm.MixedDimensionEmbedding.from_config(table.get_config())
+    assert (copy_layer.num_hot, copy_layer.tail_dim) == (table.num_hot, table.tail_dim)
+
+
+def test_embedding_features_mixed_table_type(tmp_path):
+    frequencies = [0, 500, 300, 100] + [1] * 46
+    pd.DataFrame({"item_id_size": frequencies}).to_parquet(tmp_path / "unique.item_id.parquet")
+    schema = Schema(
+        [
+            ColumnSchema(
+                "item_id",
+                dtype=np.int64,
+                tags=[Tags.CATEGORICAL],
+                properties={"domain": {"min": 0, "max": 49}, "cat_path": "unique.item_id.parquet"},
+            ),
+            ColumnSchema(
+                "user_id",
+                dtype=np.int64,
+                tags=[Tags.CATEGORICAL],
+                properties={"domain": {"min": 0, "max": 9}},
+            ),
+        ]
+    )
+    table_type = {"type": "mixed", "categories_dir": str(tmp_path)}
+
+    emb_module = mm.EmbeddingFeatures.from_schema(
+        schema,
+        embedding_options=mm.EmbeddingOptions(
+            embedding_dim_default=16,
+            infer_embedding_sizes=False,
+            table_types={"item_id": table_type},
+        ),
+    )
+    embeddings = emb_module(
+        {"item_id": tf.constant([[1], [30]]), "user_id": tf.constant([[2], [3]])}
+    )
+
+    table = emb_module.embedding_tables["item_id"]
+    assert isinstance(table, mm.MixedDimensionEmbedding)
+    # split from the frequencies of the column, as through `Embeddings`
+    expected = mm.MixedDimensionEmbedding.from_column_schema(
+        schema["item_id"], 16, categories_dir=str(tmp_path)
+    )
+    assert (table.num_hot, table.tail_dim) == (expected.num_hot, expected.tail_dim)
+    assert embeddings["item_id"].shape.as_list() == [2, 16]
+
+
+def test_embedding_features_table_types(testing_data: Dataset):
+    schema = testing_data.schema.select_by_tag(Tags.CATEGORICAL)
+    emb_module = mm.EmbeddingFeatures.from_schema(
+        schema,
+        embedding_options=mm.EmbeddingOptions(
+            table_types={"item_id": "qr", "categories": "hashed"}, fuse_tables=True
+        ),
+    )
+    embeddings = emb_module(mm.sample_batch(testing_data, batch_size=100, include_targets=False))
+
+    assert isinstance(emb_module.embedding_tables["item_id"], mm.QREmbedding)
+    assert isinstance(emb_module.embedding_tables["categories"], mm.HashedEmbedding)
+    assert sorted(embeddings.keys()) == sorted(schema.column_names)
+    assert all(emb.shape[-1] == 64 for emb in embeddings.values())
+
+
 @pytest.mark.parametrize("trainable", [True, False])
 def test_pretrained_from_InputBlockV2(trainable, music_streaming_data: Dataset):
     vocab_size = music_streaming_data.schema.column_schemas["item_id"].int_domain.max + 1
@@ -332,6 +534,35 @@ def test_embedding_features_yoochoose_custom_dims(testing_data: Dataset):
     assert embeddings["categories"].shape[1] == 64
 
 
+def test_embedding_features_fuse_tables(testing_data: Dataset):
+    schema = testing_data.schema.select_by_tag(Tags.CATEGORICAL)
+    options = dict(embedding_dims={"item_id": 16}, embedding_dim_default=8)
+    batch = mm.sample_batch(testing_data, batch_size=100, include_targets=False)
+
+    emb_module = mm.EmbeddingFeatures.from_schema(
+        schema, embedding_options=mm.EmbeddingOptions(**options)
+    )
+    fused_module = mm.EmbeddingFeatures.from_schema(
+        schema, embedding_options=mm.EmbeddingOptions(fuse_tables=True, **options)
+    )
+    embeddings = emb_module(batch)
+    fused_module(batch)
+
+    assert sorted(fused_module.fused_embeddings.keys()) == ["16", "8"]
+    for fused in fused_module.fused_embeddings.values():
+        fused.embeddings.assign(
+            tf.concat([emb_module.embedding_tables[t.name].embeddings for t in fused.tables], 0)
+        )
+    fused_embeddings = fused_module(batch)
+
+    assert fused_module.embedding_tables["item_id"].embeddings.shape[1] == 16
+    for name, val in embeddings.items():
+        np.testing.assert_allclose(fused_embeddings[name].numpy(), val.numpy(), rtol=1e-6)
+
+    copy_layer = testing_utils.assert_serialization(fused_module)
+    assert copy_layer.fuse_tables
+
+
 def test_embedding_features_l2_reg(testing_data: Dataset):
     schema = testing_data.schema.select_by_tag(Tags.CATEGORICAL)
 
@@ -567,3 +798,26 @@ def test_shared_embeddings(music_streaming_data: Dataset):
     embeddings = inputs.select_by_name(Tags.CATEGORICAL.value)
 
     assert embeddings.table_config("item_genres") == embeddings.table_config("user_genres")
+
+
+def test_sequence_embedding_features_ragged():
+    dim = 8
+    feature_config = {
+        "item_ids": mm.FeatureConfig(mm.TableConfig(100, dim, name="item_ids", initializer=None))
+    }
+    inputs = {
+        "item_ids": tf.RaggedTensor.from_row_lengths(
+            tf.constant([1, 2, 3, 4, 5, 6], dtype=tf.int64), tf.constant([3, 1, 0, 2], tf.int64)
+        )
+    }
+
+    ragged_embeddings = mm.SequenceEmbeddingFeatures(feature_config, ragged=True)
+    outputs = ragged_embeddings(inputs)["item_ids"]
+
+    assert isinstance(outputs, tf.RaggedTensor)
+    assert outputs.shape.as_list() == [4, None, dim]
+    assert outputs.row_lengths().numpy().tolist() == [3, 1, 0, 2]
+    table = ragged_embeddings.embedding_tables["item_ids"].embeddings
+    np.testing.assert_allclose(outputs.flat_values.numpy(), tf.gather(table, [1, 2, 3, 4, 5, 6]))
+
+    assert ragged_embeddings.compute_mask(inputs) is None
@@ -276,6 +276,48 @@ def test_two_tower_retrieval_model_with_topk_metrics_aggregator(
     assert set(metrics.keys()) == set(expected_metrics_all)
 
 
+@pytest.mark.parametrize("run_eagerly", [True, False])
+def test_two_tower_query_cache(ecommerce_data: Dataset, run_eagerly):
+    import numpy as np
+
+    model = mm.TwoTowerModel(ecommerce_data.schema, query_tower=mm.MLPBlock([8]))
+    model.compile(optimizer="adam", run_eagerly=run_eagerly, metrics=[RecallAt(5)])
+    model.fit(ecommerce_data, batch_size=50, epochs=1)
+
+    expected = model.evaluate(
+        ecommerce_data, batch_size=10, item_corpus=ecommerce_data, return_dict=True
+    )
+    expected_embeddings = model.query_embeddings(ecommerce_data, batch_size=10).compute()
+
+    cache = model.enable_query_cache()
+    assert cache.id_column == "user_id"
+    for _ in range(2):
+        metrics = model.evaluate(
+            ecommerce_data, batch_size=10, item_corpus=ecommerce_data, return_dict=True
+        )
+        assert metrics["recall_at_5"] == pytest.approx(expected["recall_at_5"])
+    num_users = ecommerce_data.to_ddf()["user_id"].nunique().compute()
+    assert len(cache) == num_users
+
+    embeddings = model.query_embeddings(ecommerce_data, batch_size=10).compute()
+    columns = [str(i) for i in range(8)]
+    np.testing.assert_allclose(
+        embeddings.sort_values("user_id")[columns].to_numpy(),
+        expected_embeddings.sort_values("user_id")[columns].to_numpy(),
+        atol=1e-5,
+    )
+
+    # training changes the weights version, which drops the cache
+    model.fit(ecommerce_data, batch_size=50, epochs=1)
+    batch = mm.sample_batch(ecommerce_data, batch_size=10, include_targets=False)
+    recommender = model.to_top_k_recommender(ecommerce_data, k=5)
+    recommender(batch)
+    assert len(cache) == len(np.unique(batch["user_id"]))
+
+    model.disable_query_cache()
+    assert model.query_cache is None
+
+
 def test_two_tower_advanced_options(ecommerce_data):
     train_ds, eval_ds = ecommerce_data, ecommerce_data
     metrics = retrieval_tests_common.train_eval_two_tower_for_lastfm(
@@ -134,6 +134,38 @@ def test_setting_negative_sampling_strategy(sequence_testing_data: Dataset):
     assert output.outputs.shape == (batch[1].shape[0], 71)
 
 
+@pytest.mark.parametrize("target", ["table", "dense"])
+def test_next_item_prediction_eval_top_k(sequence_testing_data: Dataset, target):
+    dataloader, schema = _next_item_loader(sequence_testing_data)
+    embeddings = mm.Embeddings(
+        schema,
+        sequence_combiner=tf.keras.layers.Lambda(lambda x: tf.reduce_mean(x, axis=1)),
+    )
+    if target == "table":
+        prediction = EmbeddingTablePrediction(embeddings["item_id_seq"])
+    else:
+        prediction = CategoricalTarget(schema["item_id_seq"])
+
+    predictions = mm.CategoricalPrediction(
+        prediction=prediction, eval_top_k=20, eval_tile_size=5000
+    )
+    model = mm.Model(
+        mm.InputBlockV2(schema, embeddings=embeddings),
+        mm.MLPBlock([32]),
+        predictions,
+    )
+    model.compile(optimizer="adam", run_eagerly=True)
+    model.fit(dataloader, epochs=1)
+
+    top_k_metrics = model.evaluate(dataloader, return_dict=True)
+    predictions.eval_top_k_lookups = None
+    full_metrics = model.evaluate(dataloader, return_dict=True)
+
+    for name, value in full_metrics.items():
+        if name.endswith("_at_10"):
+            assert top_k_metrics[name] == pytest.approx(value, rel=1e-4)
+
+
 def _next_item_loader(sequence_testing_data: Dataset):
     def _last_interaction_as_target(inputs, targets):
         inputs = mm.AsRaggedFeatures()(inputs)
@@ -13,6 +13,7 @@
 # See the License for the specific language governing permissions and
 # limitations under the License.
 #
+import math
 import os
 import time
 import timeit
@@ -338,3 +339,509 @@ def test_block_with_categorical_target():
     inputs = mm.InputBlock(data.schema)
     embeddings = inputs(batch[0])
     assert list(embeddings.keys()) == ["Engaging User", "Author"]
+
+
+@pytest.mark.parametrize("num_workers", [2, 4])
+@pytest.mark.parametrize("parts_per_chunk", [1, 2])
+def test_multi_worker_matches_single_worker(num_workers, parts_per_chunk):
+    num_rows, batch_size = 1000, 32
+    df = pd.DataFrame(
+        {
+            "a": np.arange(num_rows),
+            "b": np.random.rand(num_rows),
+            "label": np.random.randint(2, size=num_rows),
+        }
+    )
+    dataset = Dataset(df, npartitions=7)
+
+    def load(**kwargs):
+        loader = tf_dataloader.BatchedDataset(
+            dataset,
+            cat_names=["a"],
+            cont_names=["b"],
+            label_names=["label"],
+            batch_size=batch_size,
+            shuffle=False,
+            parts_per_chunk=parts_per_chunk,
+            **kwargs,
+        )
+        return [(X["a"].numpy(), X["b"].numpy(), y.numpy()) for X, y in loader]
+
+    expected = load()
+    outputs = load(num_workers=num_workers, num_conversion_workers=2)
+
+    assert len(outputs) == len(expected)
+    for (a, b, y), (a_exp, b_exp, y_exp) in zip(outputs, expected):
+        np.testing.assert_array_equal(a, a_exp)
+        np.testing.assert_allclose(b, b_exp)
+        np.testing.assert_array_equal(y, y_exp)
+
+
+def test_multi_worker_non_deterministic():
+    num_rows, batch_size = 1000, 32
+    df = pd.DataFrame({"a": np.arange(num_rows), "label": np.zeros(num_rows)})
+
+    loader = tf_dataloader.BatchedDataset(
+        Dataset(df, npartitions=5),
+        cat_names=["a"],
+        label_names=["label"],
+        batch_size=batch_size,
+        shuffle=True,
+        num_workers=3,
+        deterministic=False,
+    )
+    rows = np.concatenate([X["a"].numpy().reshape(-1) for X, _ in loader])
+
+    assert len(rows) == num_rows
+    assert (np.sort(rows) == np.arange(num_rows)).all()
+
+
+def test_multi_worker_deterministic_shuffle():
+    num_rows, batch_size = 1000, 32
+    df = pd.DataFrame({"a": np.arange(num_rows), "label": np.zeros(num_rows)})
+
+    def load(seed):
+        np.random.seed(seed)
+        loader = tf_dataloader.BatchedDataset(
+            Dataset(df, npartitions=5),
+            cat_names=["a"],
+            label_names=["label"],
+            batch_size=batch_size,
+            shuffle=True,
+            num_workers=3,
+            num_conversion_workers=3,
+            deterministic=True,
+        )
+        return [X["a"].numpy().reshape(-1) for X, _ in loader]
+
+    expected = load(0)
+    # the contents of the batches, not only their order, are reproducible
+    for _ in range(2):
+        outputs = load(0)
+        assert len(outputs) == len(expected)
+        for a, a_exp in zip(outputs, expected):
+            np.testing.assert_array_equal(a, a_exp)
+    assert not (np.concatenate(expected) == np.arange(num_rows)).all()
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+@pytest.mark.parametrize("drop_last", [True, False])
+def test_process_workers(num_workers, drop_last):
+    num_rows, batch_size = 1000, 32
+    df = pd.DataFrame(
+        {
+            "a": np.arange(num_rows),
+            "b": np.arange(num_rows) / num_rows,
+            "list": [[i] * (i % 3 + 1) for i in range(num_rows)],
+            "label": np.zeros(num_rows),
+        }
+    )
+
+    loader = tf_dataloader.BatchedDataset(
+        Dataset(df, npartitions=5),
+        cat_names=["a", "list"],
+        cont_names=["b"],
+        label_names=["label"],
+        batch_size=batch_size,
+        shuffle=True,
+        drop_last=drop_last,
+        device="cpu",
+        num_workers=num_workers,
+        worker_type="process",
+    )
+
+    rows, num_batches = [], 0
+    for X, _ in loader:
+        num_batches += 1
+        a = X["a"].numpy().reshape(-1)
+        assert np.allclose(X["b"].numpy().reshape(-1), a / num_rows)
+        values, nnzs = X["list"]
+        lengths = nnzs.numpy().reshape(-1)
+        assert (lengths == a % 3 + 1).all()
+        assert (values.numpy().reshape(-1) == np.repeat(a, lengths)).all()
+        rows.append(a)
+    rows = np.concatenate(rows)
+
+    assert num_batches == len(loader)
+    if drop_last:
+        assert len(rows) == num_rows // batch_size * batch_size
+    else:
+        assert (np.sort(rows) == np.arange(num_rows)).all()
+
+
+@pytest.mark.parametrize("batch_size", [1, 7, 32])
+def test_column_tensors_match_frame_tensors(batch_size):
+    num_rows = 100
+    df = pd.DataFrame(
+        {
+            "cat_a": np.random.randint(10, size=num_rows),
+            "cat_b": np.random.randint(10, size=num_rows).astype(np.int32),
+            "cont_a": np.random.rand(num_rows).astype(np.float32),
+            "cont_b": np.random.rand(num_rows),
+            "label": np.random.randint(2, size=num_rows),
+        }
+    )
+
+    def load(zero_copy):
+        loader = tf_dataloader.BatchedDataset(
+            Dataset(df),
+            batch_size=batch_size,
+            cat_names=["cat_a", "cat_b"],
+            cont_names=["cont_a", "cont_b"],
+            label_names=["label"],
+            shuffle=False,
+        )
+        if not zero_copy:
+            loader._to_column_tensors = lambda *args, **kwargs: None
+        return list(loader)
+
+    expected = load(zero_copy=False)
+    outputs = load(zero_copy=True)
+
+    assert len(outputs) == len(expected)
+    for (X, y), (X_exp, y_exp) in zip(outputs, expected):
+        assert X.keys() == X_exp.keys()
+        for name in X:
+            assert X[name].dtype == X_exp[name].dtype
+            assert X[name].shape == X_exp[name].shape
+            np.testing.assert_array_equal(X[name].numpy(), X_exp[name].numpy())
+        np.testing.assert_array_equal(y.numpy(), y_exp.numpy())
+
+
+@pytest.mark.parametrize("batch_size", [1, 6, 64])
+def test_vectorized_list_columns_match_loop(batch_size):
+    num_rows = 50
+    df = pd.DataFrame(
+        {
+            "list_a": [
+                np.random.randint(10, size=np.random.randint(4)).tolist() for _ in range(num_rows)
+            ],
+            "list_b": [np.random.rand(np.random.randint(1, 5)).tolist() for _ in range(num_rows)],
+            "scalar": np.random.rand(num_rows),
+            "label": np.random.rand(num_rows),
+        }
+    )
+
+    def load(vectorized):
+        loader = tf_dataloader.BatchedDataset(
+            Dataset(df),
+            batch_size=batch_size,
+            cat_names=["list_a"],
+            cont_names=["list_b", "scalar"],
+            label_names=["label"],
+            shuffle=False,
+        )
+        if not vectorized:
+
+            def rows_to_list(*args):
+                raise NotImplementedError
+
+            loader._rows_to_list = rows_to_list
+        return [X for X, _ in loader]
+
+    expected = load(vectorized=False)
+    outputs = load(vectorized=True)
+
+    assert len(outputs) == len(expected)
+    for X, X_exp in zip(outputs, expected):
+        np.testing.assert_array_equal(X["scalar"].numpy(), X_exp["scalar"].numpy())
+        for name in ["list_a", "list_b"]:
+            values, nnzs = X[name]
+            values_exp, nnzs_exp = X_exp[name]
+            assert values.shape == values_exp.shape
+            np.testing.assert_array_equal(values.numpy(), values_exp.numpy())
+            np.testing.assert_array_equal(nnzs.numpy(), nnzs_exp.numpy())
+
+
+@pytest.mark.parametrize("sparse_names", [None, ["list_a"]])
+def test_sparse_as_ragged(sparse_names):
+    num_rows, batch_size = 40, 16
+    list_a = [np.random.randint(1, 10, size=np.random.randint(5)).tolist() for _ in range(num_rows)]
+    df = pd.DataFrame({"list_a": list_a, "label": np.random.rand(num_rows)})
+
+    loader = tf_dataloader.BatchedDataset(
+        Dataset(df),
+        batch_size=batch_size,
+        cat_names=["list_a"],
+        label_names=["label"],
+        shuffle=False,
+        sparse_names=sparse_names,
+        sparse_max={"list_a": 5} if sparse_names else None,
+        sparse_as_ragged=True,
+    )
+
+    rows = []
+    for X, _ in loader:
+        assert isinstance(X["list_a"], tf.RaggedTensor)
+        rows.extend(X["list_a"].to_list())
+    assert rows == list_a
+
+    with pytest.raises(ValueError):
+        tf_dataloader.BatchedDataset(
+            Dataset(df),
+            batch_size=batch_size,
+            cat_names=["list_a"],
+            label_names=["label"],
+            sparse_as_dense=True,
+            sparse_as_ragged=True,
+        )
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_row_group_shuffle(tmpdir, num_workers):
+    num_rows, batch_size = 200, 16
+    df = pd.DataFrame(
+        {
+            "a": np.arange(num_rows),
+            "b": np.arange(num_rows) / num_rows,
+            "unused": np.random.rand(num_rows),
+        }
+    )
+    for i in range(2):
+        df.iloc[i * 100 : (i + 1) * 100].to_parquet(
+            os.path.join(str(tmpdir), f"part_{i}.parquet"), row_group_size=10
+        )
+
+    loader = tf_dataloader.BatchedDataset(
+        Dataset(str(tmpdir), engine="parquet"),
+        batch_size=batch_size,
+        cat_names=["a"],
+        cont_names=["b"],
+        label_names=[],
+        shuffle=True,
+        row_groups_per_part=3,
+        num_workers=num_workers,
+    )
+    assert len(loader._row_groups) == 20
+    assert len(loader) == math.ceil(num_rows / batch_size)
+
+    itr = loader._data_iter(epochs=1)
+    part = next(iter(itr))
+    assert list(part.columns) == ["a", "b"]
+    assert len(part) == 30
+
+    rows = []
+    for X, _ in loader:
+        assert "unused" not in X
+        np.testing.assert_allclose(X["b"].numpy(), X["a"].numpy() / num_rows)
+        rows.append(X["a"].numpy().reshape(-1))
+    rows = np.concatenate(rows)
+
+    assert (np.sort(rows) == np.arange(num_rows)).all()
+    assert not (rows == np.arange(num_rows)).all()
+
+
+@pytest.mark.parametrize("num_workers", [1, 2])
+def test_row_group_shuffle_mixes_row_groups(tmpdir, num_workers):
+    num_rows, row_group_size, row_groups_per_part = 400, 10, 3
+    df = pd.DataFrame({"a": np.arange(num_rows)})
+    df.to_parquet(os.path.join(str(tmpdir), "part_0.parquet"), row_group_size=row_group_size)
+
+    # one batch per part, which holds `row_groups_per_part` row groups
+    loader = tf_dataloader.BatchedDataset(
+        Dataset(str(tmpdir), engine="parquet"),
+        batch_size=row_group_size * row_groups_per_part,
+        cat_names=["a"],
+        label_names=[],
+        shuffle=True,
+        row_groups_per_part=row_groups_per_part,
+        num_workers=num_workers,
+    )
+
+    for _ in range(2):
+        parts = [np.unique(X["a"].numpy() // row_group_size) for X, _ in loader]
+        assert np.array_equal(np.sort(np.concatenate(parts)), np.arange(num_rows // row_group_size))
+        # the row groups of a part are drawn from the whole dataset, not read in file order
+        assert any(np.any(np.diff(part) > 1) for part in parts)
+
+
+@pytest.mark.parametrize("engine", ["parquet", "df"])
+def test_column_projection(tmpdir, engine):
+    num_rows, batch_size = 100, 32
+    df = pd.DataFrame(
+        {
+            "a": np.arange(num_rows),
+            "b": np.random.rand(num_rows),
+            "unused_a": np.random.rand(num_rows),
+            "unused_b": np.random.randint(10, size=num_rows).astype(np.int32),
+        }
+    )
+    if engine == "parquet":
+        path = os.path.join(str(tmpdir), "data.parquet")
+        df.to_parquet(path)
+        dataset = Dataset(path, engine="parquet")
+    else:
+        dataset = Dataset(df)
+
+    loader = tf_dataloader.BatchedDataset(
+        dataset, batch_size=batch_size, cat_names=["a"], cont_names=["b"], label_names=[]
+    )
+    part = next(iter(loader._data_iter(epochs=1)))
+    assert sorted(part.columns) == ["a", "b"]
+
+    for X, _ in loader:
+        assert sorted(X.keys()) == ["a", "b"]
+    assert loader.num_rows_processed == num_rows
+    if engine == "parquet":
+        assert loader.bytes_skipped > 0
+    else:
+        assert loader.bytes_skipped == num_rows * (8 + 4)
+
+
+@pytest.mark.parametrize("cache_max_bytes", [None, 2000])
+def test_cache_batches(tmpdir, cache_max_bytes):
+    num_rows, batch_size = 100, 16
+    df = pd.DataFrame(
+        {
+            "a": np.arange(num_rows),
+            "list_a": [np.arange(i % 4).tolist() for i in range(num_rows)],
+            "label": np.random.rand(num_rows),
+        }
+    )
+    loader = tf_dataloader.BatchedDataset(
+        Dataset(df),
+        batch_size=batch_size,
+        cat_names=["a", "list_a"],
+        label_names=["label"],
+        shuffle=False,
+        sparse_as_ragged=True,
+        cache_batches=True,
+        cache_max_bytes=cache_max_bytes,
+        cache_spill_dir=str(tmpdir),
+    )
+
+    def read():
+        return [(X["a"].numpy(), X["list_a"].to_list(), y.numpy()) for X, y in loader]
+
+    expected = read()
+    assert loader._cache.complete
+    assert len(loader._cache) == len(expected) == len(loader)
+    if cache_max_bytes:
+        assert loader._cache.spilled_bytes > 0
+        assert loader._cache.memory_bytes <= cache_max_bytes
+
+    def fail(*args, **kwargs):
+        raise AssertionError("batches should be replayed from the cache")
+
+    loader.make_tensors = fail
+    for _ in range(2):
+        outputs = read()
+        assert len(outputs) == len(expected)
+        for (a, list_a, y), (a_exp, list_a_exp, y_exp) in zip(outputs, expected):
+            np.testing.assert_array_equal(a, a_exp)
+            assert list_a == list_a_exp
+            np.testing.assert_array_equal(y, y_exp)
+    assert loader.num_rows_processed == num_rows
+
+
+def test_cache_batches_without_spill():
+    df = pd.DataFrame({"a": np.arange(100), "label": np.random.rand(100)})
+    loader = tf_dataloader.BatchedDataset(
+        Dataset(df),
+        batch_size=10,
+        cat_names=["a"],
+        label_names=["label"],
+        shuffle=False,
+        cache_batches=True,
+        cache_max_bytes=100,
+    )
+    assert len(list(loader)) == 10
+    assert not loader._cache.complete
+
+    with pytest.warns(UserWarning):
+        assert len(list(loader)) == 10
+    assert loader._cache is None
+
+    with pytest.raises(ValueError):
+        tf_dataloader.BatchedDataset(
+            Dataset(df), batch_size=10, cat_names=["a"], shuffle=True, cache_batches=True
+        )
+
+
+def test_cache_batches_keras():
+    num_rows = 100
+    df = pd.DataFrame({"a": np.random.rand(num_rows), "label": np.random.randint(2, size=num_rows)})
+
+    def loader(**kwargs):
+        return tf_dataloader.BatchedDataset(
+            Dataset(df),
+            batch_size=16,
+            cat_names=[],
+            cont_names=["a"],
+            label_names=["label"],
+            shuffle=False,
+            **kwargs,
+        )
+
+    train, valid = loader(), loader(cache_batches=True)
+
+    input_ = tf.keras.Input(name="a", dtype=tf.float32, shape=(1,))
+    model = tf.keras.Model(inputs=input_, outputs=tf.keras.layers.Dense(1, "sigmoid")(input_))
+    model.compile("sgd", "binary_crossentropy")
+
+    # Keras reads `len()` batches through `__getitem__`, never reaching StopIteration
+    model.fit(train, validation_data=valid, epochs=1, verbose=0)
+    assert valid._cache.complete
+    assert len(valid._cache) == len(valid)
+
+    def fail(*args, **kwargs):
+        raise AssertionError("batches should be replayed from the cache")
+
+    valid.make_tensors = fail
+    history = model.fit(train, validation_data=valid, epochs=2, verbose=0)
+    assert len(history.history["val_loss"]) == 2
+    loss = model.evaluate(valid, verbose=0)
+    assert loss == pytest.approx(model.evaluate(valid, verbose=0))
+    assert valid.num_rows_processed == num_rows
+
+
+def test_adaptive_chunking():
+    num_rows, batch_size = 1000, 10
+    df = pd.DataFrame({"a": np.arange(num_rows), "label": np.random.rand(num_rows)})
+    dataset = Dataset(df, npartitions=20)
+
+    def load(**kwargs):
+        loader = tf_dataloader.BatchedDataset(
+            dataset,
+            batch_size=batch_size,
+            cat_names=["a"],
+            label_names=["label"],
+            shuffle=False,
+            **kwargs,
+        )
+        return loader, [X["a"].numpy() for X, _ in loader]
+
+    _, expected = load()
+    loader, outputs = load(adaptive_chunking=True, max_parts_per_chunk=4)
+
+    np.testing.assert_array_equal(np.concatenate(outputs), np.concatenate(expected))
+    metrics = loader.chunk_metrics
+    assert 1 <= metrics["num_parts"] <= 4
+    assert metrics["part_bytes"] > 0
+    assert tf_dataloader.BatchedDataset(dataset, batch_size=10).chunk_metrics is None
+
+    with pytest.raises(ValueError):
+        tf_dataloader.BatchedDataset(dataset, batch_size=10, adaptive_chunking=True, num_workers=2)
+
+
+def test_stage_metrics():
+    num_rows, batch_size = 100, 10
+    df = pd.DataFrame({"a": np.arange(num_rows), "label": np.random.rand(num_rows)})
+    loader = tf_dataloader.BatchedDataset(
+        Dataset(df, npartitions=2),
+        batch_size=batch_size,
+        cat_names=["a"],
+        label_names=["label"],
+        shuffle=False,
+    )
+    for _ in loader:
+        pass
+
+    metrics = loader.stage_metrics
+    for stage in ["batch", "chunk_logic", "make_tensors", "_create_tensors", "_handle_tensors"]:
+        assert metrics[stage]["rows"] == num_rows
+        assert metrics[stage]["bytes"] > 0
+    assert metrics["_handle_tensors"]["calls"] == num_rows // batch_size
+
+    loader.reset_stage_metrics()
+    assert loader.stage_metrics == {}
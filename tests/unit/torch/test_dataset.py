@@ -122,3 +122,158 @@ def test_sparse_tensors(sparse_dense):
             else:
                 assert feature_tensor.shape[1] == spa_mx[col]
                 assert not feature_tensor.is_sparse
+
+
+@pytest.mark.parametrize("num_workers", [2, 3])
+def test_multi_worker_matches_single_worker(num_workers):
+    num_rows, batch_size = 1000, 32
+    df = pd.DataFrame({"a": np.arange(num_rows), "b": np.random.rand(num_rows)})
+    dataset = Dataset(df, npartitions=6)
+
+    def load(**kwargs):
+        loader = torch_dataloader.Dataset(
+            dataset,
+            cats=["a"],
+            conts=["b"],
+            labels=[],
+            batch_size=batch_size,
+            device="cpu",
+            **kwargs,
+        )
+        return [(X["a"].numpy(), X["b"].numpy()) for X, _ in loader]
+
+    expected = load()
+    outputs = load(num_workers=num_workers)
+
+    assert len(outputs) == len(expected)
+    for (a, b), (a_exp, b_exp) in zip(outputs, expected):
+        np.testing.assert_array_equal(a, a_exp)
+        np.testing.assert_allclose(b, b_exp)
+
+
+def test_process_workers():
+    num_rows, batch_size = 1000, 32
+    df = pd.DataFrame({"a": np.arange(num_rows), "b": np.arange(num_rows) / num_rows})
+
+    loader = torch_dataloader.Dataset(
+        Dataset(df, npartitions=5),
+        cats=["a"],
+        conts=["b"],
+        labels=[],
+        batch_size=batch_size,
+        shuffle=True,
+        device="cpu",
+        num_workers=2,
+        worker_type="process",
+    )
+
+    rows = []
+    for X, _ in loader:
+        a = X["a"].reshape(-1)
+        assert a.dtype == torch.long
+        assert torch.allclose(X["b"].reshape(-1), a.float() / num_rows)
+        rows.append(a.numpy())
+    rows = np.concatenate(rows)
+
+    assert (np.sort(rows) == np.arange(num_rows)).all()
+
+
+def test_column_tensors_share_memory():
+    num_rows, batch_size = 100, 16
+    df = pd.DataFrame(
+        {
+            "a": np.arange(num_rows),
+            "b": np.random.rand(num_rows).astype(np.float32),
+            "c": np.random.rand(num_rows).astype(np.float32),
+        }
+    )
+
+    loader = torch_dataloader.Dataset(
+        Dataset(df), cats=["a"], conts=["b", "c"], labels=[], batch_size=batch_size, device="cpu"
+    )
+    tensors = loader._to_column_tensors(df, ["b", "c"], torch.float32)
+    for name, tensor in zip(["b", "c"], tensors):
+        assert tensor.shape == (num_rows, 1)
+        assert np.shares_memory(tensor.numpy(), df[name].to_numpy())
+
+    rows = 0
+    for X, _ in loader:
+        assert X["a"].dtype == torch.long
+        assert X["a"].shape == (len(X["b"]),)
+        assert X["b"].shape == X["c"].shape == (len(X["a"]), 1)
+        np.testing.assert_allclose(X["b"].numpy()[:, 0], df["b"].to_numpy()[X["a"].numpy()])
+        rows += len(X["a"])
+    assert rows == num_rows
+
+
+@pytest.mark.parametrize("batch_size", [1, 6, 64])
+def test_vectorized_list_columns_match_loop(batch_size):
+    num_rows = 50
+    df = pd.DataFrame(
+        {
+            "list_a": [
+                np.random.randint(10, size=np.random.randint(4)).tolist() for _ in range(num_rows)
+            ],
+            "list_b": [np.random.rand(np.random.randint(1, 5)).tolist() for _ in range(num_rows)],
+            "scalar": np.random.rand(num_rows),
+        }
+    )
+
+    def load(vectorized):
+        loader = torch_dataloader.Dataset(
+            Dataset(df),
+            cats=["list_a"],
+            conts=["list_b", "scalar"],
+            labels=[],
+            batch_size=batch_size,
+            device="cpu",
+        )
+        if not vectorized:
+
+            def rows_to_list(*args):
+                raise NotImplementedError
+
+            loader._rows_to_list = rows_to_list
+        return [X for X, _ in loader]
+
+    expected = load(vectorized=False)
+    outputs = load(vectorized=True)
+
+    assert len(outputs) == len(expected)
+    for X, X_exp in zip(outputs, expected):
+        assert torch.equal(X["scalar"], X_exp["scalar"])
+        for name in ["list_a", "list_b"]:
+            values, offsets = X[name]
+            values_exp, offsets_exp = X_exp[name]
+            assert torch.equal(values, values_exp)
+            assert torch.equal(offsets, offsets_exp)
+
+
+def test_cache_batches(tmpdir):
+    num_rows, batch_size = 100, 16
+    df = pd.DataFrame({"a": np.arange(num_rows), "b": np.random.rand(num_rows)})
+    loader = torch_dataloader.Dataset(
+        Dataset(df),
+        cats=["a"],
+        conts=["b"],
+        labels=[],
+        batch_size=batch_size,
+        device="cpu",
+        cache_batches=True,
+        cache_max_bytes=500,
+        cache_spill_dir=str(tmpdir),
+    )
+
+    expected = [(X["a"].clone(), X["b"].clone()) for X, _ in loader]
+    assert loader._cache.complete
+    assert loader._cache.spilled_bytes > 0
+
+    def fail(*args, **kwargs):
+        raise AssertionError("batches should be replayed from the cache")
+
+    loader.make_tensors = fail
+    outputs = [(X["a"], X["b"]) for X, _ in loader]
+    assert len(outputs) == len(expected)
+    for (a, b), (a_exp, b_exp) in zip(outputs, expected):
+        assert torch.equal(a, a_exp)
+        assert torch.equal(b, b_exp)
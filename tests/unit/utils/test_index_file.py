@@ -0,0 +1,55 @@
+#
+# Copyright (c) 2021, NVIDIA CORPORATION.
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+#
+import numpy as np
+import pytest
+
+from merlin.models.utils.index_file import read_index, write_index
+
+
+@pytest.mark.parametrize("ids_dtype", [np.int64, np.int32, "S8"])
+def test_index_file_roundtrip(tmpdir, ids_dtype):
+    path = str(tmpdir / "index.bin")
+    ids = np.arange(1000, 1013).astype(ids_dtype)
+    values = np.random.rand(13, 5)
+    write_index(path, ids, values, chunk_size=4)
+
+    loaded_ids, loaded_values = read_index(path)
+    assert isinstance(loaded_values, np.memmap)
+    assert loaded_values.dtype == np.float32
+    assert loaded_values.ctypes.data % 64 == 0
+    np.testing.assert_array_equal(loaded_ids, ids)
+    np.testing.assert_allclose(loaded_values, values.astype(np.float32))
+
+
+def test_index_file_empty(tmpdir):
+    path = str(tmpdir / "index.bin")
+    write_index(path, np.zeros((0,), dtype=np.int64), np.zeros((0, 3)))
+    ids, values = read_index(path)
+    assert ids.shape == (0,)
+    assert values.shape == (0, 3)
+
+
+def test_index_file_errors(tmpdir):
+    path = str(tmpdir / "index.bin")
+    with pytest.raises(ValueError):
+        write_index(path, np.arange(3), np.zeros((4, 2)))
+    with pytest.raises(ValueError):
+        write_index(path, np.array(["a", "b"], dtype=object), np.zeros((2, 2)))
+
+    with open(path, "wb") as f:
+        f.write(b"not an index")
+    with pytest.raises(ValueError):
+        read_index(path)
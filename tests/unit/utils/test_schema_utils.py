@@ -1,6 +1,13 @@
+import numpy as np
+import pandas as pd
 import pytest
 
-from merlin.models.utils.schema_utils import get_embedding_size_from_cardinality
+from merlin.models.utils.schema_utils import (
+    categorical_frequencies,
+    get_embedding_size_from_cardinality,
+    get_mixed_embedding_split,
+)
+from merlin.schema import ColumnSchema, Tags
 
 
 @pytest.mark.parametrize(
@@ -59,3 +66,36 @@ def test_get_embedding_size_from_cardinality_multiple_of_8(cardinality_x_expecte
     cardinality, expected_dim = cardinality_x_expected_dim
     dim = get_embedding_size_from_cardinality(cardinality, multiplier, ensure_multiple_of_8=True)
     assert dim == expected_dim
+
+
+def test_categorical_frequencies(tmp_path):
+    categories = tmp_path / "categories"
+    categories.mkdir()
+    pd.DataFrame({"item_id": [None, 10, 11, 12], "item_id_size": [0, 50, 20, 5]}).to_parquet(
+        categories / "unique.item_id.parquet"
+    )
+    col_schema = ColumnSchema(
+        "item_id",
+        dtype=np.int64,
+        tags=[Tags.CATEGORICAL],
+        properties={
+            "domain": {"min": 0, "max": 4},
+            "cat_path": ".//categories/unique.item_id.parquet",
+            "start_index": 1,
+        },
+    )
+
+    frequencies = categorical_frequencies(col_schema, str(tmp_path))
+    assert frequencies.tolist() == [0, 0, 50, 20, 5]
+    assert categorical_frequencies(ColumnSchema("item_id")) is None
+
+
+def test_get_mixed_embedding_split():
+    frequencies = np.array([500, 300, 100, 50] + [1] * 50)
+
+    num_hot, tail_dim = get_mixed_embedding_split(frequencies, 64, head_coverage=0.9)
+    assert num_hot == 3
+    assert 1 <= tail_dim < 64
+
+    num_hot, tail_dim = get_mixed_embedding_split(frequencies, 64, head_coverage=1.0)
+    assert (num_hot, tail_dim) == (len(frequencies), 64)